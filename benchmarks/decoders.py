@@ -0,0 +1,148 @@
+"""
+Compares decoding responses with zeep and with the fast decoder of the client.
+
+Every operation is called once against a local stand-in server with a project of the given size. The raw response is
+then decoded repeatedly by both decoders, so the numbers only contain parsing and decoding, not the network.
+
+Run from the repository root::
+
+    python -m benchmarks.decoders
+    python -m benchmarks.decoders --sizes 100,1000 --repeat 5 --output decoders.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+from texttable import Texttable
+
+from polarion.decoder import FastDecoder, fast_operations
+from polarion.polarion import Polarion
+
+from .stand_in import StandInPolarion, StandInServer
+
+default_sizes = (100, 1000, 10000)
+
+
+def _createData(size):
+    data = StandInPolarion()
+    workitems = [data.addWorkitem() for _ in range(size)]
+    data.addTestRun('run-1', workitems)
+    return data
+
+
+def queryWorkItemsLimited(client, size):
+    # all workitems of the project
+    return 'Tracker', 'queryWorkItemsLimited', ('project.id:BENCH', 'id', [], -1)
+
+
+def getWorkItemByUri(client, size):
+    uri = client.getService('Tracker').getWorkItemById('BENCH', f'BENCH-{size}').uri
+    return 'Tracker', 'getWorkItemByUri', (uri,)
+
+
+def getTestRunByUri(client, size):
+    # a test run with a record for every workitem
+    uri = client.getProject('BENCH').getTestRun('run-1').uri
+    return 'TestManagement', 'getTestRunByUri', (uri,)
+
+
+operations = {
+    'Tracker.queryWorkItemsLimited': queryWorkItemsLimited,
+    'Tracker.getWorkItemByUri': getWorkItemByUri,
+    'TestManagement.getTestRunByUri': getTestRunByUri,
+}
+
+
+def _timeDecode(decode, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = decode()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best, result
+
+
+def runOperation(name, size, repeat=3):
+    """
+    Decode the response of one operation with both decoders
+
+    :param name: The operation name
+    :param size: Number of workitems in the stand-in project
+    :param repeat: Number of times each decoder runs, the fastest run is reported
+    :return: Dictionary with the response bytes and the seconds of both decoders
+    :rtype: dict
+    """
+    with StandInServer(_createData(size)) as server:
+        client = Polarion(server.url, 'benchmark', 'benchmark')
+        service, operation, args = operations[name](client, size)
+        zeep_client = client._getClient(service)
+        with zeep_client.settings(raw_response=True):
+            response = getattr(zeep_client.service, operation)(*args)
+        binding = zeep_client.service._binding
+        decoder = FastDecoder(zeep_client, fast_operations[service])
+        zeep_operation = binding.get(operation)
+        fast_operation = decoder._decodedOperation(operation)
+
+        zeep_seconds, zeep_result = _timeDecode(
+            lambda: binding.process_reply(zeep_client, zeep_operation, response), repeat)
+        fast_seconds, fast_result = _timeDecode(
+            lambda: binding.process_reply(zeep_client, fast_operation, response), repeat)
+        client.close()
+
+    if zeep_result != fast_result:
+        raise Exception(f'The decoders give different results for {name} with {size} workitems')
+    return {
+        'response_bytes': len(response.content),
+        'zeep_seconds': round(zeep_seconds, 6),
+        'fast_seconds': round(fast_seconds, 6),
+        'speedup': round(zeep_seconds / fast_seconds, 1) if fast_seconds else None,
+    }
+
+
+def _table(results):
+    table = Texttable(max_width=0)
+    table.header(['Operation', 'Size', 'Response bytes', 'zeep', 'Fast decoder', 'Speedup'])
+    table.set_cols_dtype(['t', 'i', 'i', 'f', 'f', 't'])
+    table.set_precision(5)
+    for name, sizes in results.items():
+        for size, result in sizes.items():
+            table.add_row([name, size, result['response_bytes'], result['zeep_seconds'], result['fast_seconds'],
+                           f'{result["speedup"]}x'])
+    return table.draw()
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Compare the zeep and fast response decoders')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in default_sizes),
+                        help='Comma separated workitem counts of the stand-in project')
+    parser.add_argument('--operations', default=None, help='Comma separated operations to run, all when not set')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of times each decoder runs')
+    parser.add_argument('--output', default=None, help='File to write the JSON results to')
+    args = parser.parse_args(arguments)
+
+    names = args.operations.split(',') if args.operations else list(operations)
+    unknown = [name for name in names if name not in operations]
+    if unknown:
+        parser.error(f'Unknown operations: {", ".join(unknown)}')
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    results = {}
+    for name in names:
+        results[name] = {}
+        for size in sizes:
+            print(f'{name} with {size} workitems', file=sys.stderr)
+            results[name][str(size)] = runOperation(name, size, args.repeat)
+
+    print(_table(results))
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump({'python': platform.python_version(), 'results': results}, file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
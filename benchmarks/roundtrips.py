@@ -0,0 +1,308 @@
+"""
+Round-trip benchmarks of the high-level API against a local stand-in server.
+
+Every scenario runs with a fresh client against a fresh stand-in project of the given size: that many workitems, all of
+them in one document, one plan and one test run. The SOAP calls, the bytes sent and received and the wall time of the measured part
+are reported per scenario and size. Creating the client and loading the objects a scenario works on is not measured.
+
+Run from the repository root::
+
+    python -m benchmarks.roundtrips --output results.json
+    python -m benchmarks.roundtrips --sizes 10,1000 --baseline benchmarks/baseline.json
+    python -m benchmarks.roundtrips --baseline benchmarks/baseline.json --update-baseline
+
+The exit code is 1 when a scenario makes more SOAP calls than the baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from texttable import Texttable
+
+from polarion.polarion import Polarion
+from polarion.record import Record
+from polarion.xml import Config, Importer
+
+from .stand_in import StandInPolarion, StandInServer
+
+default_sizes = (10, 1000, 10000)
+# number of objects worked on by the scenarios that do not depend on the data size
+sample_size = 10
+
+
+def _sample(size):
+    # workitem numbers spread over the project
+    step = max(size // sample_size, 1)
+    return [1 + index * step for index in range(min(sample_size, size))]
+
+
+def _createData(size):
+    data = StandInPolarion()
+    workitems = [data.addWorkitem() for _ in range(size)]
+    data.addDocument('Specification/Requirements', workitems)
+    data.addPlan('plan-1', workitems)
+    data.addTestRun('run-1', workitems)
+    return data
+
+
+def projectGetWorkitem(client, server, size):
+    project = client.getProject('BENCH')
+
+    def run():
+        for number in _sample(size):
+            project.getWorkitem(f'BENCH-{number}')
+    return run
+
+
+def projectGetWorkitems(client, server, size):
+    project = client.getProject('BENCH')
+
+    def run():
+        project.getWorkitems([f'BENCH-{number}' for number in range(1, size + 1)])
+    return run
+
+
+def workitemSetCustomField(client, server, size):
+    project = client.getProject('BENCH')
+    workitems = [project.getWorkitem(f'BENCH-{number}') for number in _sample(size)]
+
+    def run():
+        for workitem in workitems:
+            workitem.setCustomField('component', 'benchmark')
+    return run
+
+
+def workitemSetCustomFields(client, server, size):
+    project = client.getProject('BENCH')
+    workitems = [project.getWorkitem(f'BENCH-{number}') for number in _sample(size)]
+
+    def run():
+        for workitem in workitems:
+            workitem.setCustomFields({'component': 'benchmark', 'testCaseID': f'Benchmark.{workitem.id}'})
+    return run
+
+
+def workitemAddLinkedItem(client, server, size):
+    project = client.getProject('BENCH')
+    workitems = [project.getWorkitem(f'BENCH-{number}') for number in _sample(size)]
+    targets = [project.getWorkitem(f'BENCH-{size + 1 - number}') for number in _sample(size)]
+
+    def run():
+        for workitem, target in zip(workitems, targets):
+            workitem.addLinkedItem(target, 'relates_to')
+    return run
+
+
+def testrunAddTestcase(client, server, size):
+    project = client.getProject('BENCH')
+    workitem = project.createWorkitem('testcase')
+    test_run = project.getTestRun('run-1')
+
+    def run():
+        test_run.addTestcase(workitem)
+    return run
+
+
+def recordSetResult(client, server, size):
+    test_run = client.getProject('BENCH').getTestRun('run-1')
+    records = [test_run.records[number - 1] for number in _sample(size)]
+
+    def run():
+        for record in records:
+            record.setResult(Record.ResultType.FAILED, 'Failed in the benchmark')
+    return run
+
+
+def documentGetWorkitems(client, server, size):
+    document = client.getProject('BENCH').getDocument('Specification/Requirements')
+
+    def run():
+        document.getWorkitems()
+    return run
+
+
+def planGetWorkitemsInPlan(client, server, size):
+    project = client.getProject('BENCH')
+
+    def run():
+        project.getPlan('plan-1').getWorkitemsInPlan()
+    return run
+
+
+def polarionQueryWorkitems(client, server, size):
+
+    def run():
+        for _workitem in client.queryWorkitems('project.id:BENCH', 'id'):
+            pass
+    return run
+
+
+def projectIterWorkitems(client, server, size):
+    project = client.getProject('BENCH')
+
+    def run():
+        for _workitem in project.iterWorkitems(fields=['status']):
+            pass
+    return run
+
+
+def importerFromXml(client, server, size):
+    # results for existing test cases, each one verifying another workitem
+    directory = tempfile.mkdtemp()
+    xml_file = os.path.join(directory, 'results.xml')
+    failure = '<failure message="failed"/>'
+    cases = ''.join(f'<testcase classname="Bench" name="BENCH-{number}" time="0.5">'
+                    f'<properties><property name="verifies" value="BENCH-{size + 1 - number}"/></properties>'
+                    f'{failure if number % 2 else ""}</testcase>'
+                    for number in _sample(size))
+    with open(xml_file, 'w') as file:
+        file.write(f'<testsuites><testsuite name="Bench" timestamp="2024-01-01T10:00:00">{cases}</testsuite></testsuites>')
+    config = Config({Config.XML_FILE: xml_file, Config.URL: server.url, Config.USERNAME: 'benchmark',
+                     Config.PASSWORD: 'benchmark', Config.PROJECT_ID: 'BENCH', Config.TESTRUN_ID: 'run-import'})
+    server.data.addTestRun('run-import')
+
+    def run():
+        test_run = Importer.from_xml(config)
+        os.remove(xml_file)
+        os.rmdir(directory)
+        # the importer logs in with its own client
+        return test_run._polarion
+    return run
+
+
+scenarios = {
+    'Project.getWorkitem': projectGetWorkitem,
+    'Project.getWorkitems': projectGetWorkitems,
+    'Workitem.setCustomField': workitemSetCustomField,
+    'Workitem.setCustomFields': workitemSetCustomFields,
+    'Workitem.addLinkedItem': workitemAddLinkedItem,
+    'Testrun.addTestcase': testrunAddTestcase,
+    'Record.setResult': recordSetResult,
+    'Document.getWorkitems': documentGetWorkitems,
+    'Plan.getWorkitemsInPlan': planGetWorkitemsInPlan,
+    'Polarion.queryWorkitems': polarionQueryWorkitems,
+    'Project.iterWorkitems': projectIterWorkitems,
+    'Importer.from_xml': importerFromXml,
+}
+
+
+def runScenario(name, size, latency=0):
+    """
+    Run one scenario against a fresh stand-in server
+
+    :param name: The scenario name
+    :param size: Number of workitems in the stand-in project
+    :param latency: Seconds the stand-in server waits before answering each call
+    :return: Dictionary with calls, request_bytes, response_bytes, seconds and the calls per operation
+    :rtype: dict
+    """
+    with StandInServer(_createData(size), latency=latency) as server:
+        client = Polarion(server.url, 'benchmark', 'benchmark')
+        run = scenarios[name](client, server, size)
+        server.reset()
+        start = time.perf_counter()
+        other_client = run()
+        seconds = time.perf_counter() - start
+        result = server.counts()
+        for used_client in (client, other_client):
+            if used_client is not None:
+                used_client.close()
+    result['seconds'] = round(seconds, 4)
+    return result
+
+
+def runAll(names, sizes, latency=0):
+    """
+    Run scenarios for all sizes
+
+    :return: The results per scenario and size
+    :rtype: dict
+    """
+    results = {}
+    for name in names:
+        results[name] = {}
+        for size in sizes:
+            print(f'{name} with {size} workitems', file=sys.stderr)
+            results[name][str(size)] = runScenario(name, size, latency)
+    return results
+
+
+def compare(results, baseline):
+    """
+    Compare results with a baseline
+
+    :return: A list of regressions, scenarios that make more calls than in the baseline
+    :rtype: str[]
+    """
+    regressions = []
+    for name, sizes in results.items():
+        for size, result in sizes.items():
+            expected = baseline.get(name, {}).get(size)
+            if expected is not None and result['calls'] > expected['calls']:
+                regressions.append(f'{name} with {size} workitems: {result["calls"]} calls, '
+                                   f'baseline {expected["calls"]}')
+    return regressions
+
+
+def _table(results, baseline):
+    table = Texttable(max_width=0)
+    table.header(['Scenario', 'Size', 'Calls', 'Baseline', 'Sent', 'Received', 'Seconds'])
+    table.set_cols_dtype(['t', 'i', 'i', 't', 'i', 'i', 'f'])
+    for name, sizes in results.items():
+        for size, result in sizes.items():
+            expected = baseline.get(name, {}).get(size)
+            table.add_row([name, size, result['calls'], expected['calls'] if expected is not None else '-',
+                           result['request_bytes'], result['response_bytes'], result['seconds']])
+    return table.draw()
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Round-trip benchmarks of the high-level API')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in default_sizes),
+                        help='Comma separated workitem counts of the stand-in project')
+    parser.add_argument('--scenarios', default=None, help='Comma separated scenarios to run, all when not set')
+    parser.add_argument('--latency', type=float, default=0, help='Seconds of simulated latency per SOAP call')
+    parser.add_argument('--output', default=None, help='File to write the JSON results to')
+    parser.add_argument('--baseline', default=None, help='JSON results to compare the call counts with')
+    parser.add_argument('--update-baseline', action='store_true', help='Write the results to the baseline file')
+    args = parser.parse_args(arguments)
+
+    names = args.scenarios.split(',') if args.scenarios else list(scenarios)
+    unknown = [name for name in names if name not in scenarios]
+    if unknown:
+        parser.error(f'Unknown scenarios: {", ".join(unknown)}')
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    results = {
+        'python': platform.python_version(),
+        'latency': args.latency,
+        'results': runAll(names, sizes, args.latency),
+    }
+
+    baseline = {}
+    if args.baseline is not None and os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)['results']
+
+    print(_table(results['results'], baseline))
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    if args.update_baseline:
+        if args.baseline is None:
+            parser.error('--update-baseline requires --baseline')
+        with open(args.baseline, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    regressions = compare(results['results'], baseline)
+    for regression in regressions:
+        print(f'Regression: {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
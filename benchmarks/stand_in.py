@@ -0,0 +1,1013 @@
+"""
+A local stand-in for a Polarion server, used by the benchmarks.
+
+It serves the services overview, WSDL documents and SOAP calls over HTTP on localhost for the subset of operations used
+by the high-level API. The WSDL is a reduced version of the Polarion services, laid out so the namespace prefixes
+match the ones the client uses for its types. Data is kept in memory and every SOAP call is counted per operation,
+together with the number of bytes sent and received.
+"""
+import base64
+import hashlib
+import re
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from lxml import etree
+
+SOAP_ENV = 'http://schemas.xmlsoap.org/soap/envelope/'
+TYPES = 'http://ws.polarion.com/types'
+TRACKER_TYPES = 'http://ws.polarion.com/TrackerWebService-types'
+TEST_TYPES = 'http://ws.polarion.com/TestManagementWebService-types'
+PLANNING_TYPES = 'http://ws.polarion.com/PlanningWebService-types'
+SESSION = 'http://ws.polarion.com/session'
+
+_types_schema = f'''
+<xsd:schema targetNamespace="{TYPES}" xmlns:xsd="http://www.w3.org/2001/XMLSchema" xmlns:tns="{TYPES}">
+  <xsd:simpleType name="SubterraURI"><xsd:restriction base="xsd:string"/></xsd:simpleType>
+  <xsd:complexType name="Text"><xsd:all>
+    <xsd:element name="content" type="xsd:string" minOccurs="0"/>
+    <xsd:element name="contentLossy" type="xsd:boolean" minOccurs="0"/>
+    <xsd:element name="type" type="xsd:string" minOccurs="0"/>
+  </xsd:all></xsd:complexType>
+  <xsd:complexType name="ArrayOfText"><xsd:sequence>
+    <xsd:element name="Text" type="tns:Text" minOccurs="0" maxOccurs="unbounded"/>
+  </xsd:sequence></xsd:complexType>
+  <xsd:complexType name="ArrayOfSubterraURI"><xsd:sequence>
+    <xsd:element name="SubterraURI" type="tns:SubterraURI" minOccurs="0" maxOccurs="unbounded"/>
+  </xsd:sequence></xsd:complexType>
+  <xsd:complexType name="ArrayOfString"><xsd:sequence>
+    <xsd:element name="item" type="xsd:string" minOccurs="0" maxOccurs="unbounded"/>
+  </xsd:sequence></xsd:complexType>
+</xsd:schema>'''
+
+_tracker_schema = f'''
+<xsd:schema targetNamespace="{TRACKER_TYPES}" xmlns:xsd="http://www.w3.org/2001/XMLSchema" xmlns:t="{TYPES}"
+    xmlns:tns="{TRACKER_TYPES}">
+  <xsd:import namespace="{TYPES}"/>
+  <xsd:complexType name="EnumOptionId"><xsd:sequence>
+    <xsd:element name="id" type="xsd:string" minOccurs="0"/>
+  </xsd:sequence></xsd:complexType>
+  <xsd:complexType name="ArrayOfEnumOptionId"><xsd:sequence>
+    <xsd:element name="EnumOptionId" type="tns:EnumOptionId" minOccurs="0" maxOccurs="unbounded"/>
+  </xsd:sequence></xsd:complexType>
+  <xsd:complexType name="Custom"><xsd:all>
+    <xsd:element name="key" type="xsd:string" minOccurs="0"/>
+    <xsd:element name="value" type="xsd:anyType" minOccurs="0"/>
+  </xsd:all></xsd:complexType>
+  <xsd:complexType name="ArrayOfCustom"><xsd:sequence>
+    <xsd:element name="Custom" type="tns:Custom" minOccurs="0" maxOccurs="unbounded"/>
+  </xsd:sequence></xsd:complexType>
+  <xsd:complexType name="LinkedWorkItem"><xsd:all>
+    <xsd:element name="role" type="tns:EnumOptionId" minOccurs="0"/>
+    <xsd:element name="suspect" type="xsd:boolean" minOccurs="0"/>
+    <xsd:element name="workItemURI" type="t:SubterraURI" minOccurs="0"/>
+  </xsd:all></xsd:complexType>
+  <xsd:complexType name="ArrayOfLinkedWorkItem"><xsd:sequence>
+    <xsd:element name="LinkedWorkItem" type="tns:LinkedWorkItem" minOccurs="0" maxOccurs="unbounded"/>
+  </xsd:sequence></xsd:complexType>
+  <xsd:complexType name="User"><xsd:all>
+    <xsd:element name="email" type="xsd:string" minOccurs="0"/>
+    <xsd:element name="id" type="xsd:string" minOccurs="0"/>
+    <xsd:element name="name" type="xsd:string" minOccurs="0"/>
+  </xsd:all>
+    <xsd:attribute name="uri" type="t:SubterraURI"/><xsd:attribute name="unresolvable" type="xsd:boolean"/>
+  </xsd:complexType>
+  <xsd:complexType name="ArrayOfUser"><xsd:sequence>
+    <xsd:element name="User" type="tns:User" minOccurs="0" maxOccurs="unbounded"/>
+  </xsd:sequence></xsd:complexType>
+  <xsd:complexType name="Hyperlink"><xsd:all>
+    <xsd:element name="role" type="tns:EnumOptionId" minOccurs="0"/>
+    <xsd:element name="uri" type="xsd:string" minOccurs="0"/>
+  </xsd:all></xsd:complexType>
+  <xsd:complexType name="ArrayOfHyperlink"><xsd:sequence>
+    <xsd:element name="Hyperlink" type="tns:Hyperlink" minOccurs="0" maxOccurs="unbounded"/>
+  </xsd:sequence></xsd:complexType>
+  <xsd:complexType name="Project"><xsd:all>
+    <xsd:element name="id" type="xsd:string" minOccurs="0"/>
+    <xsd:element name="name" type="xsd:string" minOccurs="0"/>
+    <xsd:element name="trackerPrefix" type="xsd:string" minOccurs="0"/>
+  </xsd:all>
+    <xsd:attribute name="uri" type="t:SubterraURI"/><xsd:attribute name="unresolvable" type="xsd:boolean"/>
+  </xsd:complexType>
+  <xsd:complexType name="WorkItem"><xsd:all>
+    <xsd:element name="approvals" type="t:ArrayOfSubterraURI" minOccurs="0"/>
+    <xsd:element name="assignee" type="tns:ArrayOfUser" minOccurs="0"/>
+    <xsd:element name="attachments" type="t:ArrayOfSubterraURI" minOccurs="0"/>
+    <xsd:element name="comments" type="t:ArrayOfText" minOccurs="0"/>
+    <xsd:element name="created" type="xsd:dateTime" minOccurs="0"/>
+    <xsd:element name="customFields" type="tns:ArrayOfCustom" minOccurs="0"/>
+    <xsd:element name="description" type="t:Text" minOccurs="0"/>
+    <xsd:element name="hyperlinks" type="tns:ArrayOfHyperlink" minOccurs="0"/>
+    <xsd:element name="id" type="xsd:string" minOccurs="0"/>
+    <xsd:element name="linkedWorkItems" type="tns:ArrayOfLinkedWorkItem" minOccurs="0"/>
+    <xsd:element name="linkedWorkItemsDerived" type="tns:ArrayOfLinkedWorkItem" minOccurs="0"/>
+    <xsd:element name="priority" type="tns:EnumOptionId" minOccurs="0"/>
+    <xsd:element name="project" type="tns:Project" minOccurs="0"/>
+    <xsd:element name="resolution" type="tns:EnumOptionId" minOccurs="0"/>
+    <xsd:element name="status" type="tns:EnumOptionId" minOccurs="0"/>
+    <xsd:element name="title" type="xsd:string" minOccurs="0"/>
+    <xsd:element name="type" type="tns:EnumOptionId" minOccurs="0"/>
+    <xsd:element name="updated" type="xsd:dateTime" minOccurs="0"/>
+  </xsd:all>
+    <xsd:attribute name="uri" type="t:SubterraURI"/><xsd:attribute name="unresolvable" type="xsd:boolean"/>
+  </xsd:complexType>
+  <xsd:complexType name="ArrayOfWorkItem"><xsd:sequence>
+    <xsd:element name="WorkItem" type="tns:WorkItem" minOccurs="0" maxOccurs="unbounded"/>
+  </xsd:sequence></xsd:complexType>
+  <xsd:complexType name="Module"><xsd:all>
+    <xsd:element name="id" type="xsd:string" minOccurs="0"/>
+    <xsd:element name="moduleFolder" type="xsd:string" minOccurs="0"/>
+    <xsd:element name="moduleName" type="xsd:string" minOccurs="0"/>
+    <xsd:element name="project" type="tns:Project" minOccurs="0"/>
+    <xsd:element name="structureLinkRole" type="tns:EnumOptionId" minOccurs="0"/>
+    <xsd:element name="title" type="xsd:string" minOccurs="0"/>
+  </xsd:all>
+    <xsd:attribute name="uri" type="t:SubterraURI"/><xsd:attribute name="unresolvable" type="xsd:boolean"/>
+  </xsd:complexType>
+  <xsd:complexType name="WorkflowAction"><xsd:all>
+    <xsd:element name="actionId" type="xsd:int" minOccurs="0"/>
+    <xsd:element name="requiredFeatures" type="t:ArrayOfString" minOccurs="0"/>
+  </xsd:all></xsd:complexType>
+  <xsd:complexType name="PdfProperties"><xsd:all>
+    <xsd:element name="paperSize" type="xsd:string" minOccurs="0"/>
+    <xsd:element name="orientation" type="xsd:string" minOccurs="0"/>
+    <xsd:element name="fitToPage" type="xsd:boolean" minOccurs="0"/>
+    <xsd:element name="enableCommentsRendering" type="xsd:boolean" minOccurs="0"/>
+    <xsd:element name="includeUnreferencedComments" type="xsd:boolean" minOccurs="0"/>
+    <xsd:element name="generateBookmarks" type="xsd:boolean" minOccurs="0"/>
+  </xsd:all></xsd:complexType>
+</xsd:schema>'''
+
+_test_schema = f'''
+<xsd:schema targetNamespace="{TEST_TYPES}" xmlns:xsd="http://www.w3.org/2001/XMLSchema" xmlns:t="{TYPES}"
+    xmlns:tr="{TRACKER_TYPES}" xmlns:tns="{TEST_TYPES}">
+  <xsd:import namespace="{TYPES}"/><xsd:import namespace="{TRACKER_TYPES}"/>
+  <xsd:complexType name="TestStep"><xsd:sequence>
+    <xsd:element name="values" type="t:ArrayOfText" minOccurs="0"/>
+  </xsd:sequence></xsd:complexType>
+  <xsd:complexType name="ArrayOfTestStep"><xsd:sequence>
+    <xsd:element name="TestStep" type="tns:TestStep" minOccurs="0" maxOccurs="unbounded"/>
+  </xsd:sequence></xsd:complexType>
+  <xsd:complexType name="TestSteps"><xsd:all>
+    <xsd:element name="keys" type="tr:ArrayOfEnumOptionId" minOccurs="0"/>
+    <xsd:element name="steps" type="tns:ArrayOfTestStep" minOccurs="0"/>
+  </xsd:all></xsd:complexType>
+  <xsd:complexType name="TestRunAttachment"><xsd:all>
+    <xsd:element name="fileName" type="xsd:string" minOccurs="0"/>
+    <xsd:element name="title" type="xsd:string" minOccurs="0"/>
+    <xsd:element name="url" type="xsd:string" minOccurs="0"/>
+  </xsd:all></xsd:complexType>
+  <xsd:complexType name="ArrayOfTestRunAttachment"><xsd:sequence>
+    <xsd:element name="TestRunAttachment" type="tns:TestRunAttachment" minOccurs="0" maxOccurs="unbounded"/>
+  </xsd:sequence></xsd:complexType>
+  <xsd:complexType name="TestStepResult"><xsd:all>
+    <xsd:element name="attachments" type="tns:ArrayOfTestRunAttachment" minOccurs="0"/>
+    <xsd:element name="comment" type="t:Text" minOccurs="0"/>
+    <xsd:element name="result" type="tr:EnumOptionId" minOccurs="0"/>
+  </xsd:all></xsd:complexType>
+  <xsd:complexType name="ArrayOfTestStepResult"><xsd:sequence>
+    <xsd:element name="TestStepResult" type="tns:TestStepResult" minOccurs="0" maxOccurs="unbounded"/>
+  </xsd:sequence></xsd:complexType>
+  <xsd:complexType name="TestRecord"><xsd:all>
+    <xsd:element name="attachments" type="tns:ArrayOfTestRunAttachment" minOccurs="0"/>
+    <xsd:element name="comment" type="t:Text" minOccurs="0"/>
+    <xsd:element name="defectURI" type="t:SubterraURI" minOccurs="0"/>
+    <xsd:element name="duration" type="xsd:double" minOccurs="0"/>
+    <xsd:element name="executed" type="xsd:dateTime" minOccurs="0"/>
+    <xsd:element name="executedByURI" type="t:SubterraURI" minOccurs="0"/>
+    <xsd:element name="result" type="tr:EnumOptionId" minOccurs="0"/>
+    <xsd:element name="testCaseURI" type="t:SubterraURI" minOccurs="0"/>
+    <xsd:element name="testStepResults" type="tns:ArrayOfTestStepResult" minOccurs="0"/>
+  </xsd:all></xsd:complexType>
+  <xsd:complexType name="ArrayOfTestRecord"><xsd:sequence>
+    <xsd:element name="TestRecord" type="tns:TestRecord" minOccurs="0" maxOccurs="unbounded"/>
+  </xsd:sequence></xsd:complexType>
+  <xsd:complexType name="TestRun"><xsd:all>
+    <xsd:element name="attachments" type="tns:ArrayOfTestRunAttachment" minOccurs="0"/>
+    <xsd:element name="created" type="xsd:dateTime" minOccurs="0"/>
+    <xsd:element name="customFields" type="tr:ArrayOfCustom" minOccurs="0"/>
+    <xsd:element name="id" type="xsd:string" minOccurs="0"/>
+    <xsd:element name="isTemplate" type="xsd:boolean" minOccurs="0"/>
+    <xsd:element name="projectURI" type="t:SubterraURI" minOccurs="0"/>
+    <xsd:element name="records" type="tns:ArrayOfTestRecord" minOccurs="0"/>
+    <xsd:element name="status" type="tr:EnumOptionId" minOccurs="0"/>
+    <xsd:element name="title" type="xsd:string" minOccurs="0"/>
+    <xsd:element name="type" type="tr:EnumOptionId" minOccurs="0"/>
+  </xsd:all>
+    <xsd:attribute name="uri" type="t:SubterraURI"/><xsd:attribute name="unresolvable" type="xsd:boolean"/>
+  </xsd:complexType>
+</xsd:schema>'''
+
+_planning_schema = f'''
+<xsd:schema targetNamespace="{PLANNING_TYPES}" xmlns:xsd="http://www.w3.org/2001/XMLSchema" xmlns:t="{TYPES}"
+    xmlns:tr="{TRACKER_TYPES}" xmlns:tns="{PLANNING_TYPES}">
+  <xsd:import namespace="{TYPES}"/><xsd:import namespace="{TRACKER_TYPES}"/>
+  <xsd:complexType name="PlanRecord"><xsd:all>
+    <xsd:element name="item" type="tr:WorkItem" minOccurs="0"/>
+  </xsd:all></xsd:complexType>
+  <xsd:complexType name="ArrayOfPlanRecord"><xsd:sequence>
+    <xsd:element name="PlanRecord" type="tns:PlanRecord" minOccurs="0" maxOccurs="unbounded"/>
+  </xsd:sequence></xsd:complexType>
+  <xsd:complexType name="Plan"><xsd:all>
+    <xsd:element name="allowedTypes" type="tr:ArrayOfEnumOptionId" minOccurs="0"/>
+    <xsd:element name="id" type="xsd:string" minOccurs="0"/>
+    <xsd:element name="name" type="xsd:string" minOccurs="0"/>
+    <xsd:element name="parent" type="tns:Plan" minOccurs="0"/>
+    <xsd:element name="project" type="tr:Project" minOccurs="0"/>
+    <xsd:element name="records" type="tns:ArrayOfPlanRecord" minOccurs="0"/>
+  </xsd:all>
+    <xsd:attribute name="uri" type="t:SubterraURI"/><xsd:attribute name="unresolvable" type="xsd:boolean"/>
+  </xsd:complexType>
+</xsd:schema>'''
+
+# the operations of every service: name -> ([(parameter, type)], return type or None), '*' marks a list
+operations = {
+    'Session': {
+        'logIn': ([('userName', 'xsd:string'), ('password', 'xsd:string')], None),
+        'logInWithToken': ([('mechanism', 'xsd:string'), ('username', 'xsd:string'), ('token', 'xsd:string')], None),
+        'endSession': ([], None),
+        'hasSubject': ([], 'xsd:boolean'),
+    },
+    'Project': {
+        'getProject': ([('projectId', 'xsd:string')], 'tr:Project'),
+        'getUser': ([('userId', 'xsd:string')], 'tr:User'),
+    },
+    'Tracker': {
+        'getWorkItemById': ([('projectId', 'xsd:string'), ('workitemId', 'xsd:string')], 'tr:WorkItem'),
+        'getWorkItemByUri': ([('uri', 't:SubterraURI')], 'tr:WorkItem'),
+        'getWorkItemByIdsWithFields': ([('projectId', 'xsd:string'), ('workitemId', 'xsd:string'),
+                                        ('fields', 'xsd:string*')], 'tr:WorkItem'),
+        'getWorkItemByUriWithFields': ([('uri', 't:SubterraURI'), ('fields', 'xsd:string*')], 'tr:WorkItem'),
+        'getWorkItemByUriInRevision': ([('uri', 't:SubterraURI'), ('revision', 'xsd:string')], 'tr:WorkItem'),
+        'getWorkItemByUriInRevisionWithFields': ([('uri', 't:SubterraURI'), ('revision', 'xsd:string'),
+                                                  ('fields', 'xsd:string*')], 'tr:WorkItem'),
+        'queryWorkItems': ([('query', 'xsd:string'), ('sort', 'xsd:string'), ('fields', 'xsd:string*')],
+                           'tr:WorkItem*'),
+        'queryWorkItemsLimited': ([('query', 'xsd:string'), ('sort', 'xsd:string'), ('fields', 'xsd:string*'),
+                                   ('limit', 'xsd:int')], 'tr:WorkItem*'),
+        'queryWorkItemsInBaselineLimited': ([('query', 'xsd:string'), ('sort', 'xsd:string'),
+                                             ('baselineRevision', 'xsd:string'), ('fields', 'xsd:string*'),
+                                             ('limit', 'xsd:int')], 'tr:WorkItem*'),
+        'updateWorkItem': ([('content', 'tr:WorkItem')], None),
+        'createWorkItem': ([('content', 'tr:WorkItem')], 't:SubterraURI'),
+        'deleteWorkItem': ([('uri', 't:SubterraURI')], None),
+        'moveWorkItemToDocument': ([('workItemURI', 't:SubterraURI'), ('targetDocumentURI', 't:SubterraURI'),
+                                    ('parentWorkItemURI', 't:SubterraURI'), ('position', 'xsd:int'),
+                                    ('retainDirectLinks', 'xsd:boolean')], None),
+        'moveWorkItemOutOfDocument': ([('workItemURI', 't:SubterraURI')], None),
+        'getInitialWorkflowActionForProjectAndType': ([('projectId', 'xsd:string'), ('type', 'tr:EnumOptionId')],
+                                                      'tr:WorkflowAction'),
+        'getCustomFieldKeys': ([('uri', 't:SubterraURI')], 'xsd:string*'),
+        'getAllEnumOptionsForId': ([('projectId', 'xsd:string'), ('enumId', 'xsd:string')], 'tr:EnumOptionId*'),
+        'getAvailableEnumOptionIdsForId': ([('uri', 't:SubterraURI'), ('fieldId', 'xsd:string')],
+                                           'tr:EnumOptionId*'),
+        'addLinkedItem': ([('uri', 't:SubterraURI'), ('linkedItemURI', 't:SubterraURI'),
+                           ('role', 'tr:EnumOptionId')], 'xsd:boolean'),
+        'removeLinkedItem': ([('uri', 't:SubterraURI'), ('linkedItemURI', 't:SubterraURI'),
+                              ('role', 'tr:EnumOptionId')], 'xsd:boolean'),
+        'addAssignee': ([('uri', 't:SubterraURI'), ('userId', 'xsd:string')], 'xsd:boolean'),
+        'removeAssignee': ([('uri', 't:SubterraURI'), ('userId', 'xsd:string')], 'xsd:boolean'),
+        'addHyperlink': ([('uri', 't:SubterraURI'), ('url', 'xsd:string'), ('role', 'tr:EnumOptionId')],
+                         'xsd:boolean'),
+        'removeHyperlink': ([('uri', 't:SubterraURI'), ('url', 'xsd:string')], 'xsd:boolean'),
+        'createAttachment': ([('uri', 't:SubterraURI'), ('filename', 'xsd:string'), ('title', 'xsd:string'),
+                              ('data', 'xsd:base64Binary')], None),
+        'updateAttachment': ([('uri', 't:SubterraURI'), ('id', 'xsd:string'), ('filename', 'xsd:string'),
+                              ('title', 'xsd:string'), ('data', 'xsd:base64Binary')], None),
+        'getAttachment': ([('uri', 't:SubterraURI'), ('id', 'xsd:string')], 'xsd:base64Binary'),
+        'getModuleByLocation': ([('projectId', 'xsd:string'), ('location', 'xsd:string')], 'tr:Module'),
+        'getModuleByUri': ([('uri', 't:SubterraURI')], 'tr:Module'),
+        'getModuleWorkItemUris': ([('uri', 't:SubterraURI'), ('parentUri', 't:SubterraURI'),
+                                   ('deep', 'xsd:boolean')], 't:SubterraURI*'),
+    },
+    'TestManagement': {
+        'getTestSteps': ([('workitemURI', 't:SubterraURI')], 'tm:TestSteps'),
+        'setTestSteps': ([('workitemURI', 't:SubterraURI'), ('testSteps', 'tm:TestStep*')], None),
+        'getTestStepsConfiguration': ([('projectId', 'xsd:string')], 'tr:EnumOptionId*'),
+        'getTestRunByUri': ([('uri', 't:SubterraURI')], 'tm:TestRun'),
+        'createTestRunWithTitle': ([('projectId', 'xsd:string'), ('id', 'xsd:string'), ('title', 'xsd:string'),
+                                    ('template', 'xsd:string')], 't:SubterraURI'),
+        'updateTestRun': ([('content', 'tm:TestRun')], None),
+        'addTestRecordToTestRun': ([('testRunURI', 't:SubterraURI'), ('testRecord', 'tm:TestRecord')], None),
+        'executeTest': ([('testRunURI', 't:SubterraURI'), ('testRecord', 'tm:TestRecord')], None),
+        'getTestCaseRecords': ([('testRunURI', 't:SubterraURI'), ('testCaseURI', 't:SubterraURI')],
+                               'tm:TestRecord*'),
+        'addAttachmentToTestRun': ([('testRunURI', 't:SubterraURI'), ('fileName', 'xsd:string'),
+                                    ('title', 'xsd:string'), ('data', 'xsd:base64Binary')], None),
+        'updateTestRunAttachment': ([('testRunURI', 't:SubterraURI'), ('fileName', 'xsd:string'),
+                                     ('title', 'xsd:string'), ('data', 'xsd:base64Binary')], None),
+        'getTestRunAttachment': ([('testRunURI', 't:SubterraURI'), ('fileName', 'xsd:string')],
+                                 'tm:TestRunAttachment'),
+        'addAttachmentToTestRecord': ([('testRunURI', 't:SubterraURI'), ('testRecordIndex', 'xsd:int'),
+                                       ('fileName', 'xsd:string'), ('title', 'xsd:string'),
+                                       ('data', 'xsd:base64Binary')], None),
+        'addAttachmentToTestStep': ([('testRunURI', 't:SubterraURI'), ('testRecordIndex', 'xsd:int'),
+                                     ('testStepIndex', 'xsd:int'), ('fileName', 'xsd:string'),
+                                     ('title', 'xsd:string'), ('data', 'xsd:base64Binary')], None),
+    },
+    'Planning': {
+        'getPlanById': ([('projectId', 'xsd:string'), ('id', 'xsd:string')], 'pl:Plan'),
+        'getPlanByUri': ([('uri', 't:SubterraURI')], 'pl:Plan'),
+        'createPlan': ([('projectId', 'xsd:string'), ('name', 'xsd:string'), ('id', 'xsd:string'),
+                        ('parentId', 'xsd:string'), ('templateId', 'xsd:string')], 't:SubterraURI'),
+    },
+}
+
+
+def _placeholderSchema(index):
+    # only there to keep the namespace prefixes in the same order as on a Polarion server
+    return (f'<xsd:schema targetNamespace="http://ws.polarion.com/placeholder{index}" '
+            f'xmlns:xsd="http://www.w3.org/2001/XMLSchema">'
+            f'<xsd:simpleType name="Placeholder"><xsd:restriction base="xsd:string"/></xsd:simpleType></xsd:schema>')
+
+
+def _wsdl(service, base_url):
+    namespace = f'http://ws.polarion.com/{service}WebService'
+
+    def element(name, element_type):
+        occurs = ' maxOccurs="unbounded"' if element_type.endswith('*') else ''
+        return f'<xsd:element name="{name}" type="{element_type.rstrip("*")}" minOccurs="0"{occurs}/>'
+
+    elements, messages, port_operations, binding_operations = [], [], [], []
+    for name, (parameters, return_type) in operations[service].items():
+        request = ''.join(element(parameter, parameter_type) for parameter, parameter_type in parameters)
+        response = element(f'{name}Return', return_type) if return_type is not None else ''
+        elements.append(f'<xsd:element name="{name}"><xsd:complexType><xsd:sequence>{request}'
+                        f'</xsd:sequence></xsd:complexType></xsd:element>'
+                        f'<xsd:element name="{name}Response"><xsd:complexType><xsd:sequence>{response}'
+                        f'</xsd:sequence></xsd:complexType></xsd:element>')
+        messages.append(f'<wsdl:message name="{name}Request"><wsdl:part name="parameters" element="s:{name}"/>'
+                        f'</wsdl:message><wsdl:message name="{name}Response">'
+                        f'<wsdl:part name="parameters" element="s:{name}Response"/></wsdl:message>')
+        port_operations.append(f'<wsdl:operation name="{name}"><wsdl:input message="s:{name}Request"/>'
+                               f'<wsdl:output message="s:{name}Response"/></wsdl:operation>')
+        binding_operations.append(f'<wsdl:operation name="{name}"><soap:operation soapAction=""/>'
+                                  f'<wsdl:input><soap:body use="literal"/></wsdl:input>'
+                                  f'<wsdl:output><soap:body use="literal"/></wsdl:output></wsdl:operation>')
+
+    # TestManagement has one more schema before the tracker types, so its types are prefixed ns3 and ns4
+    extra_schema = _placeholderSchema(2) if service == 'TestManagement' else ''
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
+<wsdl:definitions targetNamespace="{namespace}" xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/"
+    xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/" xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+    xmlns:s="{namespace}" xmlns:t="{TYPES}" xmlns:tr="{TRACKER_TYPES}" xmlns:tm="{TEST_TYPES}"
+    xmlns:pl="{PLANNING_TYPES}">
+  <wsdl:types>
+    {_placeholderSchema(0)}{_types_schema}{extra_schema}{_tracker_schema}{_test_schema}{_planning_schema}
+    <xsd:schema targetNamespace="{namespace}" elementFormDefault="qualified">
+      <xsd:import namespace="{TYPES}"/><xsd:import namespace="{TRACKER_TYPES}"/>
+      <xsd:import namespace="{TEST_TYPES}"/><xsd:import namespace="{PLANNING_TYPES}"/>
+      {"".join(elements)}
+    </xsd:schema>
+  </wsdl:types>
+  {"".join(messages)}
+  <wsdl:portType name="{service}WebService">{"".join(port_operations)}</wsdl:portType>
+  <wsdl:binding name="{service}WebServiceSoapBinding" type="s:{service}WebService">
+    <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+    {"".join(binding_operations)}
+  </wsdl:binding>
+  <wsdl:service name="{service}WebServiceService">
+    <wsdl:port name="{service}WebService" binding="s:{service}WebServiceSoapBinding">
+      <soap:address location="{base_url}/ws/services/{service}WebService"/>
+    </wsdl:port>
+  </wsdl:service>
+</wsdl:definitions>'''
+
+
+def _toXml(parent, name, value, namespace=None):
+    element = etree.SubElement(parent, f'{{{namespace}}}{name}' if namespace else name)
+    if isinstance(value, dict):
+        for key, child in value.items():
+            if key.startswith('@'):
+                element.set(key[1:], str(child))
+            elif isinstance(child, list):
+                for item in child:
+                    _toXml(element, key, item)
+            elif child is not None:
+                _toXml(element, key, child)
+    elif isinstance(value, bool):
+        element.text = 'true' if value else 'false'
+    elif value is not None:
+        element.text = str(value)
+    return element
+
+
+def _fromXml(element):
+    children = list(element)
+    if not children and not element.attrib:
+        return element.text
+    value = {f'@{key}': attribute for key, attribute in element.attrib.items() if not key.startswith('{')}
+    for child in children:
+        name = etree.QName(child).localname
+        child_value = _fromXml(child)
+        if name in value:
+            if not isinstance(value[name], list):
+                value[name] = [value[name]]
+            value[name].append(child_value)
+        else:
+            value[name] = child_value
+    if not children and not value:
+        return element.text
+    return value
+
+
+def _asList(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+class Fault(Exception):
+    pass
+
+
+class StandInPolarion(object):
+    """
+    In memory data of a Polarion project with the SOAP operations working on it.
+
+    :param project_id: The project id
+    """
+
+    def __init__(self, project_id='BENCH'):
+        self.project_id = project_id
+        self.project = {'@uri': f'subterra:data-service:objects:/default/{project_id}${{Project}}{project_id}',
+                        '@unresolvable': 'false', 'id': project_id, 'name': 'Benchmark', 'trackerPrefix': project_id}
+        self.workitems = {}
+        self.documents = {}
+        self.plans = {}
+        self.test_runs = {}
+        # uploaded data per (uri, file name)
+        self.attachments = {}
+        # files of the SVN repository by path, for example '/repo/BENCH/file.bin'
+        self.svn_files = {}
+        # the (user, password) the SVN repository accepts, None to accept any
+        self.svn_credentials = None
+        # False for a repository that ignores Range headers
+        self.svn_ranges = True
+        # True to sort ids by their number like PROJ-9 before PROJ-10, instead of as text
+        self.natural_id_sort = False
+        self.custom_field_keys = ['testCaseID', 'component']
+        self.users = {}
+        self._next_id = 1
+        self._lock = threading.RLock()
+
+    def _uri(self, kind, name):
+        return f'subterra:data-service:objects:/default/{self.project_id}${{{kind}}}{name}'
+
+    def addWorkitem(self, workitem_type='testcase', title=None, **fields):
+        """
+        Add a workitem
+
+        :return: The workitem data
+        :rtype: dict
+        """
+        with self._lock:
+            workitem_id = f'{self.project_id}-{self._next_id}'
+            self._next_id += 1
+            workitem = {
+                '@uri': self._uri('WorkItem', workitem_id), '@unresolvable': 'false',
+                'created': '2024-01-01T10:00:00.000Z',
+                'customFields': {'Custom': [{'key': 'testCaseID', 'value': f'Bench.{workitem_id}'},
+                                            {'key': 'component', 'value': 'core'}]},
+                'description': {'content': f'<p>Description of {workitem_id}. ' + 'Lorem ipsum. ' * 10 + '</p>',
+                                'contentLossy': 'false', 'type': 'text/html'},
+                'id': workitem_id,
+                'project': self.project,
+                'status': {'id': 'open'},
+                'title': title if title is not None else f'Workitem {workitem_id}',
+                'type': {'id': workitem_type},
+            }
+            workitem.update(fields)
+            self.workitems[workitem_id] = workitem
+            return workitem
+
+    def addUser(self, user_id, name=None):
+        """
+        Add a user
+
+        :return: The user data
+        :rtype: dict
+        """
+        user = {'@uri': f'subterra:data-service:objects:/default/${{User}}{user_id}', '@unresolvable': 'false',
+                'email': f'{user_id}@example.com', 'id': user_id, 'name': name if name is not None else user_id}
+        self.users[user_id] = user
+        return user
+
+    def addDocument(self, location, workitems):
+        """
+        Add a document with workitems
+
+        :return: The document data
+        :rtype: dict
+        """
+        space, name = location.split('/')
+        document = {'@uri': self._uri('Module', location), '@unresolvable': 'false', 'id': name,
+                    'moduleFolder': space, 'moduleName': name, 'project': self.project,
+                    'structureLinkRole': {'id': 'parent'}, 'title': name,
+                    '_workitems': [workitem['@uri'] for workitem in workitems]}
+        self.documents[location] = document
+        return document
+
+    def addPlan(self, plan_id, workitems):
+        """
+        Add a plan with workitems
+
+        :return: The plan data
+        :rtype: dict
+        """
+        plan = {'@uri': self._uri('Plan', plan_id), '@unresolvable': 'false', 'id': plan_id,
+                'name': f'Plan {plan_id}', 'allowedTypes': {'EnumOptionId': [{'id': 'testcase'}]},
+                'project': self.project,
+                'records': {'PlanRecord': [{'item': workitem} for workitem in workitems]}}
+        self.plans[plan_id] = plan
+        return plan
+
+    def addTestRun(self, test_run_id, workitems=(), result='passed'):
+        """
+        Add a test run with a record for each workitem
+
+        :return: The test run data
+        :rtype: dict
+        """
+        test_run = {'@uri': self._uri('TestRun', test_run_id), '@unresolvable': 'false',
+                    'created': '2024-01-01T10:00:00.000Z', 'id': test_run_id, 'isTemplate': 'false',
+                    'status': {'id': 'open'}, 'title': f'Test run {test_run_id}', 'type': {'id': 'manual'},
+                    'records': {'TestRecord': [{'duration': '1.5', 'executed': '2024-01-01T10:00:00.000Z',
+                                                'result': {'id': result}, 'testCaseURI': workitem['@uri']}
+                                               for workitem in workitems]}}
+        self.test_runs[test_run['@uri']] = test_run
+        return test_run
+
+    def _workitemByUri(self, uri):
+        workitem_id = uri.rsplit('}', 1)[-1]
+        return self.workitems.get(workitem_id)
+
+    def _query(self, query):
+        workitems = list(self.workitems.values())
+        for term in query.split(' AND '):
+            term = term.strip()
+            if term.startswith('(') and term.endswith(')'):
+                term = term[1:-1]
+            negated = term.startswith('NOT ')
+            if negated:
+                matching = workitems
+                workitems = list(self.workitems.values())
+                term = term[4:]
+            key, _, value = term.partition(':')
+            if value.startswith('(') and value.endswith(')'):
+                values = {item.strip() for item in value[1:-1].split(' OR ')}
+            else:
+                values = {value}
+            if key == 'id' and value.startswith('{') and value.endswith('}'):
+                # exclusive range
+                low, high = value[1:-1].split(' TO ')
+                workitems = [workitem for workitem in workitems if low < workitem['id'] < high]
+            elif key == 'id' and value.startswith('[') and value.endswith(']'):
+                # inclusive range
+                low, high = value[1:-1].split(' TO ')
+                workitems = [workitem for workitem in workitems if low <= workitem['id'] <= high]
+            elif key == 'id':
+                workitems = [workitem for workitem in workitems if workitem['id'] in values]
+            elif key == 'type':
+                workitems = [workitem for workitem in workitems if workitem['type']['id'] in values]
+            elif key == 'title':
+                workitems = [workitem for workitem in workitems if workitem['title'] in values]
+            elif key == 'project.id' and self.project_id not in values:
+                workitems = []
+            if negated:
+                excluded = {workitem['id'] for workitem in workitems}
+                workitems = [workitem for workitem in matching if workitem['id'] not in excluded]
+        return workitems
+
+    @staticmethod
+    def _fields(workitem, fields):
+        if not fields:
+            return workitem
+        keep = {field.split('.')[0] for field in _asList(fields)}
+        return {key: value for key, value in workitem.items() if key.startswith('@') or key in keep}
+
+    def call(self, operation, args):
+        """
+        Handle a SOAP operation
+
+        :param operation: The operation name
+        :param args: The arguments
+        :return: The result data, a list for repeated results
+        """
+        with self._lock:
+            return getattr(self, f'_{operation}', self._unknown)(**args)
+
+    def _unknown(self, **_):
+        raise Fault('Operation not supported by the stand-in server')
+
+    def _logIn(self, **_):
+        return None
+
+    _logInWithToken = _logIn
+    _endSession = _logIn
+
+    def _hasSubject(self, **_):
+        return True
+
+    def _getProject(self, projectId):
+        if projectId != self.project_id:
+            return {'@unresolvable': 'true'}
+        return self.project
+
+    def _getUser(self, userId=None):
+        return self.users.get(userId, {'@unresolvable': 'true'})
+
+    def _getWorkItemById(self, projectId, workitemId):
+        return self.workitems.get(workitemId, {'@unresolvable': 'true'})
+
+    def _getWorkItemByUri(self, uri):
+        return self._workitemByUri(uri) or {'@uri': uri, '@unresolvable': 'true'}
+
+    def _getWorkItemByUriInRevision(self, uri, revision=None):
+        return self._getWorkItemByUri(uri)
+
+    def _getWorkItemByIdsWithFields(self, projectId, workitemId, fields=None):
+        return self._fields(self._getWorkItemById(projectId, workitemId), fields)
+
+    def _getWorkItemByUriWithFields(self, uri, fields=None):
+        return self._fields(self._getWorkItemByUri(uri), fields)
+
+    def _getWorkItemByUriInRevisionWithFields(self, uri, revision=None, fields=None):
+        return self._fields(self._getWorkItemByUri(uri), fields)
+
+    def _queryWorkItems(self, query, sort=None, fields=None, limit=None, baselineRevision=None):
+        workitems = self._query(query)
+        if sort == 'id' and self.natural_id_sort:
+            workitems = sorted(workitems, key=lambda workitem: [int(part) if part.isdigit() else part
+                                                                for part in re.split(r'(\d+)', workitem['id'])])
+        elif sort == 'id':
+            workitems = sorted(workitems, key=lambda workitem: workitem['id'])
+        if limit is not None and int(limit) > 0:
+            workitems = workitems[:int(limit)]
+        return [self._fields(workitem, fields) for workitem in workitems]
+
+    _queryWorkItemsLimited = _queryWorkItems
+    _queryWorkItemsInBaselineLimited = _queryWorkItems
+
+    def _updateWorkItem(self, content):
+        workitem = self._workitemByUri(content['@uri'])
+        for key, value in content.items():
+            if not key.startswith('@'):
+                workitem[key] = value
+
+    def _createWorkItem(self, content):
+        fields = {key: value for key, value in content.items() if not key.startswith('@') and key != 'type'}
+        fields.pop('project', None)
+        fields.setdefault('customFields', None)
+        return self.addWorkitem(content['type']['id'], **fields)['@uri']
+
+    def _deleteWorkItem(self, uri):
+        self._moveWorkItemOutOfDocument(uri)
+        self.workitems.pop(uri.rsplit('}', 1)[-1], None)
+
+    def _moveWorkItemToDocument(self, workItemURI, targetDocumentURI, parentWorkItemURI=None, position=None,
+                                retainDirectLinks=None):
+        self._moveWorkItemOutOfDocument(workItemURI)
+        document = next(document for document in self.documents.values() if document['@uri'] == targetDocumentURI)
+        document['_workitems'].append(workItemURI)
+
+    def _moveWorkItemOutOfDocument(self, workItemURI):
+        for document in self.documents.values():
+            if workItemURI in document['_workitems']:
+                document['_workitems'].remove(workItemURI)
+
+    def _getInitialWorkflowActionForProjectAndType(self, projectId, type):
+        return {'actionId': 1}
+
+    def _getCustomFieldKeys(self, uri):
+        return list(self.custom_field_keys)
+
+    def _getAllEnumOptionsForId(self, projectId, enumId):
+        return [{'id': 'open'}, {'id': 'done'}]
+
+    def _getAvailableEnumOptionIdsForId(self, uri, fieldId):
+        return [{'id': 'open'}, {'id': 'done'}]
+
+    def _addLinkedItem(self, uri, linkedItemURI, role):
+        workitem = self._workitemByUri(uri)
+        linked_workitem = self._workitemByUri(linkedItemURI)
+        link = {'role': role, 'suspect': 'false', 'workItemURI': linkedItemURI}
+        workitem.setdefault('linkedWorkItems', {'LinkedWorkItem': []})
+        workitem['linkedWorkItems']['LinkedWorkItem'] = _asList(workitem['linkedWorkItems']['LinkedWorkItem']) + [link]
+        back_link = {'role': role, 'suspect': 'false', 'workItemURI': uri}
+        linked_workitem.setdefault('linkedWorkItemsDerived', {'LinkedWorkItem': []})
+        linked_workitem['linkedWorkItemsDerived']['LinkedWorkItem'] = \
+            _asList(linked_workitem['linkedWorkItemsDerived']['LinkedWorkItem']) + [back_link]
+        return True
+
+    def _removeLinkedItem(self, uri, linkedItemURI, role):
+        workitem = self._workitemByUri(uri)
+        linked_workitem = self._workitemByUri(linkedItemURI)
+        workitem['linkedWorkItems'] = {'LinkedWorkItem': [
+            link for link in _asList((workitem.get('linkedWorkItems') or {}).get('LinkedWorkItem'))
+            if link['workItemURI'] != linkedItemURI or link['role'] != role]}
+        linked_workitem['linkedWorkItemsDerived'] = {'LinkedWorkItem': [
+            link for link in _asList((linked_workitem.get('linkedWorkItemsDerived') or {}).get('LinkedWorkItem'))
+            if link['workItemURI'] != uri or link['role'] != role]}
+        return True
+
+    def _addAssignee(self, uri, userId):
+        workitem = self._workitemByUri(uri)
+        assignees = _asList((workitem.get('assignee') or {}).get('User'))
+        workitem['assignee'] = {'User': assignees + [self.users[userId]]}
+        return True
+
+    def _removeAssignee(self, uri, userId):
+        workitem = self._workitemByUri(uri)
+        assignees = _asList((workitem.get('assignee') or {}).get('User'))
+        workitem['assignee'] = {'User': [user for user in assignees if user['id'] != userId]}
+        return True
+
+    def _addHyperlink(self, uri, url, role):
+        workitem = self._workitemByUri(uri)
+        hyperlinks = _asList((workitem.get('hyperlinks') or {}).get('Hyperlink'))
+        workitem['hyperlinks'] = {'Hyperlink': hyperlinks + [{'role': role, 'uri': url}]}
+        return True
+
+    def _removeHyperlink(self, uri, url):
+        workitem = self._workitemByUri(uri)
+        hyperlinks = _asList((workitem.get('hyperlinks') or {}).get('Hyperlink'))
+        workitem['hyperlinks'] = {'Hyperlink': [hyperlink for hyperlink in hyperlinks if hyperlink['uri'] != url]}
+        return True
+
+    def _createAttachment(self, uri, filename, title, data):
+        self.attachments[(uri, filename)] = base64.b64decode(data or '')
+        return None
+
+    def _updateAttachment(self, uri, id, filename, title, data):
+        return self._createAttachment(uri, filename, title, data)
+
+    def _getAttachment(self, uri, id):
+        return None
+
+    def _getModuleByLocation(self, projectId, location):
+        return self._module(self.documents.get(location))
+
+    def _getModuleByUri(self, uri):
+        document = next((document for document in self.documents.values() if document['@uri'] == uri), None)
+        return self._module(document)
+
+    @staticmethod
+    def _module(document):
+        if document is None:
+            return {'@unresolvable': 'true'}
+        return {key: value for key, value in document.items() if not key.startswith('_')}
+
+    def _getModuleWorkItemUris(self, uri, parentUri=None, deep=None):
+        document = next(document for document in self.documents.values() if document['@uri'] == uri)
+        return list(document['_workitems'])
+
+    def _getTestSteps(self, workitemURI):
+        return {}
+
+    def _setTestSteps(self, workitemURI, testSteps=None):
+        return None
+
+    def _getTestStepsConfiguration(self, projectId):
+        return [{'id': 'step'}, {'id': 'expectedResult'}]
+
+    def _getTestRunByUri(self, uri):
+        return self.test_runs.get(uri, {'@uri': uri, '@unresolvable': 'true'})
+
+    def _createTestRunWithTitle(self, projectId, id, title, template=None):
+        test_run = self.addTestRun(id)
+        test_run['title'] = title
+        return test_run['@uri']
+
+    def _updateTestRun(self, content):
+        test_run = self.test_runs[content['@uri']]
+        for key, value in content.items():
+            if not key.startswith('@') and key != 'records':
+                test_run[key] = value
+
+    def _records(self, testRunURI):
+        records = self.test_runs[testRunURI].setdefault('records', {'TestRecord': []})
+        records['TestRecord'] = _asList(records.get('TestRecord'))
+        return records['TestRecord']
+
+    def _addTestRecordToTestRun(self, testRunURI, testRecord):
+        self._records(testRunURI).append(testRecord)
+
+    def _executeTest(self, testRunURI, testRecord):
+        records = self._records(testRunURI)
+        for index, record in enumerate(records):
+            if record.get('testCaseURI') == testRecord.get('testCaseURI'):
+                records[index] = testRecord
+                return
+        records.append(testRecord)
+
+    def _getTestCaseRecords(self, testRunURI, testCaseURI):
+        return [record for record in self._records(testRunURI) if record.get('testCaseURI') == testCaseURI]
+
+    def _addAttachmentToTestRun(self, testRunURI, fileName, title, data):
+        self.attachments[(testRunURI, fileName)] = base64.b64decode(data or '')
+        return None
+
+    _updateTestRunAttachment = _addAttachmentToTestRun
+
+    def _getTestRunAttachment(self, testRunURI, fileName):
+        return None
+
+    def _addAttachmentToTestRecord(self, testRunURI, testRecordIndex, fileName, title, data):
+        return None
+
+    def _addAttachmentToTestStep(self, testRunURI, testRecordIndex, testStepIndex, fileName, title, data):
+        return None
+
+    def _getPlanById(self, projectId, id):
+        return self.plans.get(id, {'@unresolvable': 'true'})
+
+    def _createPlan(self, projectId, name, id, parentId=None, templateId=None):
+        plan = self.addPlan(id, [])
+        plan['name'] = name
+        return plan['@uri']
+
+    def _getPlanByUri(self, uri):
+        return next((plan for plan in self.plans.values() if plan['@uri'] == uri), {'@unresolvable': 'true'})
+
+
+class StandInServer(object):
+    """
+    HTTP server on localhost that answers like a Polarion server, see :class:`StandInPolarion` for the data.
+
+    :param data: The stand-in data, a new empty project when None
+    :param latency: Seconds to wait before answering each SOAP call
+    """
+
+    def __init__(self, data=None, latency=0):
+        self.data = data if data is not None else StandInPolarion()
+        self.latency = latency
+        self._counts_lock = threading.Lock()
+        self.reset()
+        self._wsdl = {}
+
+        handler = type('Handler', (_Handler,), {'stand_in': self})
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self._server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self._server.server_address[1]}/polarion'
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def reset(self):
+        """
+        Clear the call counters
+        """
+        with self._counts_lock:
+            self.calls = defaultdict(int)
+            self.request_bytes = 0
+            self.response_bytes = 0
+            # (path, user, Range header) of every SVN request
+            self.svn_requests = []
+
+    def counts(self):
+        """
+        Get the counted SOAP calls
+
+        :return: Dictionary with calls, request_bytes, response_bytes and operations, the calls per operation
+        :rtype: dict
+        """
+        with self._counts_lock:
+            return {'calls': sum(self.calls.values()), 'request_bytes': self.request_bytes,
+                    'response_bytes': self.response_bytes, 'operations': dict(sorted(self.calls.items()))}
+
+    def wsdl(self, service):
+        if service not in self._wsdl:
+            self._wsdl[service] = _wsdl(service, self.url).encode('utf-8')
+        return self._wsdl[service]
+
+    def soap(self, service, body):
+        # attachments are large text nodes
+        envelope = etree.fromstring(body, etree.XMLParser(huge_tree=True))
+        call = envelope.find(f'{{{SOAP_ENV}}}Body')[0]
+        operation = etree.QName(call).localname
+        args = {}
+        for child in call:
+            name = etree.QName(child).localname
+            value = _fromXml(child)
+            if name in args or name == 'fields':
+                args[name] = _asList(args.get(name)) + [value]
+            else:
+                args[name] = value
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        namespace = f'http://ws.polarion.com/{service}WebService'
+        response = etree.Element(f'{{{SOAP_ENV}}}Envelope', nsmap={'soapenv': SOAP_ENV})
+        header = etree.SubElement(response, f'{{{SOAP_ENV}}}Header')
+        response_body = etree.SubElement(response, f'{{{SOAP_ENV}}}Body')
+        status = 200
+        try:
+            result = self.data.call(operation, args)
+            if operation in ('logIn', 'logInWithToken'):
+                etree.SubElement(header, f'{{{SESSION}}}sessionID').text = 'stand-in-session'
+            wrapper = etree.SubElement(response_body, f'{{{namespace}}}{operation}Response')
+            for item in (result if isinstance(result, list) else [result]):
+                if item is not None:
+                    _toXml(wrapper, f'{operation}Return', item, namespace)
+        except Fault as fault:
+            status = 500
+            fault_element = etree.SubElement(response_body, f'{{{SOAP_ENV}}}Fault')
+            etree.SubElement(fault_element, 'faultcode').text = 'soapenv:Server.userException'
+            etree.SubElement(fault_element, 'faultstring').text = str(fault)
+        content = etree.tostring(response, xml_declaration=True, encoding='utf-8')
+
+        with self._counts_lock:
+            self.calls[f'{service}.{operation}'] += 1
+            self.request_bytes += len(body)
+            self.response_bytes += len(content)
+        return status, content
+
+    def svn(self, path, headers):
+        """
+        Answer a GET request for a file of the SVN repository, with Basic authentication and byte ranges.
+
+        :param path: The request path
+        :param headers: The request headers
+        :return: The status, the response headers and the content
+        """
+        user = password = None
+        authorization = headers.get('Authorization', '')
+        if authorization.startswith('Basic '):
+            user, _, password = base64.b64decode(authorization[6:]).decode('utf-8').partition(':')
+        with self._counts_lock:
+            self.svn_requests.append((path, user, headers.get('Range')))
+        if self.data.svn_credentials is not None and (user, password) != self.data.svn_credentials:
+            return 401, {'WWW-Authenticate': 'Basic realm="SVN"'}, b'Unauthorized'
+        content = self.data.svn_files.get(path)
+        if content is None:
+            return 404, {}, b'Not found'
+
+        response_headers = {'ETag': f'"{hashlib.sha256(content).hexdigest()[:16]}"', 'Accept-Ranges': 'bytes'}
+        match = re.fullmatch(r'bytes=(\d+)-', headers.get('Range', ''))
+        if_range = headers.get('If-Range')
+        if match and self.data.svn_ranges and (if_range is None or if_range == response_headers['ETag']):
+            start = int(match.group(1))
+            if start >= len(content):
+                response_headers['Content-Range'] = f'bytes */{len(content)}'
+                return 416, response_headers, b''
+            response_headers['Content-Range'] = f'bytes {start}-{len(content) - 1}/{len(content)}'
+            return 206, response_headers, content[start:]
+        return 200, response_headers, content
+
+    def close(self):
+        """
+        Stop the server
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # headers and body are written separately, without this every call waits for a delayed ACK
+    disable_nagle_algorithm = True
+    stand_in = None
+
+    def _send(self, status, content, content_type='text/xml; charset=utf-8', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        path = self.path.split('?')[0].rstrip('/')
+        match = re.fullmatch(r'/polarion/ws/services/(\w+)WebService', path)
+        if self.path.startswith('/repo/'):
+            status, headers, content = self.stand_in.svn(self.path, self.headers)
+            self._send(status, content, 'application/octet-stream', headers)
+        elif path == '/polarion/ws/services':
+            links = ''.join(f'<a href="{service}WebService">{service}WebService</a>' for service in operations)
+            self._send(200, f'<html><body>{links}</body></html>'.encode('utf-8'), 'text/html')
+        elif match and match.group(1) in operations and self.path.endswith('?wsdl'):
+            self._send(200, self.stand_in.wsdl(match.group(1)))
+        else:
+            self._send(404, b'Not found', 'text/plain')
+
+    def do_POST(self):
+        match = re.fullmatch(r'/polarion/ws/services/(\w+)WebService', self.path)
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if match is None or match.group(1) not in operations:
+            self._send(404, b'Not found', 'text/plain')
+            return
+        status, content = self.stand_in.soap(match.group(1), body)
+        self._send(status, content)
+
+    def log_message(self, format, *args):
+        pass
@@ -0,0 +1,247 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from .polarion import Polarion
+from .record import Record
+
+
+class AsyncPolarion(object):
+    """
+    Asyncio variant of the Polarion client. Every SOAP call is awaitable and runs on a bounded pool of worker threads,
+    so many independent calls can be in flight at once from one event loop. All calls share the pooled connections
+    and the session of the wrapped client.
+
+    Use :meth:`connect` to create the client from within an event loop.
+
+    :param polarion: Polarion client object
+    :param max_concurrency: Maximum number of calls in flight at the same time, by default the pool_maxsize of the
+     client. More calls than pooled connections open connections that are closed again after the call.
+    """
+
+    def __init__(self, polarion, max_concurrency=None):
+        self.polarion = polarion
+        self.max_concurrency = max_concurrency if max_concurrency is not None else polarion.pool_maxsize
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='polarion')
+        self._semaphore = None
+
+    @classmethod
+    async def connect(cls, *args, max_concurrency=None, **kwargs):
+        """
+        Create the Polarion client without blocking the event loop. Takes the same arguments as :class:`.Polarion`.
+
+        :param max_concurrency: Maximum number of calls in flight at the same time. When set, it is also the
+         pool_maxsize of the client unless that is passed as well. By default the pool_maxsize of the client.
+        :return: The client
+        :rtype: AsyncPolarion
+        """
+        if max_concurrency is not None:
+            kwargs.setdefault('pool_maxsize', max_concurrency)
+        loop = asyncio.get_running_loop()
+        polarion = await loop.run_in_executor(None, functools.partial(Polarion, *args, **kwargs))
+        return cls(polarion, max_concurrency)
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Run a blocking function of the client or its objects on the worker threads.
+
+        :param func: The function to run, for example record.setResult
+        :return: The function result
+        """
+        if self._semaphore is None:
+            # created here so it belongs to the running event loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            # in the context of the task, so the calls count for its metrics scopes
+            return await loop.run_in_executor(self._executor, functools.partial(contextvars.copy_context().run, func,
+                                                                                *args, **kwargs))
+
+    async def call(self, service, operation, *args, **kwargs):
+        """
+        Call a SOAP operation directly.
+
+        :param service: The service name, for example 'Tracker'
+        :param operation: The operation name, for example 'getWorkItemByUri'
+        :return: The Polarion response
+        """
+        def _call():
+            return getattr(self.polarion.getService(service), operation)(*args, **kwargs)
+        return await self.run(_call)
+
+    async def getProject(self, project_id):
+        """Get a Polarion project
+
+        :param project_id: The ID of the project.
+        :return: The request project
+        :rtype: AsyncProject
+        """
+        project = await self.run(self.polarion.getProject, project_id)
+        return AsyncProject(self, project)
+
+    async def downloadFromSvn(self, url):
+        """
+        Download a file from the SVN repository
+
+        :param url: The url of the file
+        :return: The file content
+        :rtype: bytes
+        """
+        return await self.run(self.polarion.downloadFromSvn, url)
+
+    async def close(self):
+        """
+        Stop the worker threads. The running calls are awaited without blocking the event loop. The wrapped client
+        stays usable.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(self._executor.shutdown, wait=True))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def __repr__(self):
+        return f'Async {self.polarion}'
+
+    def __str__(self):
+        return f'Async {self.polarion}'
+
+
+class AsyncProject(object):
+    """
+    Awaitable access to a Polarion project, usually created by :meth:`AsyncPolarion.getProject`.
+
+    :param async_polarion: The async client
+    :param project: The project object
+    """
+
+    def __init__(self, async_polarion, project):
+        self._async_polarion = async_polarion
+        self.project = project
+        self.id = project.id
+
+    async def getWorkitem(self, id: str, fields=None):
+        """Get a workitem by string
+
+        :param id: The ID of the project workitem (PREF-123).
+        :param fields: Only load these fields, see :meth:`.Project.getWorkitem`
+        :return: The request workitem
+        :rtype: Workitem
+        """
+        return await self._async_polarion.run(self.project.getWorkitem, id, fields)
+
+    async def searchWorkitem(self, query='', order='Created', field_list=None, limit=-1):
+        """Query for available workitems. See :meth:`.Project.searchWorkitem`.
+
+        :return: The search results
+        :rtype: Workitem[] but only with the given fields set
+        """
+        return await self._async_polarion.run(self.project.searchWorkitem, query, order, field_list, limit)
+
+    async def searchWorkitemFullItem(self, query='', order='Created', limit=-1, fields=None):
+        """Query for available workitems and fetch all results concurrently.
+
+        :param query: The query to use while searching
+        :param order: Order by
+        :param limit: The limit of workitems, -1 for no limit
+        :param fields: Only load these fields, the workitems are then created from the query results. See
+         :meth:`.Project.searchWorkitemFullItem`
+        :return: The search results, in the order of the query
+        :rtype: Workitem[]
+        """
+        if fields is not None:
+            return await self._async_polarion.run(self.project.searchWorkitemFullItem, query, order, limit, fields)
+        workitems = await self.searchWorkitem(query, order, ['id'], limit)
+        return list(await asyncio.gather(*[self.getWorkitem(workitem.id) for workitem in workitems]))
+
+    async def getTestRun(self, id: str):
+        """Get a testrun by string
+
+        :param id: The ID of the project testrun.
+        :return: The request testrun
+        :rtype: AsyncTestrun
+        """
+        test_run = await self._async_polarion.run(self.project.getTestRun, id)
+        return AsyncTestrun(self._async_polarion, test_run)
+
+    def __repr__(self):
+        return f'Async {self.project}'
+
+    def __str__(self):
+        return f'Async {self.project}'
+
+
+class AsyncTestrun(object):
+    """
+    Awaitable access to a test run, usually created by :meth:`AsyncProject.getTestRun`.
+
+    :param async_polarion: The async client
+    :param test_run: The testrun object
+    """
+
+    def __init__(self, async_polarion, test_run):
+        self._async_polarion = async_polarion
+        self.test_run = test_run
+
+    @property
+    def records(self):
+        """
+        The records of the test run
+        """
+        return self.test_run.records
+
+    async def addTestcase(self, workitem):
+        """
+        Add a workitem to the test run.
+
+        :param workitem: Workitem object
+        """
+        await self._async_polarion.run(self.test_run.addTestcase, workitem)
+
+    async def setResult(self, record, result: Record.ResultType = Record.ResultType.FAILED, comment=None):
+        """
+        Set the result of a record and save it. Results of different records can be set concurrently.
+
+        :param record: The record of this test run
+        :param result: The result of the record
+        :param comment: Comment string, may contain HTML
+        """
+        await self._async_polarion.run(record.setResult, result, comment)
+
+    async def getAttachment(self, file_name):
+        """
+        Get the attachment data
+
+        :param file_name: The attachment file name
+        :return: The file content
+        :rtype: bytes
+        """
+        return await self._async_polarion.run(self.test_run.getAttachment, file_name)
+
+    async def saveAttachmentAsFile(self, file_name, file_path):
+        """
+        Save an attachment to file.
+
+        :param file_name: The attachment file name
+        :param file_path: File where to save the attachment
+        """
+        await self._async_polarion.run(self.test_run.saveAttachmentAsFile, file_name, file_path)
+
+    async def addAttachment(self, file_path, title):
+        """
+        Upload an attachment
+
+        :param file_path: Source file to upload
+        :param title: The title of the attachment
+        """
+        await self._async_polarion.run(self.test_run.addAttachment, file_path, title)
+
+    def __repr__(self):
+        return f'Async {self.test_run}'
+
+    def __str__(self):
+        return f'Async {self.test_run}'
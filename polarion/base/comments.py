@@ -30,6 +30,6 @@ class Comments(PolarionObject, ABC):
                 'contentLossy': False
             }
             service.addComment(parent, title, content)
-            self._reloadFromPolarion()
+            self._afterWrite()
         else:
             raise Exception("addComment binding not found in Tracker Service. Adding comments might be disabled.")
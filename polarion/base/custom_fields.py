@@ -18,22 +18,33 @@ class CustomFields(PolarionObject, ABC):
         :param value: custom field value
         :return: None
         """
-        if not self.isCustomFieldAllowed(key):
-            raise Exception(f"key {key} is not allowed for this workitem")
+        self.setCustomFields({key: value})
+
+    def setCustomFields(self, custom_fields):
+        """
+        Set several custom fields and save them at once
+        :param custom_fields: dictionary with the custom field keys and values
+        :return: None
+        """
+        for key in custom_fields:
+            if not self.isCustomFieldAllowed(key):
+                raise Exception(f"key {key} is not allowed for this workitem")
 
         if self.customFields is None:
             # nothing exists, create a custom field structure
             self.customFields = self._polarion.ArrayOfCustomType()
-            self.customFields.Custom.append(self._polarion.CustomType(key=key, value=value))
-        else:
-            custom_field = next(
-                (custom_field for custom_field in self.customFields.Custom if custom_field["key"] == key), None)
-            if custom_field is not None:
+        existing_fields = {}
+        for custom_field in self.customFields.Custom:
+            existing_fields.setdefault(custom_field["key"], custom_field)
+        for key, value in custom_fields.items():
+            if key in existing_fields:
                 # custom field is there and we can update the value
-                custom_field.value = value
+                existing_fields[key].value = value
             else:
                 # custom field is not there, add it.
-                self.customFields.Custom.append(self._polarion.CustomType(key=key, value=value))
+                custom_field = self._polarion.CustomType(key=key, value=value)
+                self.customFields.Custom.append(custom_field)
+                existing_fields[key] = custom_field
         self.save()
 
     def getCustomField(self, key):
@@ -0,0 +1,189 @@
+import copy
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+
+# values that cannot be changed in place
+_immutable_types = (type(None), bool, int, float, str, bytes, Decimal, date, datetime, time)
+# fields that do not change and stay available when the object is out of date
+_identity_fields = ('id', 'uri', 'unresolvable')
+
+
+class WritePolicy(Enum):
+    """
+    What objects do after they made a change in Polarion
+    """
+    # reload the object right away
+    RELOAD = 'reload'
+    # keep the local state, the object is marked as stale
+    NONE = 'none'
+    # reload the object when one of its fields is used next
+    LAZY = 'lazy'
+
+
+class TrackedFields(object):
+    """
+    Keeps track of the fields of a Polarion object that were changed, so saving does not have to compare all fields.
+
+    The fields of the Polarion data are set as attributes of the object. Assigning a field marks it as changed. A field
+    holding a value that can be changed in place, like an EnumOptionId or a list, is copied when it is first read. Only
+    the assigned fields and the copied fields are compared when saving.
+
+    After a change in Polarion the object is reloaded, kept as it is or reloaded on the next use of a field, depending
+    on the write policy of the client.
+    """
+    # other attributes that are built from the Polarion data, they are reloaded with the fields
+    _reload_attributes = ()
+
+    def _setTrackedFields(self, polarion_data, skip=()):
+        """
+        Set the fields of the Polarion data as attributes and track the changes from here on.
+
+        :param polarion_data: The Polarion data of the object
+        :param skip: Names of the fields that are not set
+        """
+        self._tracked_data = polarion_data
+        self._tracked_fields = set()
+        self._untouched_fields = {}
+        self._field_copies = {}
+        self._changed_fields = set()
+        self._stale = False
+        self._reload_on_read = False
+        for key in polarion_data:
+            if key not in skip:
+                self._setTrackedField(key, polarion_data[key])
+
+    def _setTrackedField(self, name, value):
+        """
+        Set one field as it is in Polarion, without marking it as changed.
+
+        :param name: The field name
+        :param value: The value from Polarion
+        """
+        self._tracked_fields.add(name)
+        self._changed_fields.discard(name)
+        self._field_copies.pop(name, None)
+        if isinstance(value, _immutable_types):
+            self._untouched_fields.pop(name, None)
+            self.__dict__[name] = value
+        else:
+            # copied when it is first read, see __getattr__
+            self.__dict__.pop(name, None)
+            self._untouched_fields[name] = value
+
+    def _getChangedFields(self):
+        """
+        Get the fields that are different from Polarion.
+
+        :return: The changed fields and their values
+        :rtype: dict
+        """
+        changed = {}
+        for name in self._changed_fields | self._field_copies.keys():
+            original = self._field_copies[name] if name in self._field_copies else self._tracked_data[name]
+            value = getattr(self, name)
+            if value != original:
+                changed[name] = value
+        return changed
+
+    def _setPolarionField(self, name, value):
+        """
+        Set one field to the value it now has in Polarion, after a write changed it.
+
+        :param name: The field name
+        :param value: The value in Polarion
+        """
+        self._tracked_data[name] = value
+        self._setTrackedField(name, value)
+
+    def _afterWrite(self, fields_only=False, apply_locally=None):
+        """
+        Update the object after it made a change in Polarion, as set by the write policy of the client. Other objects
+        for the same URI are removed from the identity map of the client.
+
+        :param fields_only: Set to True when the write only saved the changed fields, the 'none' policy then keeps the
+         local state.
+        :param apply_locally: Function that makes the same change to the local state, for simple writes like adding a
+         link. It returns True when it made the change, False when it cannot, for example because the field is not
+         loaded. Other writes, like adding an attachment, change the object in ways only a reload shows, so with the
+         'none' policy the object is reloaded when a field is used next, like with 'lazy'.
+        """
+        if self._polarion.identity_map is not None:
+            self._polarion.identity_map.invalidate(getattr(self, 'uri', None), keep=self)
+        policy = self._polarion.write_policy
+        if policy is WritePolicy.RELOAD:
+            self._reloadFromPolarion()
+            return
+        kept = False
+        if policy is WritePolicy.NONE and fields_only:
+            # the saved fields are now the same as in Polarion
+            for name, value in self._getChangedFields().items():
+                self._setPolarionField(name, value)
+            kept = True
+        elif policy is WritePolicy.NONE and apply_locally is not None and not self._reload_on_read:
+            # when a reload is already due, the local state is out of date and the change is not made to it
+            kept = apply_locally()
+        if not kept:
+            self._changed_fields.clear()
+            self._field_copies.clear()
+            for name in self._tracked_fields:
+                if name not in _identity_fields:
+                    self._untouched_fields.pop(name, None)
+                    self.__dict__.pop(name, None)
+            for name in self._reload_attributes:
+                self.__dict__.pop(name, None)
+            self._reload_on_read = True
+        self._stale = True
+
+    def isStale(self):
+        """
+        Checks if the object may be out of date, because it made a change in Polarion and was not reloaded after it.
+
+        :return: True when the object was not reloaded after a change
+        :rtype: bool
+        """
+        return self._stale
+
+    def reload(self):
+        """
+        Reload the object from Polarion. Changes that were not saved are lost.
+        """
+        self._reloadFromPolarion()
+
+    def _getFieldValues(self):
+        """
+        Get the values of all set fields, without copying them.
+
+        :return: The fields and their values
+        :rtype: dict
+        """
+        if self._reload_on_read:
+            self._reloadFromPolarion()
+        values = {}
+        for name in self._tracked_fields:
+            values[name] = self._untouched_fields[name] if name in self._untouched_fields else self.__dict__[name]
+        return values
+
+    def __getattr__(self, name):
+        # only called for attributes that are not set, these include the fields that were not read yet
+        if self.__dict__.get('_reload_on_read') and (name in self._tracked_fields or name in self._reload_attributes):
+            self._reloadFromPolarion()
+            return getattr(self, name)
+        untouched = self.__dict__.get('_untouched_fields')
+        if untouched is None or name not in untouched:
+            raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+        value = untouched.pop(name)
+        # the value can be changed in place after this, keep a copy to compare with
+        self._field_copies[name] = copy.deepcopy(value)
+        self.__dict__[name] = value
+        return value
+
+    def __setattr__(self, name, value):
+        tracked = self.__dict__.get('_tracked_fields')
+        if tracked is not None and name in tracked:
+            if self._reload_on_read:
+                # reload first, the reload would overwrite the new value
+                self._reloadFromPolarion()
+            self._changed_fields.add(name)
+            self._untouched_fields.pop(name, None)
+        object.__setattr__(self, name, value)
@@ -0,0 +1,317 @@
+import base64
+import datetime
+import decimal
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import attr
+import zeep
+from zeep.cache import Base
+from zeep.wsdl import Document
+import logging
+logger = logging.getLogger(__name__)
+
+
+class WsdlCache(Base):
+    """
+    Persistent cache for the WSDL and XSD documents of a Polarion server, used by the zeep transport.
+
+    The documents are stored in a SQLite database in the cache directory, so it can be shared by many short-lived
+    processes at the same time. Documents are keyed by the server url and the version, changing either one will not
+    reuse documents stored for another server or version.
+
+    :param cache_dir: Directory to store the cache in, it is created when it does not exist
+    :param server_url: The url of the Polarion services
+    :param version: Optional version string, for example the Polarion version. Change it to invalidate the cache after an update.
+    :param timeout: Seconds a document stays valid, None to keep documents until they are evicted
+    :param max_entries: Maximum number of documents kept for all servers, the oldest documents are evicted first
+    """
+
+    def __init__(self, cache_dir, server_url, version=None, timeout=None, max_entries=1000):
+        os.makedirs(cache_dir, exist_ok=True)
+        self._db_path = os.path.join(cache_dir, 'wsdl.db')
+        self._timeout = timeout
+        self._max_entries = max_entries
+        self._lock = threading.RLock()
+        # compiled documents of the clients using this cache
+        self.documents = DocumentStore()
+        key = f'{server_url}|{version}|zeep-{zeep.__version__}'
+        self._namespace = hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+        with self._connection() as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS document '
+                               '(namespace TEXT, url TEXT, created REAL, digest TEXT, content BLOB, '
+                               'PRIMARY KEY (namespace, url))')
+
+    @contextmanager
+    def _connection(self):
+        with self._lock:
+            connection = sqlite3.connect(self._db_path, timeout=30)
+            try:
+                with connection:
+                    yield connection
+            finally:
+                connection.close()
+
+    def add(self, url, content):
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        digest = hashlib.sha256(content).hexdigest()
+        with self._connection() as connection:
+            connection.execute('INSERT OR REPLACE INTO document (namespace, url, created, digest, content) '
+                               'VALUES (?, ?, ?, ?, ?)', (self._namespace, url, time.time(), digest, content))
+            if self._max_entries is not None:
+                connection.execute('DELETE FROM document WHERE rowid NOT IN '
+                                   '(SELECT rowid FROM document ORDER BY created DESC LIMIT ?)', (self._max_entries,))
+
+    def get(self, url):
+        with self._connection() as connection:
+            row = connection.execute('SELECT created, digest, content FROM document WHERE namespace = ? AND url = ?',
+                                     (self._namespace, url)).fetchone()
+        if row is None:
+            logger.debug(f'WSDL cache miss for {url}')
+            return None
+
+        created, digest, content = row
+        expired = self._timeout is not None and time.time() - created > self._timeout
+        if expired or hashlib.sha256(content).hexdigest() != digest:
+            # expired or corrupted, remove it so it is fetched again
+            self._delete(url)
+            logger.debug(f'WSDL cache entry for {url} is no longer valid')
+            return None
+        logger.debug(f'WSDL cache hit for {url}')
+        return bytes(content)
+
+    def _delete(self, url):
+        with self._connection() as connection:
+            connection.execute('DELETE FROM document WHERE namespace = ? AND url = ?', (self._namespace, url))
+
+    def clear(self):
+        """
+        Removes all documents of this server and version from the cache
+        """
+        with self._connection() as connection:
+            connection.execute('DELETE FROM document WHERE namespace = ?', (self._namespace,))
+
+
+class RevisionCache(object):
+    """
+    Persistent cache for Polarion data at a fixed revision, like workitems in a baseline. Data at a revision does not
+    change, so entries never expire. The oldest entries are evicted when the cache is larger than max_bytes.
+
+    The data is stored as JSON in a SQLite database in the cache directory, so it can be shared by many processes at
+    the same time. Entries are keyed by the server url, the user, the URI or query and the revision, so users never
+    get data that was fetched with the permissions of another user.
+
+    :param cache_dir: Directory to store the cache in, it is created when it does not exist
+    :param server_url: The url of the Polarion services
+    :param user: The user the data is fetched as
+    :param max_bytes: Maximum size of the stored data for all servers and users, None for no limit
+    """
+
+    def __init__(self, cache_dir, server_url, user=None, max_bytes=512 * 1024 * 1024):
+        os.makedirs(cache_dir, exist_ok=True)
+        self._db_path = os.path.join(cache_dir, 'revisions.db')
+        self._max_bytes = max_bytes
+        self._lock = threading.RLock()
+        key = f'{server_url}|{user}|json-1'
+        self._namespace = hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+        with self._connection() as connection:
+            # readers do not wait for a process that is writing
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS revision '
+                               '(namespace TEXT, key TEXT, revision TEXT, created REAL, size INTEGER, digest TEXT, '
+                               'content BLOB, PRIMARY KEY (namespace, key, revision))')
+
+    @contextmanager
+    def _connection(self):
+        with self._lock:
+            connection = sqlite3.connect(self._db_path, timeout=30)
+            try:
+                with connection:
+                    yield connection
+            finally:
+                connection.close()
+
+    def add(self, key, revision, data):
+        """
+        Store data at a revision
+
+        :param key: The URI of the object, or another key like a query
+        :param revision: The revision
+        :param data: The data, plain Python values like the result of zeep.helpers.serialize_object. Besides the JSON
+         types, dates, times, decimals and bytes are stored.
+        """
+        content = json.dumps(data, default=_encodeValue, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha256(content).hexdigest()
+        with self._connection() as connection:
+            connection.execute('INSERT OR REPLACE INTO revision (namespace, key, revision, created, size, digest, content) '
+                               'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                               (self._namespace, key, str(revision), time.time(), len(content), digest, content))
+            if self._max_bytes is not None:
+                self._evict(connection)
+
+    def _evict(self, connection):
+        total = connection.execute('SELECT COALESCE(SUM(size), 0) FROM revision').fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        evicted = []
+        for rowid, size in connection.execute('SELECT rowid, size FROM revision ORDER BY created'):
+            if total <= self._max_bytes:
+                break
+            evicted.append((rowid,))
+            total -= size
+        connection.executemany('DELETE FROM revision WHERE rowid = ?', evicted)
+
+    def get(self, key, revision, default=None):
+        """
+        Get data stored at a revision
+
+        :param key: The URI of the object, or another key like a query
+        :param revision: The revision
+        :param default: Returned when nothing is stored, pass another value to tell stored None data apart
+        :return: The data, default when it is not stored
+        """
+        with self._connection() as connection:
+            row = connection.execute('SELECT digest, content FROM revision WHERE namespace = ? AND key = ? AND revision = ?',
+                                     (self._namespace, key, str(revision))).fetchone()
+        if row is None:
+            logger.debug(f'Revision cache miss for {key} at {revision}')
+            return default
+
+        digest, content = row
+        if hashlib.sha256(content).hexdigest() != digest:
+            # corrupted, remove it so it is fetched again
+            with self._connection() as connection:
+                connection.execute('DELETE FROM revision WHERE namespace = ? AND key = ? AND revision = ?',
+                                   (self._namespace, key, str(revision)))
+            logger.debug(f'Revision cache entry for {key} at {revision} is no longer valid')
+            return default
+        logger.debug(f'Revision cache hit for {key} at {revision}')
+        return json.loads(content, object_hook=_decodeValue)
+
+    def clear(self):
+        """
+        Removes all data of this server from the cache
+        """
+        with self._connection() as connection:
+            connection.execute('DELETE FROM revision WHERE namespace = ?', (self._namespace,))
+
+
+def _encodeValue(value):
+    """
+    Encode the values of Polarion data that JSON does not have as a tagged object.
+
+    :param value: The value
+    :return: A dictionary with the type and the value as a string
+    """
+    if isinstance(value, datetime.datetime):
+        return {'__type__': 'datetime', 'value': value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {'__type__': 'date', 'value': value.isoformat()}
+    if isinstance(value, datetime.time):
+        return {'__type__': 'time', 'value': value.isoformat()}
+    if isinstance(value, decimal.Decimal):
+        return {'__type__': 'decimal', 'value': str(value)}
+    if isinstance(value, bytes):
+        return {'__type__': 'bytes', 'value': base64.b64encode(value).decode('ascii')}
+    raise TypeError(f'{type(value).__name__} values cannot be stored in the revision cache')
+
+
+_decoders = {
+    'datetime': datetime.datetime.fromisoformat,
+    'date': datetime.date.fromisoformat,
+    'time': datetime.time.fromisoformat,
+    'decimal': decimal.Decimal,
+    'bytes': base64.b64decode,
+}
+
+
+def _decodeValue(obj):
+    if len(obj) == 2 and obj.get('__type__') in _decoders and 'value' in obj:
+        return _decoders[obj['__type__']](obj['value'])
+    return obj
+
+
+class DocumentStore(object):
+    """
+    Parsed and compiled WSDL documents, so clients that use the same store skip parsing and compiling the schema.
+    The store belongs to a zeep cache object, see :func:`documentStore`, so it is shared by the clients that share
+    that cache, like the sessions of a :class:`~polarion.pool.PolarionPool`, and it is freed with the cache.
+
+    Documents are keyed by the url and the zeep settings. A document is compiled only once, clients asking for another
+    document do not wait for it.
+    """
+
+    def __init__(self):
+        self._documents = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, url, transport, settings=None):
+        """
+        Get a parsed and compiled WSDL document, it is loaded when it is not in the store yet.
+
+        :param url: The WSDL url
+        :param transport: The transport used to load the document when it is not compiled yet
+        :param settings: zeep settings
+        :return: zeep.wsdl.Document
+        """
+        key = (url, _settingsKey(settings))
+        with self._lock:
+            if key in self._documents:
+                return self._documents[key]
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                document = self._documents.get(key)
+            if document is None:
+                document = Document(url, transport, settings=settings)
+                with self._lock:
+                    self._documents[key] = document
+                    self._locks.pop(key, None)
+        return document
+
+    def clear(self):
+        """
+        Removes all documents from the store
+        """
+        with self._lock:
+            self._documents.clear()
+
+
+def _settingsKey(settings):
+    """
+    Get a key for zeep settings, documents loaded with different settings are not shared.
+
+    :param settings: zeep settings or None
+    :return: A string with the values of the settings
+    """
+    if settings is None:
+        return None
+    return repr([(field.name, getattr(settings, field.name)) for field in attr.fields(type(settings))
+                 if not field.name.startswith('_')])
+
+
+_document_store_lock = threading.Lock()
+
+
+def documentStore(cache):
+    """
+    Get the store of compiled documents that belongs to a zeep cache object, it is created on first use.
+
+    :param cache: The zeep cache of the transport, like :class:`WsdlCache`
+    :return: DocumentStore
+    """
+    with _document_store_lock:
+        store = getattr(cache, 'documents', None)
+        if not isinstance(store, DocumentStore):
+            store = DocumentStore()
+            cache.documents = store
+        return store
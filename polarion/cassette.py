@@ -0,0 +1,252 @@
+import base64
+import gzip
+import hashlib
+import io
+import json
+import threading
+import time
+from collections import defaultdict, deque
+
+import requests
+from lxml import etree
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+import logging
+logger = logging.getLogger(__name__)
+
+# response headers that are not stored, they belong to the recorded session
+_skipped_headers = ('set-cookie', 'date', 'content-encoding', 'content-length', 'transfer-encoding', 'connection',
+                    'keep-alive')
+
+
+def _bodyBytes(body):
+    if body is None:
+        return b''
+    if isinstance(body, str):
+        return body.encode('utf-8')
+    if isinstance(body, (bytes, bytearray)):
+        return bytes(body)
+    if hasattr(body, '__bytes__'):
+        # an attachment upload, encoded again from its source
+        return bytes(body)
+    raise Exception('Cannot record a streamed request body')
+
+
+def _operation(body):
+    """
+    Get the name of the SOAP operation in a request body, None for other requests
+    """
+    if not body.startswith(b'<') or b'Body' not in body:
+        return None
+    try:
+        root = etree.fromstring(body)
+    except etree.XMLSyntaxError:
+        return None
+    for element in root:
+        if etree.QName(element).localname == 'Body' and len(element) > 0:
+            return etree.QName(element[0]).localname
+    return None
+
+
+class Cassette(object):
+    """
+    Recorded HTTP interactions of a Polarion client, used to run the client without a server.
+
+    Requests are matched on method, url and a digest of the request body. Request bodies are not stored, so passwords
+    and tokens sent by the client do not end up in the cassette. Cookies of the recorded session are not stored either.
+
+    :param path: The cassette file, it is compressed when the name ends with .gz
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.interactions = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a recorded cassette
+
+        :param path: The cassette file
+        :return: The cassette
+        :rtype: Cassette
+        """
+        cassette = cls(path)
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as file:
+            cassette.interactions = json.load(file)['interactions']
+        return cassette
+
+    def save(self):
+        """
+        Write the recorded interactions to the cassette file
+        """
+        opener = gzip.open if self.path.endswith('.gz') else open
+        with self._lock:
+            data = {'version': 1, 'interactions': list(self.interactions)}
+        with opener(self.path, 'wt', encoding='utf-8') as file:
+            json.dump(data, file, indent=1)
+
+    def _record(self, request, response):
+        body = _bodyBytes(request.body)
+        content = response.content
+        try:
+            stored_content = {'text': content.decode('utf-8')}
+        except UnicodeDecodeError:
+            stored_content = {'base64': base64.b64encode(content).decode('ascii')}
+        interaction = {
+            'request': {
+                'method': request.method,
+                'url': request.url,
+                'digest': hashlib.sha256(body).hexdigest(),
+                'operation': _operation(body),
+            },
+            'response': {
+                'status': response.status_code,
+                'reason': response.reason,
+                'headers': {key: value for key, value in response.headers.items()
+                            if key.lower() not in _skipped_headers},
+                **stored_content,
+            },
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def recordingSession(self, adapter=None):
+        """
+        Get a requests session that records all interactions into this cassette. Pass it as request_session to
+        :class:`.Polarion`. Close the client before saving, so the end of the session is recorded too.
+
+        :param adapter: The adapter that sends the requests, a default HTTPAdapter when None
+        :return: The session
+        :rtype: requests.Session
+        """
+        session = requests.Session()
+        recording_adapter = RecordingAdapter(self, adapter)
+        session.mount('http://', recording_adapter)
+        session.mount('https://', recording_adapter)
+        return session
+
+    def replaySession(self, latency=0):
+        """
+        Get a requests session that answers all requests from this cassette. Pass it as request_session to
+        :class:`.Polarion`.
+
+        :param latency: Seconds to wait before answering each request, to simulate a server
+        :return: The session
+        :rtype: requests.Session
+        """
+        session = requests.Session()
+        replay_adapter = ReplayAdapter(self, latency)
+        session.mount('http://', replay_adapter)
+        session.mount('https://', replay_adapter)
+        return session
+
+    def __repr__(self):
+        return f'Cassette {self.path} with {len(self.interactions)} interactions'
+
+    def __str__(self):
+        return self.__repr__()
+
+
+class RecordingAdapter(BaseAdapter):
+    """
+    Transport adapter that sends requests with another adapter and records them in a cassette.
+
+    :param cassette: The cassette to record in
+    :param adapter: The adapter that sends the requests, a default HTTPAdapter when None
+    """
+
+    def __init__(self, cassette, adapter=None):
+        super().__init__()
+        self.cassette = cassette
+        self.adapter = adapter if adapter is not None else HTTPAdapter()
+
+    def send(self, request, stream=False, **kwargs):
+        # the response is read completely so it can be recorded
+        response = self.adapter.send(request, stream=False, **kwargs)
+        self.cassette._record(request, response)
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Transport adapter that answers requests from a cassette.
+
+    A request is answered with the next recorded response for the same method, url and request body. When the body
+    differs, for example because it contains the current time, the next response recorded for the same SOAP operation is
+    used. Once all matching responses are used, the last one is repeated.
+
+    :param cassette: The recorded cassette
+    :param latency: Seconds to wait before answering each request
+    """
+
+    def __init__(self, cassette, latency=0):
+        super().__init__()
+        self.cassette = cassette
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._by_body = defaultdict(deque)
+        self._by_operation = defaultdict(deque)
+        self._used = set()
+        self._last = {}
+        for index, interaction in enumerate(cassette.interactions):
+            recorded = interaction['request']
+            self._by_body[(recorded['method'], recorded['url'], recorded['digest'])].append(index)
+            self._by_operation[(recorded['method'], recorded['url'], recorded['operation'])].append(index)
+
+    def _next(self, candidates):
+        while candidates and candidates[0] in self._used:
+            candidates.popleft()
+        if candidates:
+            index = candidates.popleft()
+            self._used.add(index)
+            return index
+        return None
+
+    def _find(self, request):
+        body = _bodyBytes(request.body)
+        body_key = (request.method, request.url, hashlib.sha256(body).hexdigest())
+        operation_key = (request.method, request.url, _operation(body))
+        with self._lock:
+            index = self._next(self._by_body[body_key])
+            if index is None:
+                index = self._next(self._by_operation[operation_key])
+            if index is None:
+                index = self._last.get(body_key, self._last.get(operation_key))
+            else:
+                self._last[body_key] = self._last[operation_key] = index
+        if index is None:
+            raise Exception(f'No recorded response for {request.method} {request.url}')
+        return self.cassette.interactions[index]
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        interaction = self._find(request)
+        if self.latency:
+            time.sleep(self.latency)
+
+        recorded = interaction['response']
+        response = requests.Response()
+        response.status_code = recorded['status']
+        response.reason = recorded['reason']
+        response.headers = CaseInsensitiveDict(recorded['headers'])
+        if 'base64' in recorded:
+            response._content = base64.b64decode(recorded['base64'])
+        else:
+            response._content = recorded['text'].encode('utf-8')
+        response.headers['Content-Length'] = str(len(response._content))
+        # streamed responses read the content from raw
+        response.raw = io.BytesIO(response._content)
+        response._content_consumed = True
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
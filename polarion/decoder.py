@@ -0,0 +1,269 @@
+import threading
+
+from zeep.xsd import AnySimpleType, ComplexType, CompoundValue, Element
+from zeep.xsd.context import XmlParserContext
+from zeep.xsd.elements.indicators import All, Sequence
+from zeep.xsd.types.builtins import Boolean, String
+import logging
+logger = logging.getLogger(__name__)
+
+_soap_body = '{http://schemas.xmlsoap.org/soap/envelope/}Body'
+_xsi_type = '{http://www.w3.org/2001/XMLSchema-instance}type'
+_xsi_nil = '{http://www.w3.org/2001/XMLSchema-instance}nil'
+
+# operations that return large or many objects, decoded with the fast decoder when it is enabled
+fast_operations = {
+    'Tracker': ('getWorkItemById', 'getWorkItemByUri', 'getWorkItemByIdsWithFields', 'getWorkItemByUriWithFields',
+                'queryWorkItems', 'queryWorkItemsLimited', 'queryWorkItemsInBaselineLimited'),
+    'TestManagement': ('getTestRunByUri', 'getTestRunById'),
+}
+
+
+class _ComplexPlan(object):
+    """
+    How to decode the elements and attributes of one complex type
+    """
+    __slots__ = ('value_class', 'template', 'lists', 'children', 'attributes', 'fallback')
+
+    def __init__(self, value_class):
+        self.value_class = value_class
+        self.template = None
+        self.lists = ()
+        self.children = {}
+        self.attributes = {}
+        self.fallback = None
+
+
+class FastDecoder(object):
+    """
+    Decodes SOAP responses of a service client directly from the lxml tree.
+
+    The result is built from the same zeep value objects zeep creates, so objects decoded this way can be changed
+    and sent back to Polarion. The decoding plan of every type is derived once from the schema of the client. Parts of a
+    response the plan does not cover, like xsi:type or unexpected elements, are decoded by zeep.
+
+    :param client: The zeep client of the service
+    :param operations: The operations to decode, other operations are left to zeep
+    """
+
+    def __init__(self, client, operations):
+        self._client = client
+        self._schema = client.wsdl.types
+        self._settings = client.wsdl.settings
+        self._operations = set(operations)
+        self._plans = {}
+        self._decoders = {}
+        self._lock = threading.Lock()
+
+    def decodes(self, operation):
+        """
+        Checks if the responses of an operation are decoded by this decoder
+        """
+        return operation in self._operations
+
+    def call(self, operation, *args, **kwargs):
+        """
+        Call an operation and decode the response. Sending the request, the plugins and faults are handled by zeep.
+
+        :param operation: The operation name
+        :return: The result, the same as calling the operation on the zeep client
+        """
+        client = self._client
+        with client.settings(raw_response=True):
+            response = getattr(client.service, operation)(*args, **kwargs)
+        return client.service._binding.process_reply(client, self._decodedOperation(operation), response)
+
+    def _decodedOperation(self, operation):
+        """
+        Get the zeep operation with this decoder for its response
+        """
+        if operation not in self._decoders:
+            with self._lock:
+                if operation not in self._decoders:
+                    self._decoders[operation] = self.operationDecoder(self._client.service._binding.get(operation))
+        return _DecodedOperation(self._client.service._binding.get(operation), self._decoders[operation])
+
+    def operationDecoder(self, operation):
+        """
+        Get the function decoding the response envelope of a zeep operation, None when the message is not
+        document/literal without headers.
+        """
+        message = operation.output
+        if message is None or message.body is None or not hasattr(message, '_is_body_wrapped'):
+            return None
+        if message.header is not None and message.header.type._element:
+            return None
+        decode_body = self._elementDecoder(message.body)
+        # a single part is the only child of the soap body, several parts are decoded with the body
+        wrapped = message._is_body_wrapped
+
+        def processReply(envelope):
+            body = envelope.find(_soap_body)
+            if body is None or (not wrapped and len(body) == 0):
+                return operation.process_reply(envelope)
+            return _unwrap(decode_body(body if wrapped else body[0]))
+        return processReply
+
+    def _context(self):
+        return XmlParserContext(settings=self._settings)
+
+    def _elementDecoder(self, element):
+        decode_type = self._typeDecoder(element.type)
+        schema = self._schema
+        context = self._context
+
+        def decodeElement(node):
+            if _xsi_type in node.attrib or _xsi_nil in node.attrib:
+                return element.parse(node, schema, allow_none=True, context=context())
+            return decode_type(node)
+        return decodeElement
+
+    def _typeDecoder(self, xsd_type):
+        if isinstance(xsd_type, String):
+            return _text
+        if isinstance(xsd_type, AnySimpleType):
+            return _simpleDecoder(xsd_type)
+        plan = self._plan(xsd_type) if isinstance(xsd_type, ComplexType) else None
+        if plan is None:
+            return self._zeepDecoder(xsd_type)
+        return lambda node: self._decodeComplex(plan, node)
+
+    def _zeepDecoder(self, xsd_type):
+        schema = self._schema
+        context = self._context
+        return lambda node: xsd_type.parse_xmlelement(node, schema, allow_none=True, context=context(),
+                                                      schema_type=xsd_type)
+
+    def _plan(self, xsd_type):
+        """
+        Get the plan of a complex type, None when zeep has to decode it
+        """
+        key = id(xsd_type)
+        if key in self._plans:
+            return self._plans[key]
+
+        plan = None
+        if self._supported(xsd_type):
+            plan = _ComplexPlan(xsd_type._value_class)
+            # registered before the children are resolved, types can contain themselves
+            self._plans[key] = plan
+            plan.template = xsd_type._value_class().__values__
+            plan.lists = tuple(name for name, value in plan.template.items() if isinstance(value, list))
+            for name, element in xsd_type.elements:
+                plan.children[element.qname.localname] = (name, self._elementDecoder(element),
+                                                          element.accepts_multiple)
+            for name, attribute in xsd_type.attributes:
+                plan.attributes[attribute.qname.text] = (name, _simpleConverter(attribute.type))
+            plan.fallback = self._zeepDecoder(xsd_type)
+        self._plans[key] = plan
+        return plan
+
+    @staticmethod
+    def _supported(xsd_type):
+        if getattr(xsd_type, '_array_type', None):
+            return False
+        if not xsd_type.elements and not xsd_type.attributes:
+            return False
+        for _, container in xsd_type.elements_nested:
+            if not isinstance(container, (Sequence, All)) or container.accepts_multiple:
+                return False
+            if not all(isinstance(element, Element) for _, element in container.elements):
+                return False
+        for _, attribute in xsd_type.attributes:
+            if not attribute.name:
+                return False
+        return True
+
+    @staticmethod
+    def _decodeComplex(plan, node):
+        attributes = node.attrib
+        if len(node) == 0 and not attributes:
+            return None
+
+        values = plan.template.copy()
+        for name in plan.lists:
+            values[name] = []
+        children = plan.children
+        for child in node:
+            tag = child.tag
+            if not isinstance(tag, str):
+                # comments and processing instructions
+                continue
+            entry = children.get(tag[tag.find('}') + 1:])
+            if entry is None:
+                return plan.fallback(node)
+            name, decode, multiple = entry
+            if multiple:
+                values[name].append(decode(child))
+            else:
+                values[name] = decode(child)
+        if attributes:
+            for key, value in attributes.items():
+                entry = plan.attributes.get(key)
+                if entry is not None:
+                    values[entry[0]] = entry[1](value)
+
+        value = plan.value_class.__new__(plan.value_class)
+        value.__values__ = values
+        return value
+
+
+class _DecodedOperation(object):
+    """
+    A zeep operation with another decoder for its response
+    """
+
+    def __init__(self, operation, decode):
+        self._operation = operation
+        self.process_reply = decode if decode is not None else operation.process_reply
+
+    def __getattr__(self, name):
+        return getattr(self._operation, name)
+
+
+def _text(node):
+    return node.text
+
+
+def _boolean(text):
+    # the same as zeep, after collapsing whitespace only 'true' and '1' are true
+    return text.strip(' \n\r\t') in ('true', '1')
+
+
+def _simpleConverter(xsd_type):
+    pythonvalue = _boolean if isinstance(xsd_type, Boolean) else xsd_type.pythonvalue
+
+    def convert(text):
+        try:
+            return pythonvalue(text)
+        except (TypeError, ValueError):
+            logger.exception('Error during xml -> python translation')
+            return None
+    return convert
+
+
+def _simpleDecoder(xsd_type):
+    convert = _simpleConverter(xsd_type)
+
+    def decodeSimple(node):
+        text = node.text
+        if text is None:
+            return None
+        return convert(text)
+    return decodeSimple
+
+
+def _unwrap(result):
+    """
+    Removes the wrapping objects from the decoded body, like zeep does for the result of an operation
+    """
+    if result is None or len(result) == 0:
+        return None
+    if len(result) > 1:
+        return result
+    result = next(iter(result.__values__.values()))
+    if isinstance(result, CompoundValue):
+        children = result._xsd_type.elements
+        if len(children) == 1 and len(result._xsd_type.attributes) == 0:
+            return getattr(result, children[0][0])
+    return result
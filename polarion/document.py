@@ -1,13 +1,12 @@
-import copy
-
 from zeep import xsd
 from zeep.helpers import serialize_object
 
 from .base.custom_fields import CustomFields
+from .base.tracked_fields import TrackedFields
 from .factory import createFromUri, Creator
 
 
-class Document(CustomFields):
+class Document(CustomFields, TrackedFields):
     def __init__(self, polarion, project, uri=None, location=None):
         """
         Create a Document.
@@ -40,10 +39,7 @@ class Document(CustomFields):
 
     def _buildFromPolarion(self):
         if self._polarion_document is not None and self._polarion_document.unresolvable is False:
-            self._original_polarion = copy.deepcopy(self._polarion_document)
-            for attr, value in self._polarion_document.__dict__.items():
-                for key in value:
-                    setattr(self, key, value[key])
+            self._setTrackedFields(self._polarion_document)
 
     def _reloadFromPolarion(self):
         service = self._polarion.getService('Tracker')
@@ -184,19 +180,12 @@ class Document(CustomFields):
         """
         Update the document in polarion
         """
-        updated_item = {}
-
-        for attr, value in self._polarion_document.__dict__.items():
-            for key in value:
-                current_value = getattr(self, key)
-                prev_value = getattr(self._original_polarion, key)
-                if current_value != prev_value:
-                    updated_item[key] = current_value
+        updated_item = self._getChangedFields()
         if len(updated_item) > 0:
             updated_item['uri'] = self._uri
             service = self._polarion.getService('Tracker')
             service.updateModule(updated_item)
-            self._reloadFromPolarion()
+            self._afterWrite(fields_only=True)
 
     def delete(self):
         """
@@ -204,6 +193,8 @@ class Document(CustomFields):
         """
         service = self._polarion.getService('Tracker')
         service.deleteModule(self.uri)
+        if self._polarion.identity_map is not None:
+            self._polarion.identity_map.invalidate(self.uri)
 
     def __repr__(self):
         return f'Polarion document {self.title} in {self.moduleFolder}'
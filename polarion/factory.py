@@ -21,11 +21,27 @@ def createFromUri(polarion, project, uri):
     type_name = _subterraUrl(uri)
     if type_name in creator_list:
         creator = creator_list[type_name]()
-        return creator.createFromUri(polarion, project, uri)
+        return getOrCreate(polarion, uri, lambda: creator.createFromUri(polarion, project, uri))
     else:
         raise Exception(f'type {type_name} not supported')
 
 
+def getOrCreate(polarion, uri, create, revision=None):
+    """
+    Get the object for a URI from the identity map of the client, or create it when the client has no identity map
+    or the object is not cached.
+
+    :param polarion: Polarion client object
+    :param uri: The URI of the object
+    :param create: Function creating the object
+    :param revision: The revision of the object, None for the current revision
+    :return: The object
+    """
+    if polarion.identity_map is None:
+        return create()
+    return polarion.identity_map.getOrCreate(uri, create, revision)
+
+
 def _subterraUrl(uri):
     uri_parts = uri.split(':')
     if uri_parts[0] != 'subterra':
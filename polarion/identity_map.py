@@ -0,0 +1,169 @@
+import sys
+import threading
+from collections import OrderedDict
+
+
+class IdentityMap(object):
+    """
+    Cache of the objects created by a client, so an object that is referenced many times, like a workitem linked from
+    several others, is created and fetched once.
+
+    Objects are keyed by their URI and the revision, None for the current revision. The least recently used objects
+    are evicted when there are more than max_items objects or when their estimated size is more than max_bytes. Writes
+    made by the client remove other objects for the same URI, so they are fetched again.
+
+    :param max_items: Maximum number of objects, None for no limit
+    :param max_bytes: Maximum estimated size of the Polarion data of all objects, None for no limit
+    """
+
+    def __init__(self, max_items=10000, max_bytes=None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        # (uri, revision) -> (object, estimated size)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    def getOrCreate(self, uri, create, revision=None):
+        """
+        Get the object for a URI, creating it when it is not cached
+
+        :param uri: The URI of the object
+        :param create: Function creating the object
+        :param revision: The revision of the object, None for the current revision
+        :return: The object
+        """
+        key = (uri, revision)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+        # created without holding the lock, two threads may create the same object and the last one is kept
+        obj = create()
+        self.put(uri, obj, revision)
+        return obj
+
+    def get(self, uri, revision=None):
+        """
+        Get a cached object, without creating it
+
+        :param uri: The URI of the object
+        :param revision: The revision of the object, None for the current revision
+        :return: The object, None when it is not cached
+        """
+        with self._lock:
+            entry = self._entries.get((uri, revision))
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end((uri, revision))
+            self._hits += 1
+            return entry[0]
+
+    def put(self, uri, obj, revision=None):
+        """
+        Cache an object, replacing the object cached for the same URI and revision
+
+        :param uri: The URI of the object
+        :param obj: The object
+        :param revision: The revision of the object, None for the current revision
+        """
+        size = _estimateSize(obj) if self.max_bytes is not None else 0
+        with self._lock:
+            self._remove((uri, revision))
+            self._entries[(uri, revision)] = (obj, size)
+            self._bytes += size
+            while len(self._entries) > 0 and (
+                    (self.max_items is not None and len(self._entries) > self.max_items) or
+                    (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def invalidate(self, uri, keep=None):
+        """
+        Remove the object of the current revision of a URI, objects of older revisions do not change
+
+        :param uri: The URI of the object
+        :param keep: Do not remove the cached object when it is this object, for example the object that made a change
+        """
+        with self._lock:
+            entry = self._entries.get((uri, None))
+            if entry is not None and entry[0] is not keep:
+                self._remove((uri, None))
+                self._invalidations += 1
+
+    def clear(self):
+        """
+        Remove all objects, the statistics are kept
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def statistics(self):
+        """
+        Get the statistics of the cache
+
+        :return: Dictionary with hits, misses, evictions, invalidations, items and bytes, the estimated size of the
+         cached objects when max_bytes is set
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations,
+                'items': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        stats = self.statistics()
+        return f'Identity map with {stats["items"]} objects, {stats["hits"]} hits and {stats["misses"]} misses'
+
+    def __str__(self):
+        return self.__repr__()
+
+
+def _estimateSize(obj):
+    """
+    Estimate the memory used by the Polarion data of an object, without following the references to the client
+
+    :param obj: A Polarion object
+    :return: The estimated size in bytes
+    """
+    data = getattr(obj, '_tracked_data', None)
+    if data is None:
+        data = {name: value for name, value in vars(obj).items() if not name.startswith('_')}
+    return _dataSize(data, set())
+
+
+def _dataSize(value, seen):
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if hasattr(value, '__values__'):
+        # zeep objects
+        value = value.__values__
+    if isinstance(value, dict):
+        size += sum(_dataSize(item, seen) for item in value.values())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_dataSize(item, seen) for item in value)
+    return size
@@ -0,0 +1,155 @@
+import threading
+import time
+
+from .parallel import mapOrdered
+import logging
+logger = logging.getLogger(__name__)
+
+# enumerations loaded for every workitem type by warmUp
+_type_enums = ('status', 'resolution', 'severity')
+
+
+class ProjectMetadata(object):
+    """
+    Cache of project metadata that rarely changes: enumerations, the custom field keys, the available status and the
+    initial workflow action of every workitem type, and the test step configuration.
+
+    A cache is shared by all :class:`~polarion.project.Project` objects of a client for the same project, usually it is
+    used through :attr:`Project.metadata`.
+
+    :param polarion: Polarion client object
+    :param project_id: The project id
+    :param ttl: Seconds an entry stays valid, None to keep the entries until they are invalidated
+    """
+
+    def __init__(self, polarion, project_id, ttl=None):
+        self._polarion = polarion
+        self.project_id = project_id
+        self.ttl = ttl
+        # key -> (time loaded, value)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key, load):
+        """
+        Get an entry, loading it when it is not cached or expired
+
+        :param key: The key, a tuple starting with the kind of metadata
+        :param load: Function loading the value
+        :return: The value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and (self.ttl is None or time.monotonic() - entry[0] < self.ttl):
+            return entry[1]
+        # loaded without holding the lock, two threads may load the same entry
+        value = load()
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+        return value
+
+    def getEnum(self, enum_name):
+        """
+        Get the options of an enumeration
+
+        :param enum_name: The first part of the enum name, like task-status
+        :return: The ids of the options
+        :rtype: string[]
+        """
+        def load():
+            available = []
+            service = self._polarion.getService('Tracker')
+            for option in service.getAllEnumOptionsForId(self.project_id, enum_name):
+                if option.id not in available:
+                    available.append(option.id)
+            return available
+        return list(self._get(('enum', enum_name), load))
+
+    def getCustomFieldKeys(self, workitem_type, uri):
+        """
+        Get the custom field keys of a workitem type
+
+        :param workitem_type: The workitem type id
+        :param uri: The uri of a workitem of this type, used when the keys are not cached
+        :return: The custom field keys
+        :rtype: string[]
+        """
+        service = self._polarion.getService('Tracker')
+        keys = self._get(('custom_field_keys', workitem_type), lambda: service.getCustomFieldKeys(uri))
+        return list(keys) if keys is not None else None
+
+    def getAvailableStatus(self, workitem_type, uri):
+        """
+        Get the status options of a workitem type
+
+        :param workitem_type: The workitem type id
+        :param uri: The uri of a workitem of this type, used when the options are not cached
+        :return: The status ids
+        :rtype: string[]
+        """
+        def load():
+            service = self._polarion.getService('Tracker')
+            return [status.id for status in service.getAvailableEnumOptionIdsForId(uri, 'status')]
+        return list(self._get(('available_status', workitem_type), load))
+
+    def getInitialWorkflowAction(self, workitem_type):
+        """
+        Get the initial workflow action of a workitem type, with the fields required to create a workitem
+
+        :param workitem_type: The workitem type id
+        :return: The Polarion workflow action
+        """
+        def load():
+            service = self._polarion.getService('Tracker')
+            return service.getInitialWorkflowActionForProjectAndType(
+                self.project_id, self._polarion.EnumOptionIdType(id=workitem_type))
+        return self._get(('initial_action', workitem_type), load)
+
+    def getTestStepsConfiguration(self):
+        """
+        Get the test step columns configured in the project
+
+        :return: The Polarion test step columns
+        """
+        service = self._polarion.getService('TestManagement')
+        return self._get(('test_steps_configuration',), lambda: service.getTestStepsConfiguration(self.project_id))
+
+    def invalidate(self, workitem_type=None):
+        """
+        Remove cached entries, they are loaded again when they are used
+
+        :param workitem_type: Only remove the entries of this workitem type, None to remove all entries
+        """
+        with self._lock:
+            if workitem_type is None:
+                self._entries.clear()
+                return
+            type_enums = {f'{workitem_type}-{enum}' for enum in _type_enums}
+            for key in list(self._entries):
+                if len(key) > 1 and (key[1] == workitem_type or (key[0] == 'enum' and key[1] in type_enums)):
+                    del self._entries[key]
+
+    def warmUp(self, workitem_types=None, max_workers=8):
+        """
+        Load the metadata of the project and its workitem types in parallel. The custom field keys and the available
+        status need a workitem, they are loaded with the first workitem of each type.
+
+        :param workitem_types: The workitem type ids, None for all types of the project
+        :param max_workers: Number of threads loading the metadata
+        """
+        if workitem_types is None:
+            workitem_types = self.getEnum('type')
+        loads = [self.getTestStepsConfiguration]
+        for workitem_type in workitem_types:
+            loads.append(lambda workitem_type=workitem_type: self.getInitialWorkflowAction(workitem_type))
+            for enum in _type_enums:
+                loads.append(lambda enum_name=f'{workitem_type}-{enum}': self.getEnum(enum_name))
+
+        def load(function):
+            try:
+                function()
+            except Exception:
+                # not every type has every enumeration, it is loaded again when it is used
+                logger.debug('Could not load metadata of project %s', self.project_id, exc_info=True)
+        for _ in mapOrdered(load, loads, max_workers):
+            pass
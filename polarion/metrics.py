@@ -0,0 +1,274 @@
+import contextvars
+import copy
+import threading
+import time
+from contextlib import contextmanager
+
+from lxml import etree
+from zeep import Plugin
+
+# upper bounds in seconds of the latency histogram buckets, the last bucket counts everything
+latency_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+_fault_path = '{http://schemas.xmlsoap.org/soap/envelope/}Body/{http://schemas.xmlsoap.org/soap/envelope/}Fault'
+
+
+# the scopes entered by the code running in this thread or task, see Metrics.scope
+_active_scopes = contextvars.ContextVar('polarion_metrics_scopes', default=())
+
+
+def _emptyOperation():
+    return {
+        'count': 0,
+        'faults': 0,
+        'total_time': 0.0,
+        'min_time': None,
+        'max_time': None,
+        'request_bytes': 0,
+        'response_bytes': 0,
+        'buckets': [0] * len(latency_buckets),
+    }
+
+
+class Metrics(object):
+    """
+    Collects statistics of the SOAP calls of a Polarion client, per operation. Available as ``Polarion.metrics``.
+
+    Every operation is keyed by service and operation name, for example 'Tracker.getWorkItemByUri', and keeps the
+    number of calls, the number of faults, the latency and the size of the SOAP messages sent and received.
+    The latency is measured from sending the request until the response is parsed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations = {}
+
+    def _record(self, key, duration, request_bytes, response_bytes, fault):
+        with self._lock:
+            _addCall(self._operations, key, duration, request_bytes, response_bytes, fault)
+            for scope in _active_scopes.get():
+                if scope._metrics is self and scope._open:
+                    _addCall(scope._operations, key, duration, request_bytes, response_bytes, fault)
+
+    def snapshot(self):
+        """
+        Get the statistics of all operations called so far.
+
+        :return: Dictionary of operation name to a dictionary with count, faults, total_time, min_time, max_time,
+            request_bytes, response_bytes and buckets, the number of calls per latency bucket
+        :rtype: dict
+        """
+        with self._lock:
+            return copy.deepcopy(self._operations)
+
+    def totals(self):
+        """
+        Get the statistics summed over all operations.
+
+        :return: Dictionary with calls, faults, total_time, request_bytes and response_bytes
+        :rtype: dict
+        """
+        return _totals(self.snapshot())
+
+    def reset(self):
+        """
+        Clears all statistics
+        """
+        with self._lock:
+            self._operations = {}
+
+    @contextmanager
+    def scope(self):
+        """
+        Measure the calls of a block of code. The scope only contains the calls made by the block, in this thread or
+        asyncio task. Calls of other threads using the client at the same time are not counted, calls the client makes
+        on worker threads for the block, like loading the next page of a query, are. Scopes can be nested.
+
+        .. code:: python
+
+            with client.metrics.scope() as scope:
+                document.getWorkitems()
+            print(scope.snapshot())
+
+        :return: The scope, its snapshot is updated until the block is left
+        :rtype: MetricsScope
+        """
+        scope = MetricsScope(self)
+        token = _active_scopes.set(_active_scopes.get() + (scope,))
+        try:
+            yield scope
+        finally:
+            _active_scopes.reset(token)
+            scope._close()
+
+    def toPrometheus(self, prefix='polarion_soap'):
+        """
+        Get the statistics in the Prometheus text exposition format.
+
+        :param prefix: Prefix of the metric names
+        :return: The metrics text
+        :rtype: str
+        """
+        return _toPrometheus(self.snapshot(), prefix)
+
+    def __repr__(self):
+        totals = self.totals()
+        return f'Polarion metrics with {totals["calls"]} calls in {totals["total_time"]:.3f}s'
+
+    def __str__(self):
+        return self.__repr__()
+
+
+class MetricsScope(object):
+    """
+    The calls made within :meth:`Metrics.scope`.
+    """
+
+    def __init__(self, metrics):
+        self._metrics = metrics
+        self._operations = {}
+        self._open = True
+
+    def _close(self):
+        with self._metrics._lock:
+            # calls of worker threads that are still running are not counted after the block
+            self._open = False
+
+    def snapshot(self):
+        """
+        Get the statistics of the operations called within the scope, in the same format as :meth:`Metrics.snapshot`.
+
+        :rtype: dict
+        """
+        with self._metrics._lock:
+            return copy.deepcopy(self._operations)
+
+    def totals(self):
+        """
+        Get the statistics of the scope summed over all operations, see :meth:`Metrics.totals`.
+
+        :rtype: dict
+        """
+        return _totals(self.snapshot())
+
+    def toPrometheus(self, prefix='polarion_soap'):
+        """
+        Get the statistics of the scope in the Prometheus text exposition format.
+
+        :param prefix: Prefix of the metric names
+        :rtype: str
+        """
+        return _toPrometheus(self.snapshot(), prefix)
+
+
+class MetricsPlugin(Plugin):
+    """
+    zeep plugin that measures the calls of one service client and reports them to :class:`Metrics`.
+
+    The sizes are the bodies the transport sent and received, when it reports them like
+    :class:`~polarion.upload.UploadTransport` does. The request size of an upload then includes the data. Otherwise the
+    envelopes are serialized again to measure them.
+
+    :param metrics: The metrics to report to
+    :param service: The service name, for example 'Tracker'
+    :param transport: The transport of the client
+    """
+
+    def __init__(self, metrics, service, transport=None):
+        self._metrics = metrics
+        self._service = service
+        self._transport = transport if hasattr(transport, 'lastCallSizes') else None
+        self._pending = threading.local()
+
+    def egress(self, envelope, http_headers, operation, binding_options):
+        self._pending.start = time.perf_counter()
+        if self._transport is None:
+            self._pending.request_bytes = len(etree.tostring(envelope))
+        return envelope, http_headers
+
+    def ingress(self, envelope, http_headers, operation):
+        start = getattr(self._pending, 'start', None)
+        if start is None:
+            return envelope, http_headers
+        duration = time.perf_counter() - start
+        self._pending.start = None
+
+        if self._transport is not None:
+            request_bytes, response_bytes = self._transport.lastCallSizes()
+        else:
+            request_bytes, response_bytes = self._pending.request_bytes, None
+        content_length = http_headers.get('Content-Length') if http_headers is not None else None
+        if content_length is not None and content_length.isdigit():
+            response_bytes = int(content_length)
+        elif response_bytes is None:
+            response_bytes = len(etree.tostring(envelope))
+        # ingress runs before zeep raises the fault
+        fault = envelope.find(_fault_path) is not None
+
+        name = operation.name if operation is not None else 'unknown'
+        self._metrics._record(f'{self._service}.{name}', duration, request_bytes or 0, response_bytes, fault)
+        return envelope, http_headers
+
+
+def _addCall(operations, key, duration, request_bytes, response_bytes, fault):
+    operation = operations.get(key)
+    if operation is None:
+        operation = operations[key] = _emptyOperation()
+    operation['count'] += 1
+    operation['faults'] += 1 if fault else 0
+    operation['total_time'] += duration
+    operation['min_time'] = duration if operation['min_time'] is None else min(operation['min_time'], duration)
+    operation['max_time'] = duration if operation['max_time'] is None else max(operation['max_time'], duration)
+    operation['request_bytes'] += request_bytes
+    operation['response_bytes'] += response_bytes
+    for index, bound in enumerate(latency_buckets):
+        if duration <= bound:
+            operation['buckets'][index] += 1
+            break
+
+
+def _totals(operations):
+    totals = {'calls': 0, 'faults': 0, 'total_time': 0.0, 'request_bytes': 0, 'response_bytes': 0}
+    for operation in operations.values():
+        totals['calls'] += operation['count']
+        totals['faults'] += operation['faults']
+        totals['total_time'] += operation['total_time']
+        totals['request_bytes'] += operation['request_bytes']
+        totals['response_bytes'] += operation['response_bytes']
+    return totals
+
+
+def _toPrometheus(operations, prefix):
+    lines = [f'# HELP {prefix}_calls_total Number of SOAP calls',
+             f'# TYPE {prefix}_calls_total counter']
+    for key, operation in sorted(operations.items()):
+        lines.append(f'{prefix}_calls_total{_labels(key)} {operation["count"]}')
+
+    lines += [f'# HELP {prefix}_faults_total Number of SOAP calls that returned a fault',
+              f'# TYPE {prefix}_faults_total counter']
+    for key, operation in sorted(operations.items()):
+        lines.append(f'{prefix}_faults_total{_labels(key)} {operation["faults"]}')
+
+    for direction in ('request', 'response'):
+        lines += [f'# HELP {prefix}_{direction}_bytes_total Size of the SOAP {direction} messages',
+                  f'# TYPE {prefix}_{direction}_bytes_total counter']
+        for key, operation in sorted(operations.items()):
+            lines.append(f'{prefix}_{direction}_bytes_total{_labels(key)} {operation[direction + "_bytes"]}')
+
+    lines += [f'# HELP {prefix}_duration_seconds Latency of SOAP calls',
+              f'# TYPE {prefix}_duration_seconds histogram']
+    for key, operation in sorted(operations.items()):
+        cumulative = 0
+        for bound, count in zip(latency_buckets, operation['buckets']):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{prefix}_duration_seconds_bucket{_labels(key, le=le)} {cumulative}')
+        lines.append(f'{prefix}_duration_seconds_sum{_labels(key)} {operation["total_time"]}')
+        lines.append(f'{prefix}_duration_seconds_count{_labels(key)} {operation["count"]}')
+    return '\n'.join(lines) + '\n'
+
+
+def _labels(key, **extra):
+    service, _, operation = key.partition('.')
+    labels = {'service': service, 'operation': operation, **extra}
+    return '{' + ','.join(f'{name}="{value}"' for name, value in labels.items()) + '}'
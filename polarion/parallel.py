@@ -0,0 +1,34 @@
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+def mapOrdered(function, items, max_workers=None):
+    """
+    Apply a function to every item, in a bounded pool of threads when max_workers is more than 1. The results are
+    yielded in the order of the items. The items are consumed lazily, at most twice max_workers calls are in progress.
+
+    :param function: The function to call with each item
+    :param items: Iterable of items
+    :param max_workers: Number of threads, None or 1 to call the function in the calling thread
+    :return: Generator of the results
+    """
+    if max_workers is None or max_workers <= 1:
+        for item in items:
+            yield function(item)
+        return
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for item in items:
+                # in the context of the caller, so the calls count for its metrics scopes
+                pending.append(executor.submit(contextvars.copy_context().run, function, item))
+                if len(pending) >= 2 * max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # the caller stopped early or a call failed, skip the calls that did not start yet
+            for future in pending:
+                future.cancel()
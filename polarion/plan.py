@@ -1,9 +1,9 @@
-from .factory import Creator
+from .base.tracked_fields import TrackedFields
+from .factory import Creator, getOrCreate
 from .workitem import Workitem
-import copy
 
 
-class Plan(object):
+class Plan(TrackedFields):
     """
     A polarion Plan
     """
@@ -48,13 +48,9 @@ class Plan(object):
     def _buildPlanFromPolarion(self):
         if self._polarion_record is not None and not self._polarion_record.unresolvable:
             # parse all polarion attributes to this class
-            self._original_polarion = copy.deepcopy(self._polarion_record)
-            for attr, value in self._polarion_record.__dict__.items():
-                for key in value:
-                    setattr(self, key, value[key])
+            self._setTrackedFields(self._polarion_record)
         else:
             raise Exception(f'Plan not retrieved from Polarion')
-        self._original_polarion = copy.deepcopy(self._polarion_record)
 
     def setDueDate(self, date):
         """
@@ -101,8 +97,8 @@ class Plan(object):
         if any(x.id == workitem.type.id for x in self.allowedTypes.EnumOptionId):
             service = self._polarion.getService('Planning')
             service.addPlanItems(self.uri, [workitem.uri])
-            workitem._reloadFromPolarion()  # noqa: call private to reload from polarion so the plan status is updated
-            self._reloadFromPolarion()
+            workitem._afterWrite()  # noqa: call private to update the workitem so the plan status is updated
+            self._afterWrite()
         else:
             raise Exception(f'Workitem type {workitem.id} is not allowed in this plan')
 
@@ -114,8 +110,8 @@ class Plan(object):
         """
         service = self._polarion.getService('Planning')
         service.removePlanItems(self.uri, [workitem.uri])
-        workitem._reloadFromPolarion()  # noqa: call private to reload from polarion so the plan status is updated
-        self._reloadFromPolarion()
+        workitem._afterWrite()  # noqa: call private to update the workitem so the plan status is updated
+        self._afterWrite()
 
     def addAllowedType(self, type):
         """
@@ -126,7 +122,7 @@ class Plan(object):
         if any(x.id == type for x in self.allowedTypes.EnumOptionId) is False:
             service = self._polarion.getService('Planning')
             service.addPlanAllowedType(self.uri, self._polarion.EnumOptionIdType(id=type))
-            self._reloadFromPolarion()
+            self._afterWrite()
 
     def removeAllowedType(self, type):
         """
@@ -137,7 +133,7 @@ class Plan(object):
         if any(x.id == type for x in self.allowedTypes.EnumOptionId) is True:
             service = self._polarion.getService('Planning')
             service.removePlanAllowedType(self.uri, self._polarion.EnumOptionIdType(id=type))
-            self._reloadFromPolarion()
+            self._afterWrite()
 
     def getWorkitemsInPlan(self):
         """
@@ -148,26 +144,20 @@ class Plan(object):
         if self.records is not None:
             for workitem in self.records.PlanRecord:
                 if workitem.item.id is not None:
-                    workitems.append(Workitem(self._polarion, self._project, polarion_workitem=workitem.item))
+                    workitems.append(getOrCreate(self._polarion, workitem.item.uri, lambda item=workitem.item: Workitem(
+                        self._polarion, self._project, polarion_workitem=item)))
         return workitems
 
     def save(self):
         """
         Update the plan in polarion
         """
-        updated_plan = {}
-
-        for attr, value in self._polarion_record.__dict__.items():
-            for key in value:
-                current_value = getattr(self, key)
-                prev_value = getattr(self._original_polarion, key)
-                if current_value != prev_value:
-                    updated_plan[key] = current_value
+        updated_plan = self._getChangedFields()
         if len(updated_plan) > 0:
             updated_plan['uri'] = self.uri
             service = self._polarion.getService('Planning')
             service.updatePlan(updated_plan)
-            self._reloadFromPolarion()
+            self._afterWrite(fields_only=True)
 
     def getParent(self):
         """
@@ -193,7 +183,6 @@ class Plan(object):
         service = self._polarion.getService('Planning')
         self._polarion_record = service.getPlanByUri(self._polarion_record.uri)
         self._buildPlanFromPolarion()
-        self._original_polarion = copy.deepcopy(self._polarion_record)
 
     def __eq__(self, other):
         if self.id == other.id:
@@ -1,20 +1,53 @@
 import atexit
+import hashlib
 import re
+import threading
+import time
 from urllib.parse import urljoin, urlparse
 import requests
 import tempfile
 import os
-from zeep import Client, CachingClient
+from requests.adapters import HTTPAdapter
+from zeep import Client
+from zeep.cache import SqliteCache
 from zeep.plugins import HistoryPlugin
-from zeep.transports import Transport
 
+from .base.tracked_fields import WritePolicy
+from .cache import RevisionCache, WsdlCache, documentStore
+from .decoder import FastDecoder, fast_operations
+from .identity_map import IdentityMap
+from .metadata import ProjectMetadata
+from .metrics import Metrics, MetricsPlugin
+from .parallel import mapOrdered
 from .project import Project
+from .session import ServiceProxy
+from .upload import UploadTransport
 from .workitem import Workitem
 import logging
 logger = logging.getLogger(__name__)
 
 _baseServiceUrl = 'ws/services'
 
+# types used by the library, resolved from their service on first use
+# TODO: check if the namespace is always the same
+_serviceTypes = {
+    'EnumOptionIdType': ('TestManagement', 'ns3:EnumOptionId'),
+    'TextType': ('TestManagement', 'ns1:Text'),
+    'ArrayOfTestStepResultType': ('TestManagement', 'ns4:ArrayOfTestStepResult'),
+    'ArrayOfTestStepType': ('TestManagement', 'ns4:ArrayOfTestStep'),
+    'TestStepType': ('TestManagement', 'ns4:TestStep'),
+    'ArrayOfTextType': ('TestManagement', 'ns1:ArrayOfText'),
+    'TestStepResultType': ('TestManagement', 'ns4:TestStepResult'),
+    'TestRecordType': ('TestManagement', 'ns4:TestRecord'),
+    'WorkItemType': ('Tracker', 'ns2:WorkItem'),
+    'LinkedWorkItemType': ('Tracker', 'ns2:LinkedWorkItem'),
+    'LinkedWorkItemArrayType': ('Tracker', 'ns2:ArrayOfLinkedWorkItem'),
+    'ArrayOfCustomType': ('Tracker', 'ns2:ArrayOfCustom'),
+    'CustomType': ('Tracker', 'ns2:Custom'),
+    'ArrayOfEnumOptionIdType': ('Tracker', 'ns2:ArrayOfEnumOptionId'),
+    'ArrayOfSubterraURIType': ('Tracker', 'ns1:ArrayOfSubterraURI'),
+}
+
 
 class Polarion(object):
     """
@@ -28,20 +61,67 @@ class Polarion(object):
     :param verify_certificate: Set to True/False to activate certification validation for TLS connection or provide string with link to certification chain (PEM & x264 encoded)
     :param svn_repo_url: Set to the correct url when the SVN repo is not accessible via <host>/repo. For example http://example/repo_extern
     :param proxy: Set to a proxy address to use a proxy, use the format: proxy='ip:port'
+    :param cache: Set to True to cache the WSDL documents in the default zeep cache. A zeep cache object, like :class:`~polarion.cache.WsdlCache`, can be passed to use that cache instead. Clients that get the same cache object also share the compiled documents.
+    :param cache_dir: Directory for a persistent WSDL cache that can be shared between processes. Enables the cache.
+    :param cache_timeout: Seconds a cached WSDL document stays valid, None to keep it until it is evicted
+    :param request_session: A requests.Session to use for all communication with Polarion instead of the pooled session created by the client
+    :param pool_connections: Number of hosts for which a connection pool is kept
+    :param pool_maxsize: Maximum number of connections kept open per host
+    :param pool_block: Set to True to wait for a free connection when all connections to a host are in use, instead of opening an extra one
+    :param keep_alive: Set to False to close the connection after every request
+    :param timeout: Timeout in seconds for every request, either a single number or a (connect, read) tuple. None waits forever.
+    :param session_probe_interval: Seconds after the last successful call before the session is checked proactively. When None (default) the session is only renewed when a call fails because it expired.
+    :param fast_decode: Set to True to decode the responses of operations that load workitems and test runs directly from the XML, which is several times faster than decoding them with zeep
+    :param metadata_ttl: Seconds project metadata, like enumerations and custom field keys, is cached. None to cache it until it is invalidated, see :class:`~polarion.metadata.ProjectMetadata`.
+    :param identity_map: Set to True to reuse the workitems, documents, test runs and users created from a URI, instead of fetching them again every time they are referenced. A :class:`~polarion.identity_map.IdentityMap` can be passed to set its limits.
+    :param revision_cache: Set to True to keep workitems and query results of baselines in a persistent cache in cache_dir, so they are fetched once. A :class:`~polarion.cache.RevisionCache` can be passed to use that cache instead.
+    :param write_policy: What workitems, test runs, records, plans and documents do after a change in Polarion: 'reload' (default) reloads them right away, 'none' keeps the local state and marks them stale, 'lazy' reloads them when a field is used next. See :class:`~polarion.base.tracked_fields.WritePolicy`.
     """
 
     def __init__(self, polarion_url, user, password=None, token=None, static_service_list=False, verify_certificate=True,
-                 svn_repo_url=None, proxy=None, request_session=None, cache=False):
+                 svn_repo_url=None, proxy=None, request_session=None, cache=False, session_probe_interval=None,
+                 pool_connections=10, pool_maxsize=10, pool_block=False, keep_alive=True, timeout=None, cache_dir=None,
+                 cache_timeout=None, fast_decode=False, write_policy=WritePolicy.RELOAD, metadata_ttl=600,
+                 identity_map=False, revision_cache=None):
         self.user = user
         self.password = password
         self.token = token
         self.url = polarion_url
         self.verify_certificate = verify_certificate
         self.svn_repo_url = svn_repo_url
+        # the credentials that worked for the last SVN download
+        self._svn_auth_strategy = None
         self.proxy = None
         self.request_session = request_session
         self.cache = cache
+        self.cache_dir = cache_dir
+        self.cache_timeout = cache_timeout
         self.transport = None
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.session_probe_interval = session_probe_interval
+        self.fast_decode = fast_decode
+        self.write_policy = WritePolicy(write_policy)
+        self.metadata_ttl = metadata_ttl
+        if isinstance(identity_map, IdentityMap):
+            self.identity_map = identity_map
+        elif identity_map:
+            self.identity_map = IdentityMap()
+        else:
+            self.identity_map = None
+        self._last_successful_call = None
+        # guards logging in and creating service clients, so the client can be shared between threads
+        self._lock = threading.RLock()
+        self._session_generation = 0
+        # statistics of all SOAP calls made by this client
+        self.metrics = Metrics()
+        # projects of query results, by id
+        self._projects = {}
+        # metadata caches of projects, by id
+        self._metadata = {}
         if proxy is not None:
             self.proxy = {
                 'http': proxy,
@@ -53,12 +133,18 @@ class Polarion(object):
             self.url += '/'
         self.url = urljoin(self.url, _baseServiceUrl)
 
+        if revision_cache is True:
+            if cache_dir is None:
+                raise Exception('revision_cache=True requires a cache_dir')
+            revision_cache = RevisionCache(cache_dir, self.url, self.user)
+        self.revision_cache = revision_cache or None
+
+        self._createTransport()
         if static_service_list:
             self._getStaticServices()
         else:
             self._getServices()
         self._createSession()
-        self._getTypes()
 
         atexit.register(self._atexit_cleanup)
 
@@ -69,6 +155,14 @@ class Polarion(object):
         """
         self.services['Session']['client'].service.endSession()
 
+    def close(self):
+        """
+        End the session with Polarion. Calls made after closing will log in again.
+        :return: None
+        """
+        atexit.unregister(self._atexit_cleanup)
+        self._atexit_cleanup()
+
     def _getStaticServices(self):
         default_services = ['Session', 'Project', 'Tracker',
                             'Builder', 'Planning', 'TestManagement', 'Security']
@@ -81,7 +175,7 @@ class Polarion(object):
         """
         Parse the list of services available in the overview
         """
-        service_overview = requests.get(self.url, verify=self.verify_certificate)
+        service_overview = self.transport.session.get(self.url, timeout=self.timeout)
         service_base_url = self.url + '/'
         if service_overview.ok:
             services = re.findall(r"(\w+)WebService", service_overview.text)
@@ -94,106 +188,161 @@ class Polarion(object):
         """
         Starts a session with the specified user/password
         """
-        if 'Session' in self.services:
-            self.history = HistoryPlugin()
-            self.services['Session']['client'] = self.get_client('Session',[self.history])
-            if self.proxy is not None:
-                self.services['Session']['client'].transport.session.proxies = self.proxy
-            try:
-                self.sessionHeaderElement = None
-                self.sessionCookieJar = None
-                if self.token is not None:
-                    self.services['Session']['client'].service.logInWithToken(
-                        "AccessToken", "", self.token)
-                else:
-                    self.services['Session']['client'].service.logIn(
-                        self.user, self.password)
-                tree = self.history.last_received['envelope'].getroottree()
-                self.sessionHeaderElement = tree.find(
-                    './/{http://ws.polarion.com/session}sessionID')
-                self.sessionCookieJar = self.services['Session']['client'].transport.session.cookies
-            except Exception as err:
-                logger.error(err)
+        with self._lock:
+            if 'Session' in self.services:
+                if 'client' not in self.services['Session']:
+                    self.history = HistoryPlugin()
+                    self.services['Session']['client'] = self.get_client('Session',[self.history])
+                try:
+                    if self.token is not None:
+                        self.services['Session']['client'].service.logInWithToken(
+                            "AccessToken", "", self.token)
+                    else:
+                        self.services['Session']['client'].service.logIn(
+                            self.user, self.password)
+                    tree = self.history.last_received['envelope'].getroottree()
+                    session_header_element = tree.find(
+                        './/{http://ws.polarion.com/session}sessionID')
+                except Exception as err:
+                    logger.error(err)
+                    raise Exception(
+                        f'Could not log in to Polarion for user {self.user}')
+                # swap the session only when the login completed
+                self.sessionHeaderElement = session_header_element
+                self.sessionCookieJar = self.transport.session.cookies
+                if self.sessionHeaderElement is not None:
+                    self._updateServices()
+                    self._session_generation += 1
+                    self._last_successful_call = time.monotonic()
+            else:
                 raise Exception(
-                    f'Could not log in to Polarion for user {self.user}')
-            if self.sessionHeaderElement is not None:
-                self._updateServices()
+                    'Cannot login because WSDL has no SessionWebService')
+
+    def _renewSession(self, generation):
+        """
+        Log in again after a call failed because the session expired. When several threads see the expired session at
+        the same time, only the first one logs in, the others use the new session.
+
+        :param generation: The session generation that was used for the failed call
+        """
+        with self._lock:
+            if generation == self._session_generation:
+                self._createSession()
+
+    def _createTransport(self):
+        """
+        Creates the transport shared by all service clients and SVN downloads, so connections are pooled and kept alive
+        across services.
+        """
+        if self.request_session is not None:
+            # a user supplied session is used as is, including its adapters and certificate settings
+            session = self.request_session
         else:
-            raise Exception(
-                'Cannot login because WSDL has no SessionWebService')
+            session = requests.Session()
+            session.verify = self.verify_certificate
+            adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize,
+                                  pool_block=self.pool_block)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        if self.proxy is not None:
+            session.proxies.update(self.proxy)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+
+        if self.timeout is not None:
+            self.transport = UploadTransport(cache=self._createCache(), session=session, timeout=self.timeout,
+                                             operation_timeout=self.timeout)
+        else:
+            self.transport = UploadTransport(cache=self._createCache(), session=session)
+
+    def _createCache(self):
+        """
+        Creates the cache for WSDL and XSD documents, if caching is enabled
+        """
+        if self.cache_dir is not None:
+            return WsdlCache(self.cache_dir, self.url, timeout=self.cache_timeout)
+        if self.cache is True:
+            return SqliteCache(timeout=self.cache_timeout)
+        if self.cache:
+            # a cache object supplied by the user
+            return self.cache
+        return None
 
     def get_client(self,service,plugins=[]):
         client = None
+        wsdl_url = self.services[service]['url'] + '?wsdl'
 
-        session = requests.Session()
-        session.verify = self.verify_certificate
-        transport = Transport(session=session)
+        plugins = [*plugins, MetricsPlugin(self.metrics, service, self.transport)]
 
-        if self.cache:
-            client = CachingClient(self.services[service]['url'] + '?wsdl', plugins=plugins, transport=transport)
+        if self.transport.cache is not None:
+            # compiled documents are shared by the clients using the same cache
+            document = documentStore(self.transport.cache).get(wsdl_url, self.transport)
+            client = Client(document, plugins=plugins, transport=self.transport)
         else:
-            client = Client(self.services[service]['url'] + '?wsdl', plugins=plugins, transport=transport)
+            client = Client(wsdl_url, plugins=plugins, transport=self.transport)
         return client
 
     def _updateServices(self):
         """
-        Updates all services with the correct session ID
+        Updates all services that have a client with the correct session ID
         """
         if self.sessionHeaderElement is None:
             raise Exception('Cannot update services when not logged in')
         for service in self.services:
-            if service != 'Session':
-                if 'client' not in service:
-                    self.services[service]['client'] = self.get_client(service)
+            if service != 'Session' and 'client' in self.services[service]:
                 self.services[service]['client'].set_default_soapheaders(
                     [self.sessionHeaderElement])
-                if self.proxy is not None:
-                    self.services[service]['client'].transport.session.proxies = self.proxy
-                self.services[service]['client'].transport.session.cookies = self.sessionCookieJar
-            if service == 'Tracker':
-                if hasattr(self.services[service]['client'].service, 'addComment'):
-                    # allow addComment to be send without title, needed for reply comments
-                    self.services[service]['client'].service.addComment._proxy._binding.get(
-                        'addComment').input.body.type._element[1].nillable = True
-                    self.services[service]['client'].service.getModuleWorkItemUris._proxy._binding.get(
-                        'getModuleWorkItemUris').input.body.type._element[1].nillable = True
-                    self.services[service]['client'].service.moveWorkItemToDocument._proxy._binding.get(
-                        'moveWorkItemToDocument').input.body.type._element[2].nillable = True
-                    self.services[service]['client'].service.reuseDocument._proxy._binding.get(
-                        'reuseDocument').input.body.type._element[6].nillable = True
-                    self.services[service]['client'].service.reuseDocument._proxy._binding.get(
-                        'reuseDocument').input.body.type._element[7].nillable = True
-            if service == 'Planning':
-                self.services[service]['client'].service.createPlan._proxy._binding.get(
-                    'createPlan').input.body.type._element[3].nillable = True
-
-            if service == 'TestManagement':
-                self.services[service]['client'].service.setTestSteps._proxy._binding.get(
-                    'setTestSteps').input.body.type._element[1].min_occurs = 0
-
-    def _getTypes(self):
-        # TODO: check if the namespace is always the same
-        self.EnumOptionIdType = self.getTypeFromService('TestManagement', 'ns3:EnumOptionId')
-        self.TextType = self.getTypeFromService('TestManagement', 'ns1:Text')
-        self.ArrayOfTestStepResultType = self.getTypeFromService('TestManagement', 'ns4:ArrayOfTestStepResult')
-        self.ArrayOfTestStepType = self.getTypeFromService('TestManagement', 'ns4:ArrayOfTestStep')
-        self.TestStepType = self.getTypeFromService('TestManagement', 'ns4:TestStep')
-        self.ArrayOfTextType = self.getTypeFromService('TestManagement', 'ns1:ArrayOfText')
-        self.TestStepResultType = self.getTypeFromService('TestManagement', 'ns4:TestStepResult')
-        self.TestRecordType = self.getTypeFromService('TestManagement', 'ns4:TestRecord')
-        self.WorkItemType = self.getTypeFromService('Tracker', 'ns2:WorkItem')
-        self.LinkedWorkItemType = self.getTypeFromService('Tracker', 'ns2:LinkedWorkItem')
-        self.LinkedWorkItemArrayType = self.getTypeFromService('Tracker', 'ns2:ArrayOfLinkedWorkItem')
-        self.ArrayOfCustomType = self.getTypeFromService('Tracker', 'ns2:ArrayOfCustom')
-        self.CustomType = self.getTypeFromService('Tracker', 'ns2:Custom')
-        self.ArrayOfEnumOptionIdType = self.getTypeFromService('Tracker', 'ns2:ArrayOfEnumOptionId')
-        self.ArrayOfSubterraURIType = self.getTypeFromService('Tracker', 'ns1:ArrayOfSubterraURI')
-        self._PdfProperties = None
-        try:
-            self._PdfProperties = self.getTypeFromService('Tracker', 'ns2:PdfProperties')
-        except:
-            # fail silently if current polarion version does not have PDF properties
-            pass
+
+    def _getClient(self, name: str):
+        """
+        Get the zeep client of a service, it is created on first use.
+        """
+        if name not in self.services:
+            raise Exception('Service does not exsist')
+        if 'client' not in self.services[name]:
+            with self._lock:
+                if 'client' not in self.services[name]:
+                    client = self.get_client(name)
+                    client.set_default_soapheaders([self.sessionHeaderElement])
+                    self._patchClient(name, client)
+                    if self.fast_decode and name in fast_operations:
+                        self.services[name]['decoder'] = FastDecoder(client, fast_operations[name])
+                    self.services[name]['client'] = client
+        return self.services[name]['client']
+
+    def _patchClient(self, name, client):
+        """
+        Relaxes bindings of a service where Polarion accepts values the WSDL does not allow
+        """
+        if name == 'Tracker':
+            if hasattr(client.service, 'addComment'):
+                # allow addComment to be send without title, needed for reply comments
+                client.service.addComment._proxy._binding.get(
+                    'addComment').input.body.type._element[1].nillable = True
+                client.service.getModuleWorkItemUris._proxy._binding.get(
+                    'getModuleWorkItemUris').input.body.type._element[1].nillable = True
+                client.service.moveWorkItemToDocument._proxy._binding.get(
+                    'moveWorkItemToDocument').input.body.type._element[2].nillable = True
+                client.service.reuseDocument._proxy._binding.get(
+                    'reuseDocument').input.body.type._element[6].nillable = True
+                client.service.reuseDocument._proxy._binding.get(
+                    'reuseDocument').input.body.type._element[7].nillable = True
+        if name == 'Planning':
+            client.service.createPlan._proxy._binding.get(
+                'createPlan').input.body.type._element[3].nillable = True
+
+        if name == 'TestManagement':
+            client.service.setTestSteps._proxy._binding.get(
+                'setTestSteps').input.body.type._element[1].min_occurs = 0
+
+    def __getattr__(self, name):
+        # resolve the types on first use, so no service client is created before it is needed
+        if name in _serviceTypes:
+            service, type_name = _serviceTypes[name]
+            value = self.getTypeFromService(service, type_name)
+            setattr(self, name, value)
+            return value
+        raise AttributeError(f'{type(self).__name__} object has no attribute {name}')
 
     @property
     def PdfProperties(self):
@@ -202,6 +351,13 @@ class Polarion(object):
         If is was not able to get it from Polarion, fail with a exception only when using this feature
         @return: PdfProperties
         """
+        if '_PdfProperties' not in self.__dict__:
+            self._PdfProperties = None
+            try:
+                self._PdfProperties = self.getTypeFromService('Tracker', 'ns2:PdfProperties')
+            except:
+                # fail silently if current polarion version does not have PDF properties
+                pass
         if self._PdfProperties is None:
             raise Exception(f'PDF not supported in this Polarion version')
         return self._PdfProperties
@@ -217,81 +373,270 @@ class Polarion(object):
     def getService(self, name: str):
         """
         Get a WSDL service client. The name can be 'Tracker' or 'Session'
+
+        Calls on the returned service log in again and are retried once when the session has expired.
         """
-        # request user info to see if we're still logged in
+        if name not in self.services:
+            raise Exception('Service does not exsist')
+
+        if self.session_probe_interval is not None and self._sessionProbeDue():
+            self._probeSession()
+        return ServiceProxy(self, name)
+
+    def _sessionProbeDue(self):
+        if self._last_successful_call is None:
+            return True
+        return time.monotonic() - self._last_successful_call > self.session_probe_interval
+
+    def _probeSession(self):
+        """
+        Request the user info to see if we're still logged in, if not create a new session
+        """
+        generation = self._session_generation
         try:
-            _user = self.services['Project']['client'].service.getUser(self.user)
+            self._getClient('Project').service.getUser(self.user)
+            self._last_successful_call = time.monotonic()
         except Exception:
-            # if not, create a new session
-            self._createSession()
-
-        if name in self.services:
-            return self.services[name]['client'].service
-        else:
-            raise Exception('Service does not exsist')
+            self._renewSession(generation)
 
     def getTypeFromService(self, name: str, type_name):
         """
         """
-        if name in self.services:
-            return self.services[name]['client'].get_type(type_name)
-        else:
-            raise Exception('Service does not exsist')
+        return self._getClient(name).get_type(type_name)
 
-    def getProject(self, project_id):
+    def getProject(self, project_id, warm_up=False):
         """Get a Polarion project
 
         :param project_id: The ID of the project.
+        :param warm_up: Set to True to load the metadata of the project in parallel, see :meth:`.ProjectMetadata.warmUp`
         :return: The request project
         :rtype: Project
         """
-        return Project(self, project_id)
+        return Project(self, project_id, warm_up=warm_up)
 
-    def queryWorkitems(self, query: str, sort: str):
-        """Get List of workitems based on a query.
+    def queryWorkitems(self, query: str, sort: str, max_workers=None):
+        """Get the workitems matching a query.
         Query is global and not project specific, so it will return workitems from all projects. Use with caution.
         Uses the Polarion query language. Documented as 'Advanced Work Item querying' in the Polarion documentation.
 
+        The query retrieves all fields of the workitems, so they are not fetched again one by one. The workitems are
+        created while iterating, the remaining details like test steps are loaded in max_workers threads when set.
+
         :param query: The query.
         :param sort: The field to be used for sorting.
+        :param max_workers: Number of threads loading the remaining details, None to load them while iterating
         :return: The workitems matching the query
-        :rtype: Workitem[]
+        :rtype: Iterator[Workitem]
         """
         service = self.getService("Tracker")
-        results = service.queryWorkItems(query, sort, fields=["project.id"])
-        workitems = []
-        for result in results:
-            project = self.getProject(result.project.id)
-            workitems.append(Workitem(self, project, uri=result.uri))
-        return workitems
+        results = service.queryWorkItems(query, sort, fields=self._workitemFields())
 
+        def createWorkitem(result):
+            return Workitem(self, self._getCachedProject(result.project.id), polarion_workitem=result)
+        return mapOrdered(createWorkitem, results, max_workers)
+
+    def _workitemFields(self):
+        """
+        The names of all fields of a workitem, to retrieve complete workitems with a query
+        """
+        return [name for name, _element in self.WorkItemType.elements]
+
+    def _getProjectMetadata(self, project_id):
+        """
+        Get the metadata cache of a project, shared by all project objects of this client
+        """
+        metadata = self._metadata.get(project_id)
+        if metadata is None:
+            metadata = self._metadata.setdefault(project_id, ProjectMetadata(self, project_id, self.metadata_ttl))
+        return metadata
+
+    def _getCachedProject(self, project_id):
+        """
+        Get a project, created once per client
+        """
+        project = self._projects.get(project_id)
+        if project is None:
+            project = self._projects.setdefault(project_id, Project(self, project_id))
+        return project
 
-    def downloadFromSvn(self, url):
 
+    def _svnStrategies(self, url):
+        """
+        The ways to access a file in the SVN repository, as (name, url, auth). The strategy that worked last is first.
+        """
         if self.svn_repo_url is not None:
             # user specified new url to try, use that instead of the default value
             orig_url = urlparse(url)
             orig_url_path_without_repo = '/'.join(orig_url.path.split('/')[2:])
             new_root_url = urlparse(self.svn_repo_url)
             new_repo_url = f'{new_root_url.scheme}://{new_root_url.netloc}/{new_root_url.path.strip("/")}/{orig_url_path_without_repo}'
-            resp = requests.get(new_repo_url, auth=(self.user, self.password))
-            if resp.ok:
-                return resp.content
-            raise Exception(f'Could not download attachment from {url}. Got error {resp.status_code}: {resp.reason}')
-        else:
-            # try the url that was given
-            resp = requests.get(url, auth=(self.user, self.password))
+            return [('svn_repo_url', new_repo_url, (self.user, self.password))]
+
+        # the url that was given, else sneakily try the default polarion SVN repo user and password
+        strategies = [('user', url, (self.user, self.password)), ('default', url, ('polarion', 'aurora'))]
+        strategies.sort(key=lambda strategy: strategy[0] != self._svn_auth_strategy)
+        return strategies
+
+    def _svnGet(self, url, headers=None, stream=False):
+        """
+        Get a file from the SVN repository, trying the credentials until one is accepted. The credentials that worked
+        are remembered, so the next file is requested with them first.
+        """
+        failures = []
+        for name, strategy_url, auth in self._svnStrategies(url):
+            resp = self.transport.session.get(strategy_url, auth=auth, headers=headers, stream=stream,
+                                              timeout=self.timeout)
             if resp.ok:
-                return resp.content
+                self._svn_auth_strategy = name
+                return resp
+            resp.close()
+            failures.append(f'{resp.status_code}: {resp.reason} ({name})')
+            if resp.status_code not in (401, 403):
+                # other credentials will not help
+                break
+        raise Exception(f'Could not download attachment from {url}. Got error {", ".join(failures)}')
+
+    def downloadFromSvn(self, url):
+        """
+        Download a file from the SVN repository
 
-            # if that fails then sneakily try downloading it with the default polarion SVN repo user and password
-            resp_default = requests.get(url, auth=('polarion', 'aurora'))
-            if resp_default.ok:
-                return resp_default.content
+        :param url: The url of the file
+        :return: The file content
+        :rtype: bytes
+        """
+        return self._svnGet(url).content
 
-            # if that also fails, tough luck.
-            raise Exception(f'Could not download attachment from {url}. Got error {resp.status_code}: {resp.reason}.\n'
-                            f'Trying with the default polarion login details yielded {resp_default.status_code}: {resp_default.reason}')
+    def downloadFromSvnToFile(self, url, file, resume=True, expected_size=None, checksum=None, hash_name='sha256',
+                              chunk_size=1024 * 1024):
+        """
+        Download a file from the SVN repository in chunks, without holding the file in memory.
+
+        When downloading to a path, the data is written to <path>.part first and moved to the path when complete.
+        An interrupted download leaves the .part file, a next download to the same path continues where it stopped.
+        The ETag or Last-Modified date of the file is kept next to the .part file and sent with the range request,
+        the download starts over when the file changed in the repository since.
+
+        :param url: The url of the file
+        :param file: The path to save the file to, or a writable binary file object
+        :param resume: Continue a previous interrupted download to the same path
+        :param expected_size: Size in bytes the file must have, None to only check the size reported by the server
+        :param checksum: Hex digest the file must have, None to skip this check
+        :param hash_name: The hashlib algorithm of the checksum
+        :param chunk_size: Number of bytes to read at a time
+        :return: The hex digest of the downloaded file
+        :rtype: str
+        """
+        digest = hashlib.new(hash_name)
+        if hasattr(file, 'write'):
+            resp = self._svnGet(url, stream=True)
+            size = self._writeChunks(resp, file, digest, chunk_size)
+            self._checkDownload(url, resp, size, 0, expected_size, digest, checksum)
+            return digest.hexdigest()
+
+        part_path = f'{file}.part'
+        validator_path = f'{part_path}.validator'
+        offset = 0
+        resp = None
+        if resume and os.path.exists(part_path) and os.path.exists(validator_path):
+            with open(validator_path, encoding='utf-8') as validator_file:
+                validator = validator_file.read()
+            resp, offset = self._resumeDownload(url, os.path.getsize(part_path), validator)
+        if offset == 0:
+            if resp is None:
+                resp = self._svnGet(url, stream=True)
+            validator = self._downloadValidator(resp)
+            if validator is None:
+                if os.path.exists(validator_path):
+                    os.remove(validator_path)
+            else:
+                with open(validator_path, 'w', encoding='utf-8') as validator_file:
+                    validator_file.write(validator)
+
+        if offset > 0:
+            with open(part_path, 'rb') as part:
+                for chunk in iter(lambda: part.read(chunk_size), b''):
+                    digest.update(chunk)
+        with open(part_path, 'ab' if offset > 0 else 'wb') as part:
+            size = offset + self._writeChunks(resp, part, digest, chunk_size)
+        try:
+            self._checkDownload(url, resp, size, offset, expected_size, digest, checksum)
+        except Exception:
+            if checksum is not None and digest.hexdigest() != checksum.lower():
+                # corrupt data cannot be resumed
+                os.remove(part_path)
+                if os.path.exists(validator_path):
+                    os.remove(validator_path)
+            raise
+        os.replace(part_path, file)
+        if os.path.exists(validator_path):
+            os.remove(validator_path)
+        return digest.hexdigest()
+
+    def _resumeDownload(self, url, offset, validator):
+        """
+        Request the rest of a file from offset, only when the file did not change since the first part was downloaded.
+
+        :param url: The url of the file
+        :param offset: Number of bytes that were downloaded
+        :param validator: The ETag or Last-Modified date of the file when the first part was downloaded
+        :return: The response and the offset it starts at. The offset is 0 when the server sends the whole file, the
+         response is None when the download has to start over with a new request.
+        """
+        try:
+            resp = self._svnGet(url, headers={'Range': f'bytes={offset}-', 'If-Range': validator}, stream=True)
+        except Exception:
+            # for example the range is not satisfiable because the file got smaller
+            logger.info(f'Could not resume the download of {url}, starting over')
+            return None, 0
+        if resp.status_code != 206:
+            # the file changed or the server does not support ranges
+            logger.info(f'Server sends the whole file {url} instead of the rest, starting over')
+            return resp, 0
+        match = re.fullmatch(r'bytes (\d+)-(\d+)/(\d+|\*)', resp.headers.get('Content-Range', ''))
+        etag = resp.headers.get('ETag')
+        changed = validator.startswith('"') and etag is not None and etag != validator
+        if match is None or int(match.group(1)) != offset or changed:
+            logger.info(f'The rest of {url} does not continue the downloaded part, starting over')
+            resp.close()
+            return None, 0
+        return resp, offset
+
+    @staticmethod
+    def _downloadValidator(resp):
+        """
+        Get the value that identifies the version of a downloaded file, for an If-Range header.
+
+        :param resp: The response with the file
+        :return: The strong ETag or else the Last-Modified date, None when the server sends neither
+        """
+        etag = resp.headers.get('ETag')
+        if etag is not None and not etag.startswith('W/'):
+            return etag
+        return resp.headers.get('Last-Modified')
+
+    @staticmethod
+    def _writeChunks(resp, file, digest, chunk_size):
+        size = 0
+        with resp:
+            for chunk in resp.iter_content(chunk_size):
+                file.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+        return size
+
+    @staticmethod
+    def _checkDownload(url, resp, size, offset, expected_size, digest, checksum):
+        content_length = resp.headers.get('Content-Length')
+        if content_length is not None and 'Content-Encoding' not in resp.headers and \
+                size - offset != int(content_length):
+            raise Exception(f'Download of {url} incomplete, got {size - offset} of {content_length} bytes')
+        content_range = re.fullmatch(r'bytes \d+-\d+/(\d+)', resp.headers.get('Content-Range', ''))
+        if content_range is not None and size != int(content_range.group(1)):
+            raise Exception(f'Download of {url} incomplete, got {size} of {content_range.group(1)} bytes')
+        if expected_size is not None and size != expected_size:
+            raise Exception(f'Downloaded {size} bytes from {url}, expected {expected_size}')
+        if checksum is not None and digest.hexdigest() != checksum.lower():
+            raise Exception(f'Checksum of {url} is {digest.hexdigest()}, expected {checksum}')
 
     def __repr__(self):
         return f'Polarion client for {self.url} with user {self.user}'
@@ -0,0 +1,205 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from zeep.cache import InMemoryCache
+
+from .polarion import Polarion
+import logging
+logger = logging.getLogger(__name__)
+
+
+class PolarionPool(object):
+    """
+    A pool of Polarion clients, each with its own session, for bulk work spread over several worker threads.
+    Sessions are logged in on demand up to max_sessions, checked before they are handed out when they have been idle
+    and recycled when they get too old. Use one pool per process.
+
+    All other arguments are passed to :class:`.Polarion`, so sessions log in with a password or a token.
+
+    :param max_sessions: Maximum number of sessions in the pool
+    :param min_sessions: Number of sessions logged in when the pool is created
+    :param max_age: Seconds after which a session is ended and replaced by a new one, None to keep sessions
+    :param health_check_interval: Seconds a session may be idle before it is checked when it is handed out
+    :param request_session_factory: Function returning a new requests.Session, called for every client. Each client needs its own HTTP session because the cookies belong to the Polarion session.
+    """
+
+    def __init__(self, *args, max_sessions=4, min_sessions=1, max_age=None, health_check_interval=300,
+                 request_session_factory=None, **kwargs):
+        if max_sessions < 1:
+            raise Exception('A pool needs at least one session')
+        if 'request_session' in kwargs:
+            raise Exception('Sessions in a pool cannot share a request_session, use request_session_factory instead')
+        self.max_sessions = max_sessions
+        self.max_age = max_age
+        self.health_check_interval = health_check_interval
+        # compiled WSDL documents are shared by all sessions of the pool
+        kwargs.setdefault('cache', InMemoryCache())
+        self._args = args
+        self._kwargs = kwargs
+        self._request_session_factory = request_session_factory
+
+        self._condition = threading.Condition()
+        self._idle = []
+        self._created = {}
+        self._last_used = {}
+        self._size = 0
+        self._closed = False
+
+        for _i in range(min(min_sessions, max_sessions)):
+            with self._condition:
+                self._size += 1
+            self._idle.append(self._createClient())
+
+    def _createClient(self):
+        """
+        Log in a new client in a place that was reserved by increasing the size. The place is freed when the login
+        fails.
+        """
+        try:
+            if self._request_session_factory is not None:
+                client = Polarion(*self._args, request_session=self._request_session_factory(), **self._kwargs)
+            else:
+                client = Polarion(*self._args, **self._kwargs)
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._created[id(client)] = time.monotonic()
+            self._last_used[id(client)] = time.monotonic()
+        return client
+
+    def _endClient(self, client, keep_place=False):
+        """
+        End the session of a client.
+
+        :param keep_place: Set to True to keep the place of the client reserved for the client replacing it
+        """
+        with self._condition:
+            if not keep_place:
+                self._size -= 1
+                self._condition.notify()
+            self._created.pop(id(client), None)
+            self._last_used.pop(id(client), None)
+        try:
+            client.close()
+        except Exception as err:
+            logger.warning(f'Could not end session: {err}')
+
+    def acquire(self, timeout=None):
+        """
+        Get a client from the pool. Waits for a client to be released when all sessions are in use.
+
+        :param timeout: Seconds to wait for a free session, None to wait forever
+        :return: A logged in client
+        :rtype: Polarion
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise Exception('Pool is closed')
+                if len(self._idle) > 0:
+                    client = self._idle.pop()
+                    break
+                if self._size < self.max_sessions:
+                    # reserve the place, the login happens outside the lock
+                    self._size += 1
+                    client = None
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise Exception('No free Polarion session in the pool')
+                self._condition.wait(remaining)
+
+        if client is None:
+            return self._createClient()
+        return self._checkClient(client)
+
+    def _checkClient(self, client):
+        """
+        Replace a client that is too old and make sure an idle client still has a valid session.
+        """
+        now = time.monotonic()
+        if self.max_age is not None and now - self._created[id(client)] > self.max_age:
+            self._endClient(client, keep_place=True)
+            return self._createClient()
+        if self.health_check_interval is not None and now - self._last_used[id(client)] > self.health_check_interval:
+            try:
+                client._probeSession()
+            except Exception as err:
+                logger.warning(f'Replacing broken session: {err}')
+                self._endClient(client, keep_place=True)
+                return self._createClient()
+        return client
+
+    def release(self, client, discard=False):
+        """
+        Return a client to the pool.
+
+        :param client: The client that was acquired from this pool
+        :param discard: Set to True to end the session instead of reusing it, for example after an error
+        """
+        if discard or self._closed:
+            self._endClient(client)
+            return
+        with self._condition:
+            self._last_used[id(client)] = time.monotonic()
+            self._idle.append(client)
+            self._condition.notify()
+
+    @contextmanager
+    def session(self, timeout=None):
+        """
+        Context manager that acquires a client and releases it again.
+
+        :param timeout: Seconds to wait for a free session, None to wait forever
+        """
+        client = self.acquire(timeout)
+        try:
+            yield client
+        finally:
+            self.release(client)
+
+    def map(self, func, items):
+        """
+        Call func(client, item) for every item on a thread per session. Every call gets a client from the pool.
+
+        :param func: Function to call with a client and an item
+        :param items: The items to process
+        :return: The results in the order of the items
+        :rtype: list
+        """
+        def _run(item):
+            with self.session() as client:
+                return func(client, item)
+
+        with ThreadPoolExecutor(max_workers=self.max_sessions) as executor:
+            return list(executor.map(_run, items))
+
+    def close(self):
+        """
+        End all sessions in the pool. Sessions in use are ended when they are released.
+        """
+        with self._condition:
+            self._closed = True
+            idle = self._idle
+            self._idle = []
+            self._condition.notify_all()
+        for client in idle:
+            self._endClient(client)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return f'Polarion pool with {self._size} of {self.max_sessions} sessions'
+
+    def __str__(self):
+        return f'Polarion pool with {self._size} of {self.max_sessions} sessions'
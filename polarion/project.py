@@ -1,10 +1,36 @@
-from .factory import createFromUri
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from zeep.helpers import serialize_object
+
+from .factory import createFromUri, getOrCreate
+from .parallel import mapOrdered
 from .workitem import Workitem
 from .testrun import Testrun
 from .user import User
 from .plan import Plan
 from .document import Document
 
+# tells query results that are not cached apart from cached None results
+_not_cached = object()
+# upper bound of the id range queries of iterWorkitems, after every id, an open bound is not parsed by every Lucene
+_id_range_end = 'zzzzzzzzzzzzzzzz'
+
+
+class WorkitemFetchError(Exception):
+    """
+    Some workitems of a search could not be fetched. The workitems that were fetched are kept in the exception.
+
+    :ivar workitems: The fetched workitems, in the order of the search
+    :ivar errors: The exception for each id or uri that could not be fetched
+    """
+
+    def __init__(self, workitems, errors, total):
+        details = '; '.join(f'{key}: {error}' for key, error in errors.items())
+        super().__init__(f'Could not fetch {len(errors)} of {total} workitems: {details}')
+        self.workitems = workitems
+        self.errors = errors
+
 
 class Project(object):
     """
@@ -12,10 +38,12 @@ class Project(object):
 
     :param polarion: The polarion client instance
     :param project_id: The project id, as can be found in the URL of the project
+    :param warm_up: Set to True to load the metadata of the project in parallel, see :meth:`.ProjectMetadata.warmUp`
 
+    :ivar metadata: The :class:`~polarion.metadata.ProjectMetadata` cache of this project
     """
 
-    def __init__(self, polarion, project_id):
+    def __init__(self, polarion, project_id, warm_up=False):
         self.polarion = polarion
         self.id = project_id
 
@@ -33,6 +61,10 @@ class Project(object):
         else:
             raise Exception(f'Could not find project {project_id}')
 
+        self.metadata = self.polarion._getProjectMetadata(self.id)
+        if warm_up:
+            self.metadata.warmUp()
+
     def getUsers(self):
         """
         Gets all users in this project
@@ -57,14 +89,35 @@ class Project(object):
                 return user
         return None
 
-    def getWorkitem(self, id: str):
+    def getWorkitem(self, id: str, fields=None):
         """Get a workitem by string
 
         :param id: The ID of the project workitem (PREF-123).
+        :param fields: Only load these fields, other fields are loaded when they are used. None to load all fields.
         :return: The request workitem
         :rtype: Workitem
         """
-        return Workitem(self.polarion, self, id)
+        return Workitem(self.polarion, self, id, fields=fields)
+
+    def getWorkitems(self, ids, fields=None, chunk_size=500, max_workers=4):
+        """Get many workitems by their ids, with one query per chunk of ids instead of one call per workitem.
+
+        :param ids: The IDs of the project workitems
+        :param fields: Only load these fields, other fields are loaded when they are used. None to load all fields.
+        :param chunk_size: Number of ids per query, at most 1024 for the default Lucene clause limit
+        :param max_workers: Number of chunks queried at the same time
+        :return: The workitems by id. Ids that were not found map to None.
+        :rtype: dict[str, Workitem]
+        """
+        if chunk_size < 1:
+            raise Exception(f'chunk_size must be at least 1, not {chunk_size}')
+        unique_ids = list(dict.fromkeys(ids))
+        chunks = [unique_ids[start:start + chunk_size] for start in range(0, len(unique_ids), chunk_size)]
+        workitems = dict.fromkeys(unique_ids)
+        for chunk in mapOrdered(lambda chunk_ids: self._loadWorkitemPage(chunk_ids, fields), chunks, max_workers):
+            for workitem in chunk:
+                workitems[workitem.id] = workitem
+        return workitems
 
     def getPlan(self, id: str):
         """Get a plan by string
@@ -161,49 +214,191 @@ class Project(object):
         :param sort: Sort by
         :param fieldList: list of fields to retrieve for each search result
         :param limit: The limit of workitems, -1 for no limit
-        :return: The search results
+        :return: The search results, from the revision cache of the client when it has them
         :rtype: Workitem[] but only with the given fields set
         """
         if field_list is None:
             field_list = ['id']
         
         query += f' AND project.id:{self.id}'
+        cache = self.polarion.revision_cache
+        cache_key = f'query:{query}|{sort}|{",".join(field_list)}|{limit}'
+        if cache is not None:
+            results = cache.get(cache_key, baselineRevision, _not_cached)
+            if results is None:
+                return None
+            if results is not _not_cached:
+                return [self.polarion.WorkItemType(**result) for result in results]
         service = self.polarion.getService('Tracker')
-        return service.queryWorkItemsInBaselineLimited(
+        results = service.queryWorkItemsInBaselineLimited(
             query, sort, baselineRevision, field_list, limit)
+        if cache is not None:
+            cache.add(cache_key, baselineRevision,
+                      None if results is None else [serialize_object(result, dict) for result in results])
+        return results
 
-    def searchWorkitemFullItem(self, query='', order='Created', limit=-1):
+    def searchWorkitemFullItem(self, query='', order='Created', limit=-1, fields=None, max_workers=None):
         """Query for available workitems. This will query for the items and then fetch all result. May take a while for a big search with many results.
 
+        With fields, the workitems are created from the query results with only these fields loaded, without fetching
+        every result. Other fields are loaded when they are used.
+
         :param query: The query to use while searching
         :param order: Order by
         :param limit: The limit of workitems, -1 for no limit
-        :return: The search results
+        :param fields: Only load these fields, for example ['status', 'customFields.risk']. None to load all fields.
+        :param max_workers: Number of threads fetching the results, None to fetch them one by one. Keep it at most the
+         pool_maxsize of the client, so every thread reuses a pooled connection.
+        :return: The search results, in the order of the query
         :rtype: Workitem[]
+        :raises WorkitemFetchError: When some results could not be fetched, the others are in the exception
         """
-        return_list = []
-        workitems = self.searchWorkitem(query, order, ['id'], limit)
-        for workitem in workitems:
-            return_list.append(
-                Workitem(self.polarion, self, workitem.id))
-        return return_list
+        if fields is not None:
+            workitems = self.searchWorkitem(query, order, Workitem._queryFieldList(fields), limit)
+            return [Workitem(self.polarion, self, polarion_workitem=workitem, fields=fields) for workitem in workitems]
+
+        ids = [workitem.id for workitem in self.searchWorkitem(query, order, ['id'], limit)]
+        return self._fetchWorkitems(ids, lambda workitem_id: Workitem(self.polarion, self, workitem_id), max_workers)
     
-    def searchWorkitemFullItemInBaseline(self, baselineRevision, query='', sort='uri', limit=-1):
+    def iterWorkitems(self, query='', fields=None, page_size=500, prefetch=True):
+        """Iterate over the workitems matching a query, loading them page by page instead of in one large response.
+
+        The workitems are sorted by id. Each page is one query for the next page_size workitems with an id after the
+        last id of the page before, so no list of all results is needed up front and workitems created or deleted
+        while iterating do not shift the pages. Only the current page and the next one are kept in memory.
+
+        The range query compares the ids as text. Every full page is checked with a query for the ids before its last
+        id, so when the server sorts the ids in another order, for example PROJ-9 before PROJ-10, an exception is
+        raised instead of skipping workitems.
+
+        :param query: The query to use while searching
+        :param fields: Only load these fields, for example ['status', 'customFields.risk']. None to load all fields.
+        :param page_size: Number of workitems loaded per query
+        :param prefetch: Load the next page in a background thread while the current page is being used
+        :return: The workitems, in the order of their id
+        :rtype: Iterator[Workitem]
+        """
+        if page_size < 1:
+            raise Exception(f'page_size must be at least 1, not {page_size}')
+        field_list = self.polarion._workitemFields() if fields is None else Workitem._queryFieldList(fields)
+
+        def loadPage(last_id):
+            page_query = query
+            if last_id is not None:
+                after = f'id:{{{last_id} TO {_id_range_end}}}'
+                page_query = after if query == '' else f'({query}) AND {after}'
+            results = self.searchWorkitem(page_query, 'id', field_list, page_size) or []
+            ids = {result.id for result in results}
+            if len(results) == page_size:
+                # the page is only complete when the server sorts the ids like the range compares them, there can be
+                # no other ids before the last one
+                check_query = f'{page_query} AND NOT id:[{max(ids)} TO {_id_range_end}]'
+                before = self.searchWorkitem(check_query, 'id', ['id'], page_size) or []
+                if len(before) >= page_size or any(result.id not in ids for result in before):
+                    raise Exception(f'Polarion does not sort the workitem ids like the id range query compares them, '
+                                    f'pages after {last_id} would skip workitems')
+            return [Workitem(self.polarion, self, polarion_workitem=result, fields=fields) for result in results]
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = None
+            try:
+                page = loadPage(None)
+                while len(page) > 0:
+                    last_page = len(page) < page_size
+                    if prefetch and not last_page:
+                        pending = executor.submit(contextvars.copy_context().run, loadPage,
+                                                  max(workitem.id for workitem in page))
+                    yield from page
+                    if last_page:
+                        return
+                    page = pending.result() if pending is not None else loadPage(max(workitem.id for workitem in page))
+                    pending = None
+            finally:
+                # the caller stopped early, do not load a page that did not start loading
+                if pending is not None:
+                    pending.cancel()
+
+    def _loadWorkitemPage(self, ids, fields):
+        """
+        Load the workitems with the given ids with one query.
+
+        :param ids: The workitem ids
+        :param fields: The fields to load, None for all fields
+        :return: The workitems in the order of the ids
+        :rtype: Workitem[]
+        """
+        field_list = self.polarion._workitemFields() if fields is None else Workitem._queryFieldList(fields)
+        results = self.searchWorkitem(f'id:({" OR ".join(ids)})', 'id', field_list, len(ids))
+        by_id = {result.id: result for result in results}
+        return [Workitem(self.polarion, self, polarion_workitem=by_id[workitem_id], fields=fields)
+                for workitem_id in ids if workitem_id in by_id]
+
+    def searchWorkitemFullItemInBaseline(self, baselineRevision, query='', sort='uri', limit=-1, max_workers=None):
         """Query for available workitems in baseline. This will query for the items and then fetch all result. May take a while for a big search with many results.
 
         :param baselineRevision: The revision number of the baseline to search in
         :param query: The query to use while searching
         :param sort: Sort by
         :param limit: The limit of workitems, -1 for no limit
-        :return: The search results
+        :param max_workers: Number of threads fetching the results, None to fetch them one by one. Keep it at most the
+         pool_maxsize of the client, so every thread reuses a pooled connection.
+        :return: The search results, in the order of the query
         :rtype: Workitem[]
+        :raises WorkitemFetchError: When some results could not be fetched, the others are in the exception
         """
-        return_list = []
-        workitems = self.searchWorkitemInBaseline(baselineRevision, query, sort, ['id'], limit)
-        for workitem in workitems:
-            return_list.append(
-                Workitem(self.polarion, self, uri=workitem.uri))
-        return return_list
+        uris = [workitem.uri for workitem in self.searchWorkitemInBaseline(baselineRevision, query, sort, ['id'], limit)]
+        return self._fetchWorkitems(uris, lambda uri: getOrCreate(
+            self.polarion, uri, lambda: self._getWorkitemInBaseline(uri, baselineRevision), baselineRevision),
+                                    max_workers)
+
+    def _getWorkitemInBaseline(self, uri, baselineRevision):
+        """
+        Get a workitem of a baseline, from the revision cache of the client when it has it.
+
+        :param uri: The uri of the workitem
+        :param baselineRevision: The revision number of the baseline
+        :return: The workitem
+        :rtype: Workitem
+        """
+        cache = self.polarion.revision_cache
+        if cache is None:
+            return Workitem(self.polarion, self, uri=uri)
+        data = cache.get(uri, baselineRevision)
+        if data is not None:
+            return Workitem(self.polarion, self, polarion_workitem=self.polarion.WorkItemType(**data))
+        workitem = Workitem(self.polarion, self, uri=uri)
+        cache.add(uri, baselineRevision, serialize_object(workitem._polarion_item, dict))
+        return workitem
+
+    @staticmethod
+    def _fetchWorkitems(keys, fetch, max_workers):
+        """
+        Fetch a workitem for every key, in max_workers threads when set. All workitems are fetched before the ones that
+        failed are reported.
+
+        :param keys: The ids or uris of the workitems
+        :param fetch: Function creating the workitem for a key
+        :param max_workers: Number of threads, None to fetch the workitems one by one
+        :return: The workitems in the order of the keys
+        :rtype: Workitem[]
+        :raises WorkitemFetchError: When some workitems could not be fetched, with the fetched workitems and the errors
+        """
+        def fetchOne(key):
+            try:
+                return fetch(key), None
+            except Exception as err:
+                return None, err
+
+        workitems = []
+        errors = {}
+        for key, (workitem, error) in zip(keys, mapOrdered(fetchOne, keys, max_workers)):
+            if error is not None:
+                errors[key] = error
+            else:
+                workitems.append(workitem)
+        if len(errors) > 0:
+            raise WorkitemFetchError(workitems, errors, len(keys)) from next(iter(errors.values()))
+        return workitems
 
     def getTestRun(self, id: str):
         """Get a testrun by string
@@ -252,13 +447,7 @@ class Project(object):
         :return: A list of options for the enum
         :rtype: string[]
         """
-        available = []
-        service = self.polarion.getService('Tracker')
-        av = service.getAllEnumOptionsForId(self.id, enum_name)
-        for a in av:
-            if a.id not in available:
-                available.append(a.id)
-        return available
+        return self.metadata.getEnum(enum_name)
 
     def createDocument(self, location, name, title, allowed_workitem_types, structure_link_role, home_page_content=''):
         """
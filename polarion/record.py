@@ -1,6 +1,7 @@
 from enum import Enum
+from .base.tracked_fields import WritePolicy
 from .factory import createFromUri
-import os
+from .upload import uploadFileName
 import requests
 
 
@@ -43,6 +44,7 @@ class Record(object):
         self.save()
 
     def _buildWorkitemFromPolarion(self):
+        self._reload_on_read = False
         # parse all polarion attributes to this class
         for attr, value in self._polarion_record.__dict__.items():
             for key in value:
@@ -51,6 +53,7 @@ class Record(object):
         self._testcase = self._polarion_record.testCaseURI
         self._testcase_name = self._testcase.split('}')[1]
         self._defect = self._polarion_record.defectURI
+        self._stale = False
 
     def _reloadFromPolarion(self):
         service = self._polarion.getService('TestManagement')
@@ -58,6 +61,47 @@ class Record(object):
         self._buildWorkitemFromPolarion()
         # self._original_polarion_test_run = copy.deepcopy(self._polarion_test_run)
 
+    def _afterWrite(self, fields_only=False):
+        # saved fields are kept as they are unless the write policy is to reload
+        # other writes, like adding an attachment, are only visible after a reload, like for a test run it is done when
+        # a field is used next with the 'none' and 'lazy' policies
+        if self._polarion.write_policy is WritePolicy.RELOAD:
+            self._reloadFromPolarion()
+            return
+        if not fields_only:
+            for key in self._polarion_record:
+                self.__dict__.pop(key, None)
+            self._reload_on_read = True
+        self._stale = True
+
+    def __getattr__(self, name):
+        # only called for attributes that are not set, these include the fields after a write
+        if self.__dict__.get('_reload_on_read') and name in self._polarion_record:
+            self._reloadFromPolarion()
+            return getattr(self, name)
+        raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+
+    def __setattr__(self, name, value):
+        if self.__dict__.get('_reload_on_read') and name in self._polarion_record:
+            # reload first, the reload would overwrite the new value
+            self._reloadFromPolarion()
+        object.__setattr__(self, name, value)
+
+    def isStale(self):
+        """
+        Checks if the record may be out of date, because it made a change in Polarion and was not reloaded after it.
+
+        :return: True when the record was not reloaded after a change
+        :rtype: bool
+        """
+        return self._stale
+
+    def reload(self):
+        """
+        Reload the record from Polarion. Changes that were not saved are lost.
+        """
+        self._reloadFromPolarion()
+
     def setTestStepResult(self, step_number, result: ResultType, comment=None):
         """"
         Set the result of a test step
@@ -173,35 +217,41 @@ class Record(object):
             return True
         return False
     
-    def getAttachment(self, file_name):
-        """
-        Get the attachment data
-
-        :param file_name: The attachment file name
-        :return: list of bytes
-        :rtype: bytes[]
-        """
+    def _getAttachmentUrl(self, attachments, file_name):
         # find the file
         url = None
-        for attachment in self.attachments.TestRunAttachment:
+        for attachment in attachments.TestRunAttachment:
             if attachment.fileName == file_name:
                 url = attachment.url
 
         if url is not None:
-            return self._polarion.downloadFromSvn(url)
+            return url
         else:
             raise Exception(f'Could not find attachment with name {file_name}')
 
-    def saveAttachmentAsFile(self, file_name, file_path):
+    def getAttachment(self, file_name):
+        """
+        Get the attachment data
+
+        :param file_name: The attachment file name
+        :return: list of bytes
+        :rtype: bytes[]
         """
-        Save an attachment to file.
+        return self._polarion.downloadFromSvn(self._getAttachmentUrl(self.attachments, file_name))
+
+    def saveAttachmentAsFile(self, file_name, file_path, expected_size=None, checksum=None):
+        """
+        Save an attachment to file. The attachment is downloaded in chunks, see :meth:`.Polarion.downloadFromSvnToFile`.
 
         :param file_name: The attachment file name
-        :param file_path: File where to save the attachment
+        :param file_path: File where to save the attachment, or a writable binary file object
+        :param expected_size: Size in bytes the file must have, None to skip this check
+        :param checksum: SHA-256 hex digest the file must have, None to skip this check
+        :return: The SHA-256 hex digest of the file
+        :rtype: str
         """
-        bin = self.getAttachment(file_name)
-        with open(file_path, "wb") as file:
-            file.write(bin)
+        return self._polarion.downloadFromSvnToFile(self._getAttachmentUrl(self.attachments, file_name), file_path,
+                                                    expected_size=expected_size, checksum=checksum)
 
     def deleteAttachment(self, file_name):
         """
@@ -211,20 +261,22 @@ class Record(object):
         """
         service = self._polarion.getService('TestManagement')
         service.deleteAttachmentFromTestRecord(self._test_run.uri, self._index, file_name)
-        self._reloadFromPolarion()
+        self._afterWrite()
 
-    def addAttachment(self, file_path, title):
+    def addAttachment(self, file_path, title, file_name=None):
         """
-        Upload an attachment
+        Upload an attachment. The content is streamed from the source, it is not read into memory.
 
-        :param file_path: Source file to upload
+        :param file_path: Source file to upload, or a binary file object or buffer like bytes or mmap
         :param title: The title of the attachment
+        :param file_name: The attachment file name, by default the name of the source file. Required for buffers and
+         file objects without a name.
         """
         service = self._polarion.getService('TestManagement')
-        file_name = os.path.split(file_path)[1]
-        with open(file_path, "rb") as file_content:
-            service.addAttachmentToTestRecord(self._test_run.uri, self._index, file_name, title, file_content.read())
-        self._reloadFromPolarion()
+        file_name = uploadFileName(file_path, file_name)
+        with self._polarion.transport.upload(file_path) as data:
+            service.addAttachmentToTestRecord(self._test_run.uri, self._index, file_name, title, data)
+        self._afterWrite()
 
     def testStepHasAttachment(self, step_index):
         """
@@ -249,28 +301,25 @@ class Record(object):
         :return: list of bytes
         :rtype: bytes[]
         """
-        # find the file
-        url = None
-        for attachment in self.testStepResults.TestStepResult[step_index].attachments.TestRunAttachment:
-            if attachment.fileName == file_name:
-                url = attachment.url
-
-        if url is not None:
-            return self._polarion.downloadFromSvn(url)
-        else:
-            raise Exception(f'Could not find attachment with name {file_name}')
+        attachments = self.testStepResults.TestStepResult[step_index].attachments
+        return self._polarion.downloadFromSvn(self._getAttachmentUrl(attachments, file_name))
 
-    def saveAttachmentFromTestStepAsFile(self, step_index, file_name, file_path):
+    def saveAttachmentFromTestStepAsFile(self, step_index, file_name, file_path, expected_size=None, checksum=None):
         """
-        Save an attachment to file from a test step
+        Save an attachment to file from a test step. The attachment is downloaded in chunks, see
+        :meth:`.Polarion.downloadFromSvnToFile`.
 
         :param step_index: The test step index
         :param file_name: The attachment file name
-        :param file_path: File where to save the attachment
+        :param file_path: File where to save the attachment, or a writable binary file object
+        :param expected_size: Size in bytes the file must have, None to skip this check
+        :param checksum: SHA-256 hex digest the file must have, None to skip this check
+        :return: The SHA-256 hex digest of the file
+        :rtype: str
         """
-        bin = self.getAttachmentFromTestStep(step_index, file_name)
-        with open(file_path, "wb") as file:
-            file.write(bin)
+        attachments = self.testStepResults.TestStepResult[step_index].attachments
+        return self._polarion.downloadFromSvnToFile(self._getAttachmentUrl(attachments, file_name), file_path,
+                                                    expected_size=expected_size, checksum=checksum)
 
     def deleteAttachmentFromTestStep(self, step_index, file_name):
         """
@@ -281,21 +330,23 @@ class Record(object):
         """
         service = self._polarion.getService('TestManagement')
         service.deleteAttachmentFromTestStep(self._test_run.uri, self._index, step_index, file_name)
-        self._reloadFromPolarion()
+        self._afterWrite()
 
-    def addAttachmentToTestStep(self, step_index, file_path, title):
+    def addAttachmentToTestStep(self, step_index, file_path, title, file_name=None):
         """
-        Upload an attachment to a test step
+        Upload an attachment to a test step. The content is streamed from the source, it is not read into memory.
 
         :param step_index: The test step index
-        :param file_path: Source file to upload
+        :param file_path: Source file to upload, or a binary file object or buffer like bytes or mmap
         :param title: The title of the attachment
+        :param file_name: The attachment file name, by default the name of the source file. Required for buffers and
+         file objects without a name.
         """
         service = self._polarion.getService('TestManagement')
-        file_name = os.path.split(file_path)[1]
-        with open(file_path, "rb") as file_content:
-            service.addAttachmentToTestStep(self._test_run.uri, self._index, step_index, file_name, title, file_content.read())
-        self._reloadFromPolarion()
+        file_name = uploadFileName(file_path, file_name)
+        with self._polarion.transport.upload(file_path) as data:
+            service.addAttachmentToTestStep(self._test_run.uri, self._index, step_index, file_name, title, data)
+        self._afterWrite()
 
     def save(self):
         """
@@ -303,6 +354,8 @@ class Record(object):
         """
         if self._postpone_save:
             return
+        if self._reload_on_read:
+            self._reloadFromPolarion()
 
         new_item = {}
         for attr, value in self.__dict__.items():
@@ -312,7 +365,7 @@ class Record(object):
         service = self._polarion.getService('TestManagement')
         service.executeTest(
             self._test_run.uri, new_item)
-        self._reloadFromPolarion()
+        self._afterWrite(fields_only=True)
 
     def __repr__(self):
         return f'{self._testcase_name} in {self._test_run.id} ({self.getResult()} on {self.executed})'
@@ -0,0 +1,101 @@
+import re
+import time
+import logging
+
+from zeep.exceptions import Fault, TransportError
+
+logger = logging.getLogger(__name__)
+
+# Fault messages Polarion uses when the session behind the session header is no longer valid
+_expired_session_patterns = [
+    re.compile(r'authentication\s*failed', re.IGNORECASE),
+    re.compile(r'session.*(expired|invalid|not\s+found|timed?\s*out)', re.IGNORECASE),
+    re.compile(r'(invalid|unknown)\s+session', re.IGNORECASE),
+    re.compile(r'no\s+subject', re.IGNORECASE),
+]
+
+# Fault messages of a valid session without the permission for a call, logging in again does not help
+_permission_denied_patterns = [
+    re.compile(r'permission', re.IGNORECASE),
+    re.compile(r'access\s+denied', re.IGNORECASE),
+]
+
+
+def isSessionExpired(error):
+    """
+    Checks if an exception raised by a SOAP call indicates that the Polarion session has expired.
+
+    :param error: The exception raised by zeep
+    :return: True when a new login is required
+    :rtype: bool
+    """
+    if isinstance(error, TransportError):
+        # 403 is a missing permission, not a missing session
+        return error.status_code == 401
+    if isinstance(error, Fault):
+        message = f'{error.message} {error.code}'
+        if any(pattern.search(message) for pattern in _permission_denied_patterns):
+            return False
+        return any(pattern.search(message) for pattern in _expired_session_patterns)
+    return False
+
+
+class ServiceProxy(object):
+    """
+    Wraps a zeep service of the Polarion client. Every operation is called on the current client of the service,
+    when the call fails because the session expired, the client logs in again and retries the call once.
+
+    :param polarion: Polarion client object
+    :param name: The service name, for example 'Tracker'
+    """
+
+    def __init__(self, polarion, name):
+        self._polarion = polarion
+        self._name = name
+
+    def _service(self):
+        return self._polarion._getClient(self._name).service
+
+    def _invoke(self, operation, args, kwargs):
+        service = self._service()
+        decoder = self._polarion.services[self._name].get('decoder')
+        if decoder is not None and decoder.decodes(operation):
+            return decoder.call(operation, *args, **kwargs)
+        return getattr(service, operation)(*args, **kwargs)
+
+    def __getattr__(self, operation):
+        # raises an AttributeError when the operation does not exist, so hasattr() keeps working
+        getattr(self._service(), operation)
+        return _OperationProxy(self, operation)
+
+    def __dir__(self):
+        return dir(self._service())
+
+    def _call(self, operation, *args, **kwargs):
+        generation = self._polarion._session_generation
+        try:
+            result = self._invoke(operation, args, kwargs)
+        except Exception as err:
+            if not isSessionExpired(err):
+                raise
+            logger.info(f'Session expired while calling {self._name}.{operation}, logging in again')
+            self._polarion._renewSession(generation)
+            result = self._invoke(operation, args, kwargs)
+        self._polarion._last_successful_call = time.monotonic()
+        return result
+
+    def __repr__(self):
+        return f'Polarion {self._name} service proxy'
+
+
+class _OperationProxy(object):
+    def __init__(self, service_proxy, operation):
+        self._service_proxy = service_proxy
+        self._operation = operation
+
+    def __call__(self, *args, **kwargs):
+        return self._service_proxy._call(self._operation, *args, **kwargs)
+
+    @property
+    def __doc__(self):
+        return getattr(self._service_proxy._service(), self._operation).__doc__
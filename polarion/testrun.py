@@ -1,14 +1,14 @@
-import copy
-import os
 import requests
 from zeep import xsd
 from .base.comments import Comments
 from .base.custom_fields import CustomFields
+from .base.tracked_fields import TrackedFields
 from .record import Record
 from .factory import Creator
+from .upload import uploadFileName
 
 
-class Testrun(CustomFields, Comments):
+class Testrun(CustomFields, Comments, TrackedFields):
     """
     Create a Polarion testrun object from uri or directly with Polarion content
 
@@ -18,6 +18,7 @@ class Testrun(CustomFields, Comments):
 
     :ivar records: An array of :class:`.Record`
     """
+    _reload_attributes = ('records', '_records', '_record_dict')
 
     def __init__(self, polarion, uri=None, polarion_test_run=None):
         super().__init__(polarion, None, None, uri)
@@ -34,7 +35,6 @@ class Testrun(CustomFields, Comments):
         else:
             raise Exception(f'Provide either an uri or polarion_test_run ')
 
-        self._original_polarion_test_run = copy.deepcopy(self._polarion_test_run)
         self._buildWorkitemFromPolarion()
 
     def isCustomFieldAllowed(self, key):
@@ -42,12 +42,9 @@ class Testrun(CustomFields, Comments):
         
     def _buildWorkitemFromPolarion(self):
         if self._polarion_test_run is not None and not self._polarion_test_run.unresolvable:
-            for attr, value in self._polarion_test_run.__dict__.items():
-                for key in value:
-                    if key == 'records':
-                        setattr(self, '_' + key, value[key])
-                    else:
-                        setattr(self, key, value[key])
+            # the records are not saved with the test run
+            self._records = self._polarion_test_run.records
+            self._setTrackedFields(self._polarion_test_run, skip=['records'])
 
             self.records = []
             self._record_dict = {}
@@ -66,7 +63,6 @@ class Testrun(CustomFields, Comments):
         service = self._polarion.getService('TestManagement')
         self._polarion_test_run = service.getTestRunByUri(self.uri)
         self._buildWorkitemFromPolarion()
-        self._original_polarion_test_run = copy.deepcopy(self._polarion_test_run)
 
     def hasTestCase(self, id):
         """
@@ -101,6 +97,14 @@ class Testrun(CustomFields, Comments):
             return True
         return False
 
+    def _getAttachmentUrl(self, file_name):
+        service = self._polarion.getService('TestManagement')
+        at = service.getTestRunAttachment(self.uri, file_name)
+
+        if at is not None:
+            return at.url
+        raise Exception(f'Could not download attachment {file_name}')
+
     def getAttachment(self, file_name):
         """
         Get the attachment data
@@ -109,23 +113,21 @@ class Testrun(CustomFields, Comments):
         :return: list of bytes
         :rtype: bytes[]
         """
-        service = self._polarion.getService('TestManagement')
-        at = service.getTestRunAttachment(self.uri, file_name)
-
-        if at is not None:
-            return self._polarion.downloadFromSvn(at.url)
-        raise Exception(f'Could not download attachment {file_name}')
+        return self._polarion.downloadFromSvn(self._getAttachmentUrl(file_name))
 
-    def saveAttachmentAsFile(self, file_name, file_path):
+    def saveAttachmentAsFile(self, file_name, file_path, expected_size=None, checksum=None):
         """
-        Save an attachment to file.
+        Save an attachment to file. The attachment is downloaded in chunks, see :meth:`.Polarion.downloadFromSvnToFile`.
 
         :param file_name: The attachment file name
-        :param file_path: File where to save the attachment
+        :param file_path: File where to save the attachment, or a writable binary file object
+        :param expected_size: Size in bytes the file must have, None to skip this check
+        :param checksum: SHA-256 hex digest the file must have, None to skip this check
+        :return: The SHA-256 hex digest of the file
+        :rtype: str
         """
-        binary = self.getAttachment(file_name)
-        with open(file_path, "wb") as file:
-            file.write(binary)
+        return self._polarion.downloadFromSvnToFile(self._getAttachmentUrl(file_name), file_path,
+                                                    expected_size=expected_size, checksum=checksum)
 
     def deleteAttachment(self, file_name):
         """
@@ -135,20 +137,22 @@ class Testrun(CustomFields, Comments):
         """
         service = self._polarion.getService('TestManagement')
         service.deleteTestRunAttachment(self.uri, file_name)
-        self._reloadFromPolarion()
+        self._afterWrite()
 
-    def addAttachment(self, file_path, title):
+    def addAttachment(self, file_path, title, file_name=None):
         """
-        Upload an attachment
+        Upload an attachment. The content is streamed from the source, it is not read into memory.
 
-        :param file_path: Source file to upload
+        :param file_path: Source file to upload, or a binary file object or buffer like bytes or mmap
         :param title: The title of the attachment
+        :param file_name: The attachment file name, by default the name of the source file. Required for buffers and
+         file objects without a name.
         """
         service = self._polarion.getService('TestManagement')
-        file_name = os.path.split(file_path)[1]
-        with open(file_path, "rb") as file_content:
-            service.addAttachmentToTestRun(self.uri, file_name, title, file_content.read())
-        self._reloadFromPolarion()
+        file_name = uploadFileName(file_path, file_name)
+        with self._polarion.transport.upload(file_path) as data:
+            service.addAttachmentToTestRun(self.uri, file_name, title, data)
+        self._afterWrite()
 
     def addTestcase(self, workitem):
         """
@@ -158,41 +162,39 @@ class Testrun(CustomFields, Comments):
         service = self._polarion.getService('TestManagement')
         new_record = self._polarion.TestRecordType(testCaseURI=workitem.uri)
         service.addTestRecordToTestRun(self.uri, new_record)
-        self._reloadFromPolarion()
 
-    def updateAttachment(self, file_path, title):
+        def addLocally():
+            record = Record(self._polarion, self, new_record, len(self.records))
+            self.records.append(record)
+            self._record_dict.setdefault(record.testcase_id, record)
+            return True
+        self._afterWrite(apply_locally=addLocally)
+
+    def updateAttachment(self, file_path, title, file_name=None):
         """
-        Upload an attachment
+        Upload an attachment. The content is streamed from the source, it is not read into memory.
 
-        :param file_path: Source file to upload
+        :param file_path: Source file to upload, or a binary file object or buffer like bytes or mmap
         :param title: The title of the attachment
+        :param file_name: The attachment file name, by default the name of the source file. Required for buffers and
+         file objects without a name.
         """
         service = self._polarion.getService('TestManagement')
-        file_name = os.path.split(file_path)[1]
-        with open(file_path, "rb") as file_content:
-            service.updateTestRunAttachment(self.uri, file_name, title, file_content.read())
-        self._reloadFromPolarion()
+        file_name = uploadFileName(file_path, file_name)
+        with self._polarion.transport.upload(file_path) as data:
+            service.updateTestRunAttachment(self.uri, file_name, title, data)
+        self._afterWrite()
 
     def save(self):
         """
         Update the testrun in polarion
         """
-        updated_item = {}
-        skip = ['records']
-
-        for attr, value in self._polarion_test_run.__dict__.items():
-            for key in value:
-                if key in skip:
-                    continue
-                current_value = getattr(self, key)
-                prev_value = getattr(self._original_polarion_test_run, key)
-                if current_value != prev_value:
-                    updated_item[key] = current_value
+        updated_item = self._getChangedFields()
         if len(updated_item) > 0:
             updated_item['uri'] = self.uri
             service = self._polarion.getService('TestManagement')
             service.updateTestRun(updated_item)
-            self._reloadFromPolarion()
+            self._afterWrite(fields_only=True)
 
     def __repr__(self):
         return f'Testrun {self.id} ({self.title}) created {self.created}'
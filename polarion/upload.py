@@ -0,0 +1,222 @@
+import base64
+import io
+import mmap
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+
+from zeep.transports import Transport
+from zeep.wsdl.utils import etree_to_string
+
+# bytes read from the source at a time, a multiple of 3 so every chunk encodes to base64 without padding
+read_size = 3 * 64 * 1024
+
+
+def uploadFileName(source, file_name=None):
+    """
+    Get the file name of an attachment.
+
+    :param source: A path, a binary file object or a buffer like bytes or mmap
+    :param file_name: The file name given by the caller, None to use the name of the source file
+    :return: The file name
+    :rtype: str
+    """
+    if file_name is not None:
+        return file_name
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.basename(source)
+    name = getattr(source, 'name', None)
+    if isinstance(name, (str, os.PathLike)):
+        return os.path.basename(name)
+    raise ValueError('Pass a file_name for an attachment uploaded from a buffer or a file object without a name')
+
+
+class _Source(object):
+    """
+    The data of an upload: a path, a binary file object or a buffer like bytes, memoryview or mmap.
+    """
+
+    def __init__(self, source):
+        self._file = None
+        self._buffer = None
+        self._close = False
+        if isinstance(source, (str, os.PathLike)):
+            self._file = open(source, 'rb')
+            self._close = True
+        elif isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+            self._buffer = memoryview(source).cast('B')
+        else:
+            self._file = source
+
+        if self._file is not None:
+            self._start = self._file.tell() if self._file.seekable() else None
+            self.size = self._fileSize()
+        else:
+            self.size = len(self._buffer)
+
+    def _fileSize(self):
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            size = None
+        if size is not None and self._start is not None:
+            return size - self._start
+        if self._start is not None:
+            end = self._file.seek(0, os.SEEK_END)
+            self._file.seek(self._start)
+            return end - self._start
+        raise Exception('Cannot upload from a file object of unknown size')
+
+    def chunks(self):
+        """
+        Iterate over the base64 encoded data. Every iteration starts at the beginning, so a call can be retried.
+        """
+        if self._buffer is not None:
+            for offset in range(0, self.size, read_size):
+                yield base64.b64encode(self._buffer[offset:offset + read_size])
+            return
+
+        if self._start is not None:
+            self._file.seek(self._start)
+        remaining = self.size
+        pending = b''
+        while remaining > 0:
+            data = self._file.read(min(read_size, remaining))
+            if not data:
+                raise Exception(f'Upload source ended {remaining} bytes early')
+            remaining -= len(data)
+            data = pending + data
+            # only encode complete groups of 3 bytes until the end
+            cut = len(data) - len(data) % 3 if remaining > 0 else len(data)
+            pending = data[cut:]
+            yield base64.b64encode(data[:cut])
+
+    def encodedSize(self):
+        return (self.size + 2) // 3 * 4
+
+    def close(self):
+        if self._close:
+            self._file.close()
+        elif self._buffer is not None:
+            self._buffer.release()
+
+
+class _UploadBody(object):
+    """
+    A request body that is the serialized envelope with the attachment data encoded while it is sent.
+    """
+
+    def __init__(self, parts):
+        # parts are bytes or sources
+        self._parts = parts
+        self._length = sum(len(part) if isinstance(part, bytes) else part.encodedSize() for part in parts)
+        self._chunks = self._iterChunks()
+        self._buffer = b''
+        self._offset = 0
+
+    def _iterChunks(self):
+        for part in self._parts:
+            if isinstance(part, bytes):
+                yield part
+            else:
+                yield from part.chunks()
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        return self._iterChunks()
+
+    def __bytes__(self):
+        # the complete body, only used when recording or replaying a cassette
+        return b''.join(self._iterChunks())
+
+    def read(self, size=-1):
+        data = []
+        while size is None or size < 0 or size > 0:
+            if self._offset >= len(self._buffer):
+                self._buffer = next(self._chunks, b'')
+                self._offset = 0
+                if not self._buffer:
+                    break
+            end = len(self._buffer) if size is None or size < 0 else self._offset + size
+            piece = self._buffer[self._offset:end]
+            self._offset += len(piece)
+            if size is not None and size > 0:
+                size -= len(piece)
+            data.append(piece)
+        return b''.join(data)
+
+
+class UploadTransport(Transport):
+    """
+    zeep transport that sends attachment data without holding the encoded envelope in memory.
+
+    zeep inlines base64Binary content in the SOAP envelope. Instead of the data, the service is called with a small
+    placeholder from :meth:`upload`. When the envelope is sent the placeholder is replaced by the data, encoded in chunks
+    while it is read from the source.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+        self._uploads = {}
+        # sizes of the last call of each thread, see lastCallSizes
+        self._last_call = threading.local()
+
+    @contextmanager
+    def upload(self, source):
+        """
+        Get the placeholder to pass to a service instead of the attachment data.
+
+        .. code:: python
+
+            with client.transport.upload('report.pdf') as data:
+                client.getService('Tracker').createAttachment(uri, 'report.pdf', 'Report', data)
+
+        :param source: A path, a binary file object or a buffer like bytes or mmap
+        :return: The placeholder data
+        :rtype: bytes
+        """
+        data = _Source(source)
+        # 18 bytes encode to 24 base64 characters without padding, so the placeholder is found in the envelope as is
+        placeholder = uuid.uuid4().bytes + b'\x00\xff'
+        key = base64.b64encode(placeholder)
+        with self._lock:
+            self._uploads[key] = data
+        try:
+            yield placeholder
+        finally:
+            with self._lock:
+                del self._uploads[key]
+            data.close()
+
+    def post_xml(self, address, envelope, headers):
+        message = etree_to_string(envelope)
+        with self._lock:
+            uploads = [(key, data) for key, data in self._uploads.items() if key in message] if self._uploads else []
+        if not uploads:
+            body = message
+        else:
+            parts = [message]
+            for key, data in sorted(uploads, key=lambda upload: message.index(upload[0])):
+                before, _, after = parts.pop().partition(key)
+                parts += [before, data, after]
+            body = _UploadBody(parts)
+        self._last_call.request_bytes = len(body)
+        self._last_call.response_bytes = None
+        response = self.post(address, body, headers)
+        self._last_call.response_bytes = len(response.content)
+        return response
+
+    def lastCallSizes(self):
+        """
+        Get the size in bytes of the last SOAP request body sent by this thread and of the body of its response. The
+        request size of an upload includes the encoded data.
+
+        :return: The request and the response size, None when a size is not known
+        :rtype: tuple
+        """
+        return getattr(self._last_call, 'request_bytes', None), getattr(self._last_call, 'response_bytes', None)
+
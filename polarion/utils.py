@@ -6,6 +6,11 @@ from xml.etree import ElementTree
 from texttable import Texttable
 
 
+# attributes of a long Polarion link, to find the linked workitems before parsing
+_long_link_pattern = re.compile(r'<span[^>]*data-option-id="long"[^>]*>')
+_item_id_pattern = re.compile(r'data-item-id="([^"]+)"')
+
+
 class DescriptionParser(HTMLParser, ABC):
 
     def __init__(self, polarion_project: Project = None):
@@ -17,6 +22,7 @@ class DescriptionParser(HTMLParser, ABC):
         """
         super(DescriptionParser, self).__init__()
         self._polarion_project = polarion_project
+        self._linked_items = {}
         self._data = ''
         self._table_start = None
         self._table_end = None
@@ -39,6 +45,21 @@ class DescriptionParser(HTMLParser, ABC):
         self._table_start = None
         self._table_end = None
 
+    def feed(self, data):
+        """
+        Parse HTML. The workitems of long links are loaded at once before parsing.
+        @param data: the HTML
+        @return: None
+        """
+        if self._polarion_project is not None:
+            ids = set()
+            for link in _long_link_pattern.findall(data):
+                ids.update(_item_id_pattern.findall(link))
+            ids.difference_update(self._linked_items)
+            if len(ids) > 0:
+                self._linked_items.update(self._polarion_project.getWorkitems(ids))
+        super(DescriptionParser, self).feed(data)
+
     def handle_data(self, data):
         """
         Handles the data within HTML tags
@@ -112,7 +133,9 @@ class DescriptionParser(HTMLParser, ABC):
                 attributes['data-option-id'] == 'long' and self._polarion_project is None):
             self._data += attributes['data-item-id']
         else:
-            linked_item = self._polarion_project.getWorkitem(attributes['data-item-id'])
+            linked_item = self._linked_items.get(attributes['data-item-id'])
+            if linked_item is None:
+                linked_item = self._polarion_project.getWorkitem(attributes['data-item-id'])
             self._data += str(linked_item)
 
     def _handle_polarion_rte_formula(self, attributes):
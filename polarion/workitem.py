@@ -1,5 +1,4 @@
 import copy
-import os
 from datetime import datetime, date
 from enum import Enum
 
@@ -7,11 +6,20 @@ from zeep import xsd
 
 from .base.comments import Comments
 from .base.custom_fields import CustomFields
-from .factory import Creator
+from .base.tracked_fields import TrackedFields
+from .factory import Creator, createFromUri
 from .user import User
+from .upload import uploadFileName
 
+# fields loaded with every workitem, also when only some fields are requested
+_always_loaded_fields = ('id', 'type', 'title')
+# attributes of the workitem, always returned by Polarion
+_attribute_fields = ('uri', 'unresolvable')
+# compared with the value assigned to a field that was not loaded, so the assignment is always saved
+_not_loaded = object()
 
-class Workitem(CustomFields, Comments):
+
+class Workitem(CustomFields, Comments, TrackedFields):
     """
     Create a Polarion workitem object either from and id or from an Polarion uri.
 
@@ -20,6 +28,8 @@ class Workitem(CustomFields, Comments):
     :param id: Workitem ID
     :param uri: Polarion uri
     :param polarion_workitem: Polarion workitem content
+    :param fields: Only load these fields, for example ['status', 'assignee', 'customFields.risk']. The id, type and
+     title are always loaded. Other fields are loaded when they are first used. None to load all fields.
 
     """
 
@@ -30,27 +40,40 @@ class Workitem(CustomFields, Comments):
         INTERNAL_REF = 'internal reference'
         EXTERNAL_REF = 'external reference'
 
-    def __init__(self, polarion, project, id=None, uri=None, new_workitem_type=None, new_workitem_fields=None, polarion_workitem=None):
+    def __init__(self, polarion, project, id=None, uri=None, new_workitem_type=None, new_workitem_fields=None, polarion_workitem=None,
+                 fields=None):
         super().__init__(polarion, project, id, uri)
         self._polarion = polarion
         self._project = project
         self._id = id
         self._uri = uri
         self._postpone_save = False
+        # the loaded fields and custom field keys when loaded with fields, None when all fields are loaded
+        self._fields = None
+        self._custom_field_keys = None
+        if fields is not None and new_workitem_type is None:
+            self._fields, self._custom_field_keys = self._splitFields(fields)
 
         service = self._polarion.getService('Tracker')
 
         if self._uri:
             try:
-                self._polarion_item = service.getWorkItemByUri(self._uri)
+                if self._fields is None:
+                    self._polarion_item = service.getWorkItemByUri(self._uri)
+                else:
+                    self._polarion_item = service.getWorkItemByUriWithFields(self._uri, self._fieldList())
                 self._id = self._polarion_item.id
             except Exception:
                 raise Exception(
                     f'Cannot find workitem {self._id} in project {self._project.id}')
         elif id is not None:
             try:
-                self._polarion_item = service.getWorkItemById(
-                    self._project.id, self._id)
+                if self._fields is None:
+                    self._polarion_item = service.getWorkItemById(
+                        self._project.id, self._id)
+                else:
+                    self._polarion_item = service.getWorkItemByIdsWithFields(
+                        self._project.id, self._id, self._fieldList())
             except Exception:
                 raise Exception(
                     f'Cannot find workitem {self._id} in project {self._project.id}')
@@ -61,7 +84,7 @@ class Workitem(CustomFields, Comments):
             self._polarion_item.project = self._project.polarion_data
 
             # get the required field for a new item
-            required_features = service.getInitialWorkflowActionForProjectAndType(self._project.id, self._polarion.EnumOptionIdType(id=new_workitem_type))
+            required_features = self._project.metadata.getInitialWorkflowAction(new_workitem_type)
             if required_features.requiredFeatures is not None:
                 # if there are any, go and check if they are all supplied
                 if new_workitem_fields is None or not set(required_features.requiredFeatures.item) <= new_workitem_fields.keys():
@@ -99,38 +122,209 @@ class Workitem(CustomFields, Comments):
 
     def _buildWorkitemFromPolarion(self):
         if self._polarion_item is not None and not self._polarion_item.unresolvable:
-            self._original_polarion = copy.deepcopy(self._polarion_item)
-            for attr, value in self._polarion_item.__dict__.items():
-                for key in value:
-                    setattr(self, key, value[key])
+            # fields that are not loaded are loaded when first used, see __getattr__
+            not_loaded = [key for key in self._polarion_item if not self._isFieldLoaded(key)]
+            for key in not_loaded:
+                self.__dict__.pop(key, None)
+            self._setTrackedFields(self._polarion_item, skip=not_loaded)
+            # test steps are loaded on first use, see _loadTestSteps
+            self._test_steps_loaded = False
             self._polarion_test_steps = None
-            try:
-                # check if any of the field has the test steps
-                if self._hasTestStepField() is True:
-                    service_test = self._polarion.getService('TestManagement')
-                    self._polarion_test_steps = service_test.getTestSteps(self.uri)
-            except Exception as  e:
-                # fail silently as there are probably not test steps for this workitem
-                # todo: logging support
-                pass
             self._parsed_test_steps = None
-            if self._polarion_test_steps is not None:
-                if self._polarion_test_steps.keys is not None and self._polarion_test_steps.steps:
-                    # oh god, parse the test steps...
-                    columns = []
-                    self._parsed_test_steps = []
-                    for col in self._polarion_test_steps.keys.EnumOptionId:
-                        columns.append(col.id)
-                    # now parse the rows
-                    for row in self._polarion_test_steps.steps.TestStep:
-                        current_row = {}
-                        if row.values is not None:
-                            for col_id in range(len(row.values.Text)):
-                                current_row[columns[col_id]] = row.values.Text[col_id].content
-                            self._parsed_test_steps.append(current_row)
         else:
             raise Exception(f'Workitem not retrieved from Polarion')
 
+    def _loadTestSteps(self):
+        """
+        Load and parse the test steps, if the workitem has them and they are not loaded yet.
+        """
+        if self._test_steps_loaded:
+            return
+        self._polarion_test_steps = None
+        try:
+            # check if any of the field has the test steps
+            if self._hasTestStepField() is True:
+                service_test = self._polarion.getService('TestManagement')
+                self._polarion_test_steps = service_test.getTestSteps(self.uri)
+        except Exception as  e:
+            # fail silently as there are probably not test steps for this workitem
+            # todo: logging support
+            pass
+        self._parsed_test_steps = None
+        if self._polarion_test_steps is not None:
+            if self._polarion_test_steps.keys is not None and self._polarion_test_steps.steps:
+                # oh god, parse the test steps...
+                columns = []
+                self._parsed_test_steps = []
+                for col in self._polarion_test_steps.keys.EnumOptionId:
+                    columns.append(col.id)
+                # now parse the rows
+                for row in self._polarion_test_steps.steps.TestStep:
+                    current_row = {}
+                    if row.values is not None:
+                        for col_id in range(len(row.values.Text)):
+                            current_row[columns[col_id]] = row.values.Text[col_id].content
+                        self._parsed_test_steps.append(current_row)
+        self._test_steps_loaded = True
+
+    @staticmethod
+    def _splitFields(fields):
+        """
+        Split the requested fields in workitem fields and custom field keys.
+        @param fields: Field names, custom fields as 'customFields.<key>'
+        @return: The set of field names and the set of custom field keys
+        """
+        names = set(_always_loaded_fields)
+        custom_field_keys = set()
+        for field in fields:
+            name, _, key = field.partition('.')
+            if name == 'customFields' and key:
+                custom_field_keys.add(key)
+            else:
+                names.add(name)
+        return names, custom_field_keys
+
+    @staticmethod
+    def _queryFieldList(fields):
+        """
+        Get the fields to request from Polarion for workitems loaded with fields.
+        @param fields: Field names, custom fields as 'customFields.<key>'
+        @return: List of fields for the field limited Tracker operations
+        """
+        names, custom_field_keys = Workitem._splitFields(fields)
+        field_list = sorted(name for name in names if name not in _attribute_fields)
+        if 'customFields' not in names:
+            field_list += [f'customFields.{key}' for key in sorted(custom_field_keys)]
+        return field_list
+
+    def _fieldList(self):
+        return self._queryFieldList(list(self._fields) + [f'customFields.{key}' for key in self._custom_field_keys])
+
+    def _isFieldLoaded(self, name):
+        """
+        Checks if a field is loaded, the custom fields are loaded when at least one key is loaded.
+        """
+        if self._fields is None or name in self._fields or name in _attribute_fields:
+            return True
+        return name == 'customFields' and len(self._custom_field_keys) > 0
+
+    def _loadFields(self, names):
+        """
+        Load fields that were not loaded yet.
+        @param names: The field names
+        @return: None
+        """
+        service = self._polarion.getService('Tracker')
+        polarion_item = service.getWorkItemByUriWithFields(self.uri, list(names))
+        for name in names:
+            value = polarion_item[name]
+            self._polarion_item[name] = value
+            self._setTrackedField(name, value)
+            self._fields.add(name)
+
+    def _loadCustomFields(self, key=None):
+        """
+        Load all custom fields when only some custom fields are loaded.
+        @param key: Only load them when this custom field key is not loaded yet, None to always load them
+        @return: None
+        """
+        if self._fields is None or 'customFields' in self._fields:
+            return
+        if key is None or key not in self._custom_field_keys:
+            self._loadFields(['customFields'])
+
+    def _polarionList(self, name):
+        """
+        Get a copy of a list field as it is in Polarion, to make the change of a write to it locally.
+        @param name: The field name, like 'assignee'
+        @return: The copy of the array, its list of items and the type of the items. None for all when the field is
+         not loaded.
+        """
+        if not self._isFieldLoaded(name) or self._field_copies.get(name) is _not_loaded:
+            return None, None, None
+        array_type = dict(self._polarion.WorkItemType.elements)[name].type
+        item_name, item_element = array_type.elements[0]
+        array = copy.deepcopy(self._polarion_item[name])
+        if array is None:
+            array = array_type()
+        return array, array[item_name], item_element.type
+
+    def _addLinkLocally(self, name, uri, role):
+        """
+        Add a link to a workitem to a linked items field, after it was added in Polarion.
+        @param name: 'linkedWorkItems' or 'linkedWorkItemsDerived'
+        @param uri: The uri of the linked workitem
+        @param role: The link role
+        @return: True when the link was added, False when the field is not loaded
+        """
+        array, links, link_type = self._polarionList(name)
+        if array is None:
+            return False
+        links.append(link_type(role=self._polarion.EnumOptionIdType(id=role), suspect=False, workItemURI=uri))
+        self._setPolarionField(name, array)
+        return True
+
+    def _removeLinksLocally(self, name, uri, role=None):
+        """
+        Remove the links to a workitem from a linked items field, after they were removed in Polarion.
+        @param name: 'linkedWorkItems' or 'linkedWorkItemsDerived'
+        @param uri: The uri of the linked workitem
+        @param role: Only remove the links with this role, None to remove all
+        @return: True when the links were removed, False when the field is not loaded
+        """
+        array, links, _ = self._polarionList(name)
+        if array is None:
+            return False
+        links[:] = [link for link in links if link.workItemURI != uri or (role is not None and link.role.id != role)]
+        self._setPolarionField(name, array)
+        return True
+
+    def __getattr__(self, name):
+        try:
+            return super().__getattr__(name)
+        except AttributeError:
+            pass
+        # load fields that were left out when loading with fields
+        fields = self.__dict__.get('_fields')
+        polarion_item = self.__dict__.get('_polarion_item')
+        if name.startswith('_') or fields is None or polarion_item is None or name not in polarion_item:
+            raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+        self._loadFields([name])
+        return getattr(self, name)
+
+    def __setattr__(self, name, value):
+        fields = self.__dict__.get('_fields')
+        polarion_item = self.__dict__.get('_polarion_item')
+        if not name.startswith('_') and fields is not None and polarion_item is not None and name in polarion_item \
+                and not self._isFieldLoaded(name):
+            if self._reload_on_read:
+                # reload first, the reload would forget the field
+                self._reloadFromPolarion()
+            # assigning a field that was not loaded does not need its value, it is saved whatever it was
+            fields.add(name)
+            self._tracked_fields.add(name)
+            self._field_copies[name] = _not_loaded
+        super().__setattr__(name, value)
+
+    def getCustomField(self, key):
+        """
+        Get the custom field 'key' to the value
+        :param key: custom field key
+        :return: custom field value if exists, else None
+        """
+        self._loadCustomFields(key)
+        return super().getCustomField(key)
+
+    def setCustomFields(self, custom_fields):
+        """
+        Set several custom fields and save them at once
+        :param custom_fields: dictionary with the custom field keys and values
+        :return: None
+        """
+        # all custom fields are sent when saving
+        self._loadCustomFields()
+        super().setCustomFields(custom_fields)
+
     def getAuthor(self):
         """
         Get the author of the workitem
@@ -150,7 +344,7 @@ class Workitem(CustomFields, Comments):
         """
         service = self._polarion.getService('Tracker')
         service.removeApprovee(self.uri, user.id)
-        self._reloadFromPolarion()
+        self._afterWrite()
 
     def addApprovee(self, user: User, remove_others=False):
         """
@@ -167,7 +361,7 @@ class Workitem(CustomFields, Comments):
                 service.removeApprovee(self.uri, current_user.id)
 
         service.addApprovee(self.uri, user.id)
-        self._reloadFromPolarion()
+        self._afterWrite()
 
     def getApproverUsers(self):
         """
@@ -203,7 +397,15 @@ class Workitem(CustomFields, Comments):
         """
         service = self._polarion.getService('Tracker')
         service.removeAssignee(self.uri, user.id)
-        self._reloadFromPolarion()
+
+        def removeLocally():
+            assignee, users, _ = self._polarionList('assignee')
+            if assignee is None:
+                return False
+            users[:] = [assigned_user for assigned_user in users if assigned_user.id != user.id]
+            self._setPolarionField('assignee', assignee)
+            return True
+        self._afterWrite(apply_locally=removeLocally)
 
     def addAssignee(self, user: User, remove_others=False):
         """
@@ -220,7 +422,17 @@ class Workitem(CustomFields, Comments):
                 service.removeAssignee(self.uri, current_user.id)
 
         service.addAssignee(self.uri, user.id)
-        self._reloadFromPolarion()
+
+        def addLocally():
+            assignee, users, user_type = self._polarionList('assignee')
+            if assignee is None:
+                return False
+            if remove_others:
+                users.clear()
+            users.append(user_type(**{key: user._polarion_record[key] for key in user._polarion_record}))
+            self._setPolarionField('assignee', assignee)
+            return True
+        self._afterWrite(apply_locally=addLocally)
 
     def getStatusEnum(self):
         """
@@ -272,11 +484,17 @@ class Workitem(CustomFields, Comments):
         :rtype: string[]
         """
         try:
-            service = self._polarion.getService('Tracker')
-            return service.getCustomFieldKeys(self.uri)
+            return self._getCustomFieldKeys()
         except Exception:
             return []
 
+    def _getCustomFieldKeys(self):
+        """
+        Get the custom field keys of this workitem, cached per workitem type in the project metadata.
+        @return: The keys
+        """
+        return self._project.metadata.getCustomFieldKeys(self.type.id if self.type is not None else None, self.uri)
+
     def isCustomFieldAllowed(self, key):
         """
         Checks if the custom field of a given key is allowed.
@@ -293,12 +511,7 @@ class Workitem(CustomFields, Comments):
         :return: An array of string of the statusses
         :rtype: string[]
         """
-        available_status = []
-        service = self._polarion.getService('Tracker')
-        av_status = service.getAvailableEnumOptionIdsForId(self.uri, 'status')
-        for status in av_status:
-            available_status.append(status.id)
-        return available_status
+        return self._project.metadata.getAvailableStatus(self.type.id if self.type is not None else None, self.uri)
 
     def getAvailableActionsDetails(self):
         """
@@ -402,6 +615,7 @@ class Workitem(CustomFields, Comments):
         :return: True/False
         :rtype: boolean
         """
+        self._loadTestSteps()
         if self._parsed_test_steps is not None:
             return len(self._parsed_test_steps) > 0
         return False
@@ -417,7 +631,15 @@ class Workitem(CustomFields, Comments):
         if isinstance(hyperlink_type, Enum):  # convert Enum to str
             hyperlink_type = hyperlink_type.value
         service.addHyperlink(self.uri, url, {'id': hyperlink_type})
-        self._reloadFromPolarion()
+
+        def addLocally():
+            hyperlinks, items, hyperlink_item_type = self._polarionList('hyperlinks')
+            if hyperlinks is None:
+                return False
+            items.append(hyperlink_item_type(role=self._polarion.EnumOptionIdType(id=hyperlink_type), uri=url))
+            self._setPolarionField('hyperlinks', hyperlinks)
+            return True
+        self._afterWrite(apply_locally=addLocally)
 
     def removeHyperlink(self, url):
         """
@@ -427,7 +649,15 @@ class Workitem(CustomFields, Comments):
         """
         service = self._polarion.getService('Tracker')
         service.removeHyperlink(self.uri, url)
-        self._reloadFromPolarion()
+
+        def removeLocally():
+            hyperlinks, items, _ = self._polarionList('hyperlinks')
+            if hyperlinks is None:
+                return False
+            items[:] = [hyperlink for hyperlink in items if hyperlink.uri != url]
+            self._setPolarionField('hyperlinks', hyperlinks)
+            return True
+        self._afterWrite(apply_locally=removeLocally)
 
     def addLinkedItem(self, workitem, link_type):
         """
@@ -439,8 +669,9 @@ class Workitem(CustomFields, Comments):
 
         service = self._polarion.getService('Tracker')
         service.addLinkedItem(self.uri, workitem.uri, role={'id': link_type})
-        self._reloadFromPolarion()
-        workitem._reloadFromPolarion()
+        self._afterWrite(apply_locally=lambda: self._addLinkLocally('linkedWorkItems', workitem.uri, link_type))
+        workitem._afterWrite(
+            apply_locally=lambda: workitem._addLinkLocally('linkedWorkItemsDerived', self.uri, link_type))
 
     def removeLinkedItem(self, workitem, role=None):
         """
@@ -463,8 +694,16 @@ class Workitem(CustomFields, Comments):
                 for linked_item in self.linkedWorkItemsDerived.LinkedWorkItem:
                     if linked_item.workItemURI == workitem.uri:
                         service.removeLinkedItem(linked_item.workItemURI, self.uri, role=linked_item.role)
-        self._reloadFromPolarion()
-        workitem._reloadFromPolarion()
+        if role is not None:
+            self._afterWrite(apply_locally=lambda: self._removeLinksLocally('linkedWorkItems', workitem.uri, role))
+            workitem._afterWrite(
+                apply_locally=lambda: workitem._removeLinksLocally('linkedWorkItemsDerived', self.uri, role))
+        else:
+            # the links in both directions are removed
+            self._afterWrite(apply_locally=lambda: self._removeLinksLocally('linkedWorkItems', workitem.uri) and
+                             self._removeLinksLocally('linkedWorkItemsDerived', workitem.uri))
+            workitem._afterWrite(apply_locally=lambda: workitem._removeLinksLocally('linkedWorkItems', self.uri) and
+                                 workitem._removeLinksLocally('linkedWorkItemsDerived', self.uri))
 
     def getLinkedItemWithRoles(self):
         """
@@ -477,11 +716,11 @@ class Workitem(CustomFields, Comments):
         if self.linkedWorkItems is not None:
             for linked_item in self.linkedWorkItems.LinkedWorkItem:
                 if linked_item.role is not None:
-                    linked_items.append((linked_item.role.id, Workitem(self._polarion, self._project, uri=linked_item.workItemURI)))
+                    linked_items.append((linked_item.role.id, createFromUri(self._polarion, self._project, linked_item.workItemURI)))
         if self.linkedWorkItemsDerived is not None:
             for linked_item in self.linkedWorkItemsDerived.LinkedWorkItem:
                 if linked_item.role is not None:
-                    linked_items.append((linked_item.role.id, Workitem(self._polarion, self._project, uri=linked_item.workItemURI)))
+                    linked_items.append((linked_item.role.id, createFromUri(self._polarion, self._project, linked_item.workItemURI)))
         return linked_items
 
     def getLinkedItem(self):
@@ -534,34 +773,38 @@ class Workitem(CustomFields, Comments):
         """
         service = self._polarion.getService('Tracker')
         service.deleteAttachment(self.uri, id)
-        self._reloadFromPolarion()
+        self._afterWrite()
 
-    def addAttachment(self, file_path, title):
+    def addAttachment(self, file_path, title, file_name=None):
         """
-        Upload an attachment
+        Upload an attachment. The content is streamed from the source, it is not read into memory.
 
-        :param file_path: Source file to upload
+        :param file_path: Source file to upload, or a binary file object or buffer like bytes or mmap
         :param title: The title of the attachment
+        :param file_name: The attachment file name, by default the name of the source file. Required for buffers and
+         file objects without a name.
         """
         service = self._polarion.getService('Tracker')
-        file_name = os.path.split(file_path)[1]
-        with open(file_path, "rb") as file_content:
-            service.createAttachment(self.uri, file_name, title, file_content.read())
-        self._reloadFromPolarion()
+        file_name = uploadFileName(file_path, file_name)
+        with self._polarion.transport.upload(file_path) as data:
+            service.createAttachment(self.uri, file_name, title, data)
+        self._afterWrite()
 
-    def updateAttachment(self, id, file_path, title):
+    def updateAttachment(self, id, file_path, title, file_name=None):
         """
-        Upload an attachment
+        Upload an attachment. The content is streamed from the source, it is not read into memory.
 
         :param id: The attachment id
-        :param file_path: Source file to upload
+        :param file_path: Source file to upload, or a binary file object or buffer like bytes or mmap
         :param title: The title of the attachment
+        :param file_name: The attachment file name, by default the name of the source file. Required for buffers and
+         file objects without a name.
         """
         service = self._polarion.getService('Tracker')
-        file_name = os.path.split(file_path)[1]
-        with open(file_path, "rb") as file_content:
-            service.updateAttachment(self.uri, id, file_name, title, file_content.read())
-        self._reloadFromPolarion()
+        file_name = uploadFileName(file_path, file_name)
+        with self._polarion.transport.upload(file_path) as data:
+            service.updateAttachment(self.uri, id, file_name, title, data)
+        self._afterWrite()
 
     def delete(self):
         """
@@ -570,6 +813,8 @@ class Workitem(CustomFields, Comments):
         """
         service = self._polarion.getService('Tracker')
         service.deleteWorkItem(self.uri)
+        if self._polarion.identity_map is not None:
+            self._polarion.identity_map.invalidate(self.uri)
 
     def moveToDocument(self, document, parent):
         """
@@ -581,6 +826,15 @@ class Workitem(CustomFields, Comments):
         service = self._polarion.getService('Tracker')
         service.moveWorkItemToDocument(self.uri, document.uri, parent.uri if parent is not None else xsd.const.Nil, -1,
                                        False)
+        self._afterWrite()
+
+    def removeFromDocument(self):
+        """
+        Move the work item out of its document, the work item itself is kept
+        """
+        service = self._polarion.getService('Tracker')
+        service.moveWorkItemOutOfDocument(self.uri)
+        self._afterWrite()
 
     def addTestStep(self, *args):
         """
@@ -591,6 +845,7 @@ class Workitem(CustomFields, Comments):
         # check test step custom field
         if self._hasTestStepField() is False:
             raise Exception('Cannot add test steps to work item that does not have the custom field')
+        self._loadTestSteps()
 
         # if the keys do not exist, add them now
         if self._polarion_test_steps.keys is None:
@@ -623,8 +878,10 @@ class Workitem(CustomFields, Comments):
         # save it to the service
         service = self._polarion.getService('TestManagement')
         service.setTestSteps(self.uri, self._polarion_test_steps.steps.TestStep)
+        # parsed again on next use
+        self._test_steps_loaded = False
 
-        self._reloadFromPolarion()
+        self._afterWrite()
 
     def removeTestStep(self, index: int):
         """
@@ -635,6 +892,7 @@ class Workitem(CustomFields, Comments):
         # check test step custom field
         if self._hasTestStepField() is False:
             raise Exception('Cannot remove test steps to work item that does not have the custom field')
+        self._loadTestSteps()
 
         if index >= len(self._polarion_test_steps.steps.TestStep):
             raise ValueError(f'Index should be in range of test step length of {len(self._polarion_test_steps.steps.TestStep)}')
@@ -648,8 +906,10 @@ class Workitem(CustomFields, Comments):
         # save it to the service
         service = self._polarion.getService('TestManagement')
         service.setTestSteps(self.uri, self._polarion_test_steps.steps.TestStep)
+        # parsed again on next use
+        self._test_steps_loaded = False
 
-        self._reloadFromPolarion()
+        self._afterWrite()
 
     def updateTestStep(self, index: int, *args):
         """
@@ -661,6 +921,7 @@ class Workitem(CustomFields, Comments):
         # check test step custom field
         if self._hasTestStepField() is False:
             raise Exception('Cannot update test steps to work item that does not have the custom field')
+        self._loadTestSteps()
 
         # Verify validity of index
         if type(index) != int:
@@ -689,8 +950,10 @@ class Workitem(CustomFields, Comments):
         # save it to the service
         service = self._polarion.getService('TestManagement')
         service.setTestSteps(self.uri, self._polarion_test_steps.steps.TestStep)
+        # parsed again on next use
+        self._test_steps_loaded = False
 
-        self._reloadFromPolarion()
+        self._afterWrite()
 
     def getTestStepHeader(self):
         """
@@ -718,6 +981,7 @@ class Workitem(CustomFields, Comments):
         Return a list of test steps.
         @return: Array of test steps
         """
+        self._loadTestSteps()
         if self._parsed_test_steps is None:
             return []
         else:
@@ -742,9 +1006,7 @@ class Workitem(CustomFields, Comments):
         @return: [str]
         """
         columns = []
-        service = self._polarion.getService('TestManagement')
-        config = service.getTestStepsConfiguration(self._project.id)
-        for col in config:
+        for col in self._getTestStepsConfiguration():
             columns.append(col.name)
         return columns
 
@@ -754,12 +1016,17 @@ class Workitem(CustomFields, Comments):
         @return: [str]
         """
         columns = []
-        service = self._polarion.getService('TestManagement')
-        config = service.getTestStepsConfiguration(self._project.id)
-        for col in config:
+        for col in self._getTestStepsConfiguration():
             columns.append(col.id)
         return columns
 
+    def _getTestStepsConfiguration(self):
+        """
+        Return the test step columns configured in the project, cached in the project metadata.
+        @return: The columns
+        """
+        return self._project.metadata.getTestStepsConfiguration()
+
     def _testStepNoneCheck(self):
         """
         Sanity check on content of test steps when empty strings are use.
@@ -776,8 +1043,7 @@ class Workitem(CustomFields, Comments):
         Checks if the testSteps custom field is available for this workitem. If so it allows test steps to be added.
         @return: True when test steps are available
         """
-        service = self._polarion.getService('Tracker')
-        custom_fields = service.getCustomFieldKeys(self.uri)
+        custom_fields = self._getCustomFieldKeys()
         if 'testSteps' in custom_fields:
             return True
         return False
@@ -789,30 +1055,25 @@ class Workitem(CustomFields, Comments):
         """
         if self._postpone_save:
             return
-        updated_item = {}
-
-        for attr, value in self._polarion_item.__dict__.items():
-            for key in value:
-                current_value = getattr(self, key)
-                prev_value = getattr(self._original_polarion, key)
-                if current_value != prev_value:
-                    updated_item[key] = current_value
+        updated_item = self._getChangedFields()
         if len(updated_item) > 0:
             updated_item['uri'] = self.uri
             service = self._polarion.getService('Tracker')
             service.updateWorkItem(updated_item)
-            self._reloadFromPolarion()
+            self._afterWrite(fields_only=True)
 
     def _reloadFromPolarion(self):
         service = self._polarion.getService('Tracker')
-        self._polarion_item = service.getWorkItemByUri(self._polarion_item.uri)
+        if self._fields is None:
+            self._polarion_item = service.getWorkItemByUri(self._polarion_item.uri)
+        else:
+            self._polarion_item = service.getWorkItemByUriWithFields(self._polarion_item.uri, self._fieldList())
         self._buildWorkitemFromPolarion()
-        self._original_polarion = copy.deepcopy(self._polarion_item)
 
     def __eq__(self, other):
         try:
-            a = vars(self)
-            b = vars(other)
+            a = self._getFieldValues()
+            b = other._getFieldValues()
         except Exception:
             return False
         return self._compareType(a, b)
@@ -822,8 +1083,8 @@ class Workitem(CustomFields, Comments):
                        bool, type(None), str, datetime, date]
 
         for key in a:
-            if key.startswith('_'):
-                # skip private types
+            if key.startswith('_') or key not in b:
+                # skip private types and fields that are not loaded
                 continue
             # first to a quick type compare to catch any easy differences
             if type(a[key]) == type(b[key]):
@@ -216,6 +216,7 @@ class Importer:
     TEST_CASE_WI_TYPE='testcase'
     TEST_CASE_WI_TITLE='title'
     TEST_RUN_COMMENT_CUSTOM_FIELD='environmentDescription'
+    WORKITEM_ID_PATTERN=re.compile(r'\w+-\d+')             # traced values that are work item ids, other values are titles
 
     @classmethod
     def from_xml(cls, config):
@@ -263,6 +264,13 @@ class Importer:
             test_run.setCustomField(Importer.TEST_RUN_COMMENT_CUSTOM_FIELD, test_run._polarion.TextType(
                     content=comment, type='text/html', contentLossy=False))
 
+        # load the existing test cases and the traced work items referenced by id with a few queries
+        referenced_ids=[test_cases_from_id[case['id']] for case in cases if case['id'] in test_cases_from_id]
+        for case in cases:
+            for property in case.get('properties', []):
+                referenced_ids+=[value for value in property.values() if isinstance(value, str) and Importer.WORKITEM_ID_PATTERN.fullmatch(value)]
+        workitems_from_id=project.getWorkitems(referenced_ids)
+
         # cache for work items traced
         cache_for_workitems = {}
 
@@ -277,7 +285,7 @@ class Importer:
                 wi_case=project.createWorkitem(workitem_type=Importer.TEST_CASE_WI_TYPE, new_workitem_fields={Importer.TEST_CASE_WI_TITLE: case['id']})
                 wi_case.setCustomField(key=Importer.TEST_CASE_ID_CUSTOM_FIELD, value=case['id'])
             else:
-                wi_case=project.getWorkitem(test_cases_from_id[case['id']])
+                wi_case=workitems_from_id.get(test_cases_from_id[case['id']]) or project.getWorkitem(test_cases_from_id[case['id']])
             test_run.addTestcase(wi_case)
             
             if 'time' in case.keys():
@@ -306,6 +314,8 @@ class Importer:
                         title=property.get(key)
                         if title in cache_for_workitems:
                             linked_item = cache_for_workitems[title]
+                        elif workitems_from_id.get(title) is not None:
+                            linked_item = workitems_from_id[title]
                         else:
                             try:
                                 linked_item=project.getWorkitem(property.get(key))
@@ -0,0 +1,28 @@
+import asyncio
+import unittest
+from polarion.async_polarion import AsyncPolarion
+from keys import polarion_user, polarion_password, polarion_url, polarion_project_id
+
+
+class TestPolarionAsync(unittest.TestCase):
+
+    def test_search_full_item(self):
+        async def search():
+            async with await AsyncPolarion.connect(polarion_url, polarion_user, polarion_password,
+                                                   max_concurrency=5) as client:
+                project = await client.getProject(polarion_project_id)
+                found = await project.searchWorkitem('type:task', field_list=['id'], limit=10)
+                full = await project.searchWorkitemFullItem('type:task', limit=10)
+                return found, full
+
+        found, full = asyncio.run(search())
+        self.assertEqual([w.id for w in found], [w.id for w in full])
+
+    def test_call(self):
+        async def keys():
+            async with await AsyncPolarion.connect(polarion_url, polarion_user, polarion_password) as client:
+                project = await client.getProject(polarion_project_id)
+                return await client.call('Project', 'getProject', project.id)
+
+        polarion_data = asyncio.run(keys())
+        self.assertEqual(polarion_data.id, polarion_project_id)
@@ -0,0 +1,67 @@
+import asyncio
+import time
+import unittest
+
+from benchmarks.stand_in import StandInPolarion, StandInServer
+from polarion.async_polarion import AsyncPolarion
+
+
+class TestPolarionAsyncLoop(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StandInServer(StandInPolarion())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.close()
+
+    def test_concurrency_matches_pool(self):
+        async def connect(**kwargs):
+            client = await AsyncPolarion.connect(self.server.url, 'user', 'password', **kwargs)
+            await client.close()
+            client.polarion.close()
+            return client.max_concurrency, client.polarion.pool_maxsize
+
+        self.assertEqual((10, 10), asyncio.run(connect()))
+        self.assertEqual((4, 4), asyncio.run(connect(max_concurrency=4)))
+        self.assertEqual((4, 8), asyncio.run(connect(max_concurrency=4, pool_maxsize=8)))
+
+    def test_close_does_not_block(self):
+        async def close():
+            client = await AsyncPolarion.connect(self.server.url, 'user', 'password')
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            call = asyncio.ensure_future(client.run(time.sleep, 0.3))
+            await asyncio.sleep(0.05)
+            ticker = asyncio.ensure_future(tick())
+            await client.close()
+            ticker.cancel()
+            await call
+            client.polarion.close()
+            return ticks
+
+        self.assertGreater(asyncio.run(close()), 5, msg='The event loop keeps running while the calls finish')
+
+    def test_metrics_scope_per_task(self):
+        async def scoped(client, count):
+            with client.polarion.metrics.scope() as scope:
+                for _ in range(count):
+                    await client.call('Session', 'hasSubject')
+            return scope.totals()['calls']
+
+        async def run():
+            client = await AsyncPolarion.connect(self.server.url, 'user', 'password')
+            try:
+                return await asyncio.gather(scoped(client, 2), scoped(client, 3))
+            finally:
+                await client.close()
+                client.polarion.close()
+
+        self.assertEqual([2, 3], asyncio.run(run()), msg='Each task only counts its own calls')
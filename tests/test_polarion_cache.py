@@ -0,0 +1,201 @@
+import datetime
+import decimal
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from zeep import Settings, Transport
+from zeep.cache import InMemoryCache
+from zeep.helpers import serialize_object
+
+from benchmarks.stand_in import StandInPolarion, StandInServer
+from polarion.cache import DocumentStore, RevisionCache, WsdlCache, documentStore
+from polarion.polarion import Polarion
+
+
+class TestPolarionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def test_wsdl_cache(self):
+        cache = WsdlCache(self.cache_dir.name, 'http://example.com/polarion/ws/services')
+        self.assertIsNone(cache.get('http://example.com/a.wsdl'))
+
+        cache.add('http://example.com/a.wsdl', b'<definitions/>')
+        self.assertEqual(cache.get('http://example.com/a.wsdl'), b'<definitions/>')
+
+        # another process with the same server url and version shares the cache
+        other = WsdlCache(self.cache_dir.name, 'http://example.com/polarion/ws/services')
+        self.assertEqual(other.get('http://example.com/a.wsdl'), b'<definitions/>')
+
+    def test_wsdl_cache_version(self):
+        cache = WsdlCache(self.cache_dir.name, 'http://example.com/polarion/ws/services', version='2304')
+        cache.add('http://example.com/a.wsdl', b'<definitions/>')
+
+        updated = WsdlCache(self.cache_dir.name, 'http://example.com/polarion/ws/services', version='2310')
+        self.assertIsNone(updated.get('http://example.com/a.wsdl'))
+
+    def test_wsdl_cache_timeout(self):
+        cache = WsdlCache(self.cache_dir.name, 'http://example.com/polarion/ws/services', timeout=-1)
+        cache.add('http://example.com/a.wsdl', b'<definitions/>')
+        self.assertIsNone(cache.get('http://example.com/a.wsdl'))
+
+    def test_wsdl_cache_validation(self):
+        cache = WsdlCache(self.cache_dir.name, 'http://example.com/polarion/ws/services')
+        cache.add('http://example.com/a.wsdl', b'<definitions/>')
+
+        connection = sqlite3.connect(os.path.join(self.cache_dir.name, 'wsdl.db'))
+        with connection:
+            connection.execute('UPDATE document SET content = ?', (b'<corrupt',))
+        connection.close()
+
+        self.assertIsNone(cache.get('http://example.com/a.wsdl'))
+
+    def test_wsdl_cache_eviction(self):
+        cache = WsdlCache(self.cache_dir.name, 'http://example.com/polarion/ws/services', max_entries=2)
+        for index in range(3):
+            cache.add(f'http://example.com/{index}.wsdl', b'<definitions/>')
+
+        self.assertIsNone(cache.get('http://example.com/0.wsdl'))
+        self.assertIsNotNone(cache.get('http://example.com/2.wsdl'))
+
+    def test_document_store_shared_by_cache(self):
+        with StandInServer(StandInPolarion()) as server:
+            cache = InMemoryCache()
+            clients = [Polarion(server.url, 'user', 'password', cache=cache) for _ in range(2)]
+            other = Polarion(server.url, 'user', 'password', cache=InMemoryCache())
+            try:
+                documents = [client._getClient('Tracker').wsdl for client in clients + [other]]
+                self.assertIs(documents[0], documents[1], msg='Clients with the same cache share the document')
+                self.assertIsNot(documents[0], documents[2])
+                self.assertIs(cache.documents, documentStore(cache))
+            finally:
+                for client in clients + [other]:
+                    client.close()
+
+    def test_document_store_settings(self):
+        with StandInServer(StandInPolarion()) as server:
+            transport = Transport()
+            store = DocumentStore()
+            url = f'{server.url}/ws/services/TrackerWebService?wsdl'
+            document = store.get(url, transport)
+            self.assertIs(document, store.get(url, transport))
+            self.assertIs(document, store.get(url, transport, settings=None))
+            strict = store.get(url, transport, settings=Settings(strict=False))
+            self.assertIsNot(document, strict)
+            self.assertIs(strict, store.get(url, transport, settings=Settings(strict=False)))
+
+    def test_document_store_lock_per_url(self):
+        with StandInServer(StandInPolarion()) as server:
+            slow_url = f'{server.url}/ws/services/TrackerWebService?wsdl'
+            fast_url = f'{server.url}/ws/services/SessionWebService?wsdl'
+            loading = threading.Event()
+            release = threading.Event()
+
+            class SlowTransport(Transport):
+                def load(self, url):
+                    if url == slow_url:
+                        loading.set()
+                        release.wait(10)
+                    return super().load(url)
+
+            store = DocumentStore()
+            transport = SlowTransport()
+            thread = threading.Thread(target=store.get, args=(slow_url, transport))
+            thread.start()
+            try:
+                self.assertTrue(loading.wait(10))
+                self.assertIsNotNone(store.get(fast_url, transport), msg='Not blocked by the other document')
+                self.assertFalse(release.is_set())
+            finally:
+                release.set()
+                thread.join()
+            self.assertIsNotNone(store.get(slow_url, transport))
+
+    def test_revision_cache(self):
+        cache = RevisionCache(self.cache_dir.name, 'http://example.com/polarion/ws/services')
+        self.assertIsNone(cache.get('subterra:uri', 1234))
+
+        cache.add('subterra:uri', 1234, {'id': 'PYTH-1', 'status': {'id': 'open'}})
+        self.assertEqual({'id': 'PYTH-1', 'status': {'id': 'open'}}, cache.get('subterra:uri', '1234'))
+        self.assertIsNone(cache.get('subterra:uri', 1235))
+
+        # another process with the same server url shares the cache
+        other = RevisionCache(self.cache_dir.name, 'http://example.com/polarion/ws/services')
+        self.assertIsNotNone(other.get('subterra:uri', 1234))
+        other_server = RevisionCache(self.cache_dir.name, 'http://other.example.com/polarion/ws/services')
+        self.assertIsNone(other_server.get('subterra:uri', 1234))
+
+    def test_revision_cache_user(self):
+        cache = RevisionCache(self.cache_dir.name, 'http://example.com/polarion/ws/services', 'admin')
+        cache.add('subterra:uri', 1234, {'id': 'PYTH-1'})
+        self.assertIsNotNone(cache.get('subterra:uri', 1234))
+        other_user = RevisionCache(self.cache_dir.name, 'http://example.com/polarion/ws/services', 'guest')
+        self.assertIsNone(other_user.get('subterra:uri', 1234), msg='Not served to a user with other permissions')
+
+    def test_revision_cache_values(self):
+        cache = RevisionCache(self.cache_dir.name, 'http://example.com/polarion/ws/services')
+        data = {'created': datetime.datetime(2024, 1, 1, 10, 0, tzinfo=datetime.timezone.utc),
+                'dueDate': datetime.date(2024, 2, 1), 'time': datetime.time(10, 30), 'estimate': decimal.Decimal('1.5'),
+                'content': b'\x00\x01', 'list': [1, 'two', None], 'flag': True}
+        cache.add('subterra:uri', 1234, data)
+        self.assertEqual(data, cache.get('subterra:uri', 1234))
+
+        connection = sqlite3.connect(os.path.join(self.cache_dir.name, 'revisions.db'))
+        content = connection.execute('SELECT content FROM revision').fetchone()[0]
+        connection.close()
+        self.assertTrue(content.startswith(b'{'), msg='Stored as JSON')
+
+        with self.assertRaises(TypeError):
+            cache.add('subterra:other', 1234, {'value': object()})
+
+    def test_revision_cache_none(self):
+        cache = RevisionCache(self.cache_dir.name, 'http://example.com/polarion/ws/services')
+        missing = object()
+        self.assertIs(missing, cache.get('query:nothing', 1234, missing))
+        cache.add('query:nothing', 1234, None)
+        self.assertIsNone(cache.get('query:nothing', 1234, missing), msg='A stored None is not a miss')
+
+    def test_revision_cache_eviction(self):
+        cache = RevisionCache(self.cache_dir.name, 'http://example.com/polarion/ws/services', max_bytes=3000)
+        for index in range(3):
+            cache.add(f'subterra:{index}', 1234, 'x' * 1000)
+
+        self.assertIsNone(cache.get('subterra:0', 1234))
+        self.assertIsNotNone(cache.get('subterra:2', 1234))
+
+    def test_revision_cache_validation(self):
+        cache = RevisionCache(self.cache_dir.name, 'http://example.com/polarion/ws/services')
+        cache.add('subterra:uri', 1234, 'data')
+
+        connection = sqlite3.connect(os.path.join(self.cache_dir.name, 'revisions.db'))
+        with connection:
+            connection.execute('UPDATE revision SET content = ?', (b'corrupt',))
+        connection.close()
+
+        self.assertIsNone(cache.get('subterra:uri', 1234))
+
+    def test_revision_cache_baseline(self):
+        data = StandInPolarion()
+        for _ in range(3):
+            data.addWorkitem()
+        with StandInServer(data) as server:
+            workitems = []
+            calls = []
+            for _ in range(2):
+                pol = Polarion(server.url, 'user', 'password', cache_dir=self.cache_dir.name, revision_cache=True)
+                project = pol.getProject('BENCH')
+                with pol.metrics.scope() as scope:
+                    workitems.append(project.searchWorkitemFullItemInBaseline('1234'))
+                calls.append(scope.totals()['calls'])
+                pol.close()
+            self.assertEqual([4, 0], calls, msg='The second client is served from the cache')
+            # the clients compiled their own documents, so compare the data instead of the zeep objects
+            self.assertEqual([serialize_object(workitem._polarion_item) for workitem in workitems[0]],
+                             [serialize_object(workitem._polarion_item) for workitem in workitems[1]])
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+
+import requests
+from requests.adapters import BaseAdapter
+
+from benchmarks.stand_in import StandInPolarion, StandInServer
+from polarion.cassette import Cassette
+from polarion.polarion import Polarion
+
+
+def _envelope(operation, value):
+    return (f'<soap-env:Envelope xmlns:soap-env="http://schemas.xmlsoap.org/soap/envelope/"><soap-env:Body>'
+            f'<ns0:{operation} xmlns:ns0="http://ws.polarion.com/test"><ns0:value>{value}</ns0:value></ns0:{operation}>'
+            f'</soap-env:Body></soap-env:Envelope>').encode('utf-8')
+
+
+class _EchoAdapter(BaseAdapter):
+    """
+    Answers every request with the request body, counting the requests
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def send(self, request, **kwargs):
+        self.count += 1
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.headers['Content-Type'] = 'text/xml'
+        response.headers['Set-Cookie'] = 'JSESSIONID=secret'
+        response._content = f'{self.count}:'.encode('utf-8') + (request.body or b'binary\xff')
+        response.url = request.url
+        response.request = request
+        return response
+
+
+class TestPolarionCassette(unittest.TestCase):
+
+    def setUp(self):
+        self.cassette_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.cassette_dir.name, 'session.json.gz')
+
+    def tearDown(self):
+        self.cassette_dir.cleanup()
+
+    def _record(self):
+        cassette = Cassette(self.path)
+        session = cassette.recordingSession(_EchoAdapter())
+        session.post('http://example.com/ws/Tracker', data=_envelope('logIn', 'password'))
+        session.post('http://example.com/ws/Tracker', data=_envelope('getWorkItem', 'A'))
+        session.post('http://example.com/ws/Tracker', data=_envelope('getWorkItem', 'B'))
+        session.get('http://example.com/repo/file.bin')
+        cassette.save()
+        return cassette
+
+    def test_record(self):
+        self._record()
+        cassette = Cassette.load(self.path)
+        self.assertEqual(len(cassette.interactions), 4)
+        self.assertEqual(cassette.interactions[0]['request']['operation'], 'logIn')
+        self.assertIsNone(cassette.interactions[3]['request']['operation'])
+        # request bodies and cookies are not stored
+        self.assertNotIn('Set-Cookie', cassette.interactions[0]['response']['headers'])
+        self.assertNotIn('password', cassette.interactions[0]['request'].values())
+
+    def test_replay(self):
+        self._record()
+        session = Cassette.load(self.path).replaySession()
+
+        response = session.post('http://example.com/ws/Tracker', data=_envelope('getWorkItem', 'B'))
+        self.assertTrue(response.text.startswith('3:'))
+        response = session.post('http://example.com/ws/Tracker', data=_envelope('getWorkItem', 'A'))
+        self.assertTrue(response.text.startswith('2:'))
+        # repeated requests get the last response
+        response = session.post('http://example.com/ws/Tracker', data=_envelope('getWorkItem', 'A'))
+        self.assertTrue(response.text.startswith('2:'))
+        self.assertEqual(session.get('http://example.com/repo/file.bin').content, b'4:binary\xff')
+
+    def test_replay_other_body(self):
+        self._record()
+        session = Cassette.load(self.path).replaySession()
+
+        # another password still gets the recorded login
+        response = session.post('http://example.com/ws/Tracker', data=_envelope('logIn', 'other'))
+        self.assertTrue(response.text.startswith('1:'))
+
+    def test_replay_missing(self):
+        self._record()
+        session = Cassette.load(self.path).replaySession()
+
+        with self.assertRaises(Exception):
+            session.post('http://example.com/ws/Tracker', data=_envelope('endSession', ''))
+        with self.assertRaises(Exception):
+            session.get('http://example.com/repo/other.bin')
+
+    def test_replay_client_download(self):
+        data = StandInPolarion()
+        content = bytes(range(256)) * 100
+        data.svn_files['/repo/BENCH/file.bin'] = content
+        with StandInServer(data) as server:
+            url = server.url.replace('/polarion', '/repo/BENCH/file.bin')
+            cassette = Cassette(self.path)
+            pol = Polarion(server.url, 'user', 'password', request_session=cassette.recordingSession())
+            pol.downloadFromSvn(url)
+            pol.downloadFromSvnToFile(url, os.path.join(self.cassette_dir.name, 'recorded.bin'))
+            pol.close()
+            cassette.save()
+
+        pol = Polarion(server.url, 'user', 'password', request_session=Cassette.load(self.path).replaySession())
+        try:
+            self.assertEqual(content, pol.downloadFromSvn(url))
+            path = os.path.join(self.cassette_dir.name, 'replayed.bin')
+            pol.downloadFromSvnToFile(url, path, chunk_size=1000)
+            with open(path, 'rb') as file:
+                self.assertEqual(content, file.read())
+        finally:
+            pol.close()
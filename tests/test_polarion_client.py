@@ -5,6 +5,7 @@ from filecmp import cmp
 from shutil import copyfile
 from datetime import datetime
 from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
 
 
 class TestPolarionClient(unittest.TestCase):
@@ -69,6 +70,84 @@ class TestPolarionClient(unittest.TestCase):
                       str(type(pol.ArrayOfTestStepResultType)))
         self.assertIn('TestStepResult', str(type(pol.TestStepResultType)))
 
+    def test_session_expired(self):
+        pol = Polarion(polarion_url, polarion_user, polarion_password)
+        pol.getService('Session').endSession()
+
+        # the next call should log in again transparently
+        project = pol.getProject(polarion_project_id)
+        self.assertEqual(project.id, polarion_project_id)
+
+    def test_session_expired_threads(self):
+        pol = Polarion(polarion_url, polarion_user, polarion_password)
+        project = pol.getProject(polarion_project_id)
+        generation = pol._session_generation
+        pol.getService('Session').endSession()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            projects = list(executor.map(lambda _: pol.getProject(project.id), range(8)))
+
+        self.assertEqual(len(projects), 8)
+        # all threads share a single new login
+        self.assertEqual(pol._session_generation, generation + 1)
+
+    def test_session_probe_interval(self):
+        pol = Polarion(polarion_url, polarion_user, polarion_password, session_probe_interval=0)
+        with mock.patch.object(pol, '_createSession') as mock_session:
+            pol.getService('Tracker')
+            mock_session.assert_not_called()
+
+    def test_shared_transport(self):
+        pol = Polarion(polarion_url, polarion_user, polarion_password, pool_maxsize=4, timeout=(5, 60))
+        pol.getService('Tracker')
+        pol.getService('TestManagement')
+
+        for service in ['Session', 'Tracker', 'TestManagement']:
+            self.assertIs(pol.services[service]['client'].transport, pol.transport)
+        self.assertEqual(pol.transport.operation_timeout, (5, 60))
+
+    def test_lazy_services(self):
+        pol = Polarion(polarion_url, polarion_user, polarion_password)
+        self.assertNotIn('client', pol.services['Tracker'])
+
+        pol.getService('Tracker')
+        tracker_client = pol.services['Tracker']['client']
+
+        # a new login reuses the clients that were already created
+        pol._createSession()
+        self.assertIs(pol.services['Tracker']['client'], tracker_client)
+
+    def test_metrics(self):
+        pol = Polarion(polarion_url, polarion_user, polarion_password)
+        self.assertEqual(pol.metrics.snapshot()['Session.logIn']['count'], 1)
+
+        with pol.metrics.scope() as scope:
+            pol.getProject(polarion_project_id)
+        operations = scope.snapshot()
+        self.assertEqual(operations['Project.getProject']['count'], 1)
+        self.assertEqual(operations['Project.getProject']['faults'], 0)
+        self.assertGreater(operations['Project.getProject']['response_bytes'], 0)
+        self.assertNotIn('Session.logIn', operations)
+
+        prometheus = pol.metrics.toPrometheus()
+        self.assertIn('polarion_soap_calls_total{service="Project",operation="getProject"} 1', prometheus)
+
+    def test_query_workitems(self):
+        pol = Polarion(polarion_url, polarion_user, polarion_password)
+        workitems = list(pol.queryWorkitems(f'project.id:{polarion_project_id}', 'id'))
+        self.assertGreater(len(workitems), 0)
+        self.assertEqual(workitems[0].id, pol.getProject(polarion_project_id).getWorkitem(workitems[0].id).id)
+
+        # the details can be loaded in parallel, the order stays the same
+        parallel = pol.queryWorkitems(f'project.id:{polarion_project_id}', 'id', max_workers=4)
+        self.assertEqual([workitem.id for workitem in parallel], [workitem.id for workitem in workitems])
+
+        with pol.metrics.scope() as scope:
+            list(pol.queryWorkitems(f'project.id:{polarion_project_id}', 'id'))
+        # the project is only fetched once per client
+        self.assertNotIn('Project.getProject', scope.snapshot())
+        self.assertNotIn('Tracker.getWorkItemByUri', scope.snapshot())
+
     def test_type_wrong_service(self):
         pol = Polarion(polarion_url, polarion_user, polarion_password)
 
@@ -0,0 +1,58 @@
+import unittest
+
+from benchmarks.stand_in import StandInPolarion, StandInServer
+from polarion.polarion import Polarion
+
+
+def _items(value):
+    # the values of zeep objects, including their order
+    if hasattr(value, '__values__'):
+        return [(key, _items(item)) for key, item in value.__values__.items()]
+    if isinstance(value, list):
+        return [_items(item) for item in value]
+    return value
+
+
+class TestPolarionDecoder(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        data = StandInPolarion()
+        workitems = [data.addWorkitem() for _ in range(20)]
+        data.addTestRun('run-1', workitems)
+        cls.server = StandInServer(data)
+        cls.pol = Polarion(cls.server.url, 'user', 'password', fast_decode=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pol.close()
+        cls.server.close()
+
+    def _compare(self, service, operation, *args):
+        # the zeep client itself does not use the fast decoder
+        expected = getattr(self.pol._getClient(service).service, operation)(*args)
+        result = getattr(self.pol.getService(service), operation)(*args)
+        self.assertEqual(result, expected)
+        self.assertEqual(_items(result), _items(expected))
+        return result
+
+    def test_workitem(self):
+        workitem = self._compare('Tracker', 'getWorkItemById', 'BENCH', 'BENCH-3')
+        self.assertEqual(workitem.id, 'BENCH-3')
+        self._compare('Tracker', 'getWorkItemByUri', workitem.uri)
+
+    def test_query(self):
+        workitems = self._compare('Tracker', 'queryWorkItemsLimited', 'project.id:BENCH', 'id', ['id', 'title'], 5)
+        self.assertEqual(len(workitems), 5)
+        self._compare('Tracker', 'queryWorkItems', 'project.id:BENCH', 'id', [])
+
+    def test_test_run(self):
+        uri = self.pol.getProject('BENCH').getTestRun('run-1').uri
+        test_run = self._compare('TestManagement', 'getTestRunByUri', uri)
+        self.assertEqual(len(test_run.records.TestRecord), 20)
+
+    def test_save(self):
+        workitem = self.pol.getProject('BENCH').getWorkitem('BENCH-5')
+        workitem.title = 'Changed by the fast decoder test'
+        workitem.save()
+        self.assertEqual(self.pol.getProject('BENCH').getWorkitem('BENCH-5').title, 'Changed by the fast decoder test')
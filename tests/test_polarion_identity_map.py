@@ -0,0 +1,138 @@
+import unittest
+from types import SimpleNamespace
+
+from benchmarks.stand_in import StandInPolarion, StandInServer
+from polarion.identity_map import IdentityMap
+from polarion.polarion import Polarion
+
+
+class TestPolarionIdentityMap(unittest.TestCase):
+
+    def test_get_or_create(self):
+        identity_map = IdentityMap()
+        first = identity_map.getOrCreate('uri-1', object)
+        self.assertIs(first, identity_map.getOrCreate('uri-1', object))
+        self.assertIsNot(first, identity_map.getOrCreate('uri-1', object, revision='1234'))
+        self.assertEqual({'hits': 1, 'misses': 2, 'evictions': 0, 'invalidations': 0, 'items': 2, 'bytes': 0},
+                         identity_map.statistics())
+
+    def test_evict_least_recently_used(self):
+        identity_map = IdentityMap(max_items=2)
+        first = identity_map.getOrCreate('uri-1', object)
+        identity_map.getOrCreate('uri-2', object)
+        identity_map.getOrCreate('uri-1', object)
+        identity_map.getOrCreate('uri-3', object)
+        self.assertIs(first, identity_map.get('uri-1'))
+        self.assertIsNone(identity_map.get('uri-2'))
+        self.assertEqual(1, identity_map.statistics()['evictions'])
+
+    def test_evict_by_size(self):
+        identity_map = IdentityMap(max_items=None, max_bytes=2000)
+        for number in range(10):
+            identity_map.put(f'uri-{number}', SimpleNamespace(title='x' * 500))
+        stats = identity_map.statistics()
+        self.assertLessEqual(stats['bytes'], 2000)
+        self.assertEqual(10, stats['items'] + stats['evictions'])
+        self.assertIsNotNone(identity_map.get('uri-9'))
+
+    def test_invalidate(self):
+        identity_map = IdentityMap()
+        current = identity_map.getOrCreate('uri-1', object)
+        old = identity_map.getOrCreate('uri-1', object, revision='1234')
+        identity_map.invalidate('uri-1', keep=current)
+        self.assertIs(current, identity_map.get('uri-1'))
+
+        identity_map.invalidate('uri-1')
+        self.assertIsNone(identity_map.get('uri-1'))
+        self.assertIs(old, identity_map.get('uri-1', revision='1234'))
+        self.assertEqual(1, identity_map.statistics()['invalidations'])
+
+
+class TestPolarionIdentityMapClient(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.data = StandInPolarion()
+        workitems = [cls.data.addWorkitem() for _ in range(5)]
+        cls.data.addDocument('Specification/Requirements', workitems)
+        cls.server = StandInServer(cls.data)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.close()
+
+    def test_document_workitems(self):
+        pol = Polarion(self.server.url, 'user', 'password', identity_map=True)
+        try:
+            document = pol.getProject('BENCH').getDocument('Specification/Requirements')
+            workitems = document.getWorkitems()
+            with pol.metrics.scope() as scope:
+                again = document.getWorkitems()
+            self.assertEqual(1, scope.totals()['calls'], msg='Only the uris of the document are fetched')
+            self.assertIs(workitems[2], again[2])
+        finally:
+            pol.close()
+
+    def test_invalidated_by_write(self):
+        pol = Polarion(self.server.url, 'user', 'password', identity_map=IdentityMap(max_items=100))
+        try:
+            project = pol.getProject('BENCH')
+            document = project.getDocument('Specification/Requirements')
+            cached = document.getWorkitems()[0]
+            workitem = project.getWorkitem(cached.id)
+            workitem.title = 'Changed by another object'
+            workitem.save()
+            self.assertIsNot(cached, document.getWorkitems()[0])
+            self.assertEqual('Changed by another object', document.getWorkitems()[0].title)
+        finally:
+            pol.close()
+
+    def test_invalidated_by_delete(self):
+        self.data.addDocument('Specification/Delete', [self.data.addWorkitem()])
+        pol = Polarion(self.server.url, 'user', 'password', identity_map=True)
+        try:
+            project = pol.getProject('BENCH')
+            cached = project.getDocument('Specification/Delete').getWorkitems()[0]
+            project.getWorkitem(cached.id).delete()
+            self.assertIsNone(pol.identity_map.get(cached.uri))
+        finally:
+            pol.close()
+
+    def test_invalidated_by_move(self):
+        self.data.addDocument('Specification/Source', [self.data.addWorkitem()])
+        self.data.addDocument('Specification/Target', [])
+        pol = Polarion(self.server.url, 'user', 'password', identity_map=True)
+        try:
+            project = pol.getProject('BENCH')
+            source = project.getDocument('Specification/Source')
+            target = project.getDocument('Specification/Target')
+            cached = source.getWorkitems()[0]
+            project.getWorkitem(cached.id).moveToDocument(target, None)
+            self.assertEqual([], source.getWorkitems())
+            moved = target.getWorkitems()
+            self.assertEqual([cached.id], [workitem.id for workitem in moved])
+            self.assertIsNot(cached, moved[0])
+        finally:
+            pol.close()
+
+    def test_invalidated_by_remove_from_document(self):
+        self.data.addDocument('Specification/Remove', [self.data.addWorkitem()])
+        pol = Polarion(self.server.url, 'user', 'password', identity_map=True)
+        try:
+            project = pol.getProject('BENCH')
+            document = project.getDocument('Specification/Remove')
+            cached = document.getWorkitems()[0]
+            project.getWorkitem(cached.id).removeFromDocument()
+            self.assertEqual([], document.getWorkitems())
+            self.assertIsNone(pol.identity_map.get(cached.uri))
+        finally:
+            pol.close()
+
+    def test_disabled(self):
+        pol = Polarion(self.server.url, 'user', 'password')
+        try:
+            self.assertIsNone(pol.identity_map)
+            document = pol.getProject('BENCH').getDocument('Specification/Requirements')
+            self.assertIsNot(document.getWorkitems()[0], document.getWorkitems()[0])
+        finally:
+            pol.close()
@@ -0,0 +1,72 @@
+import unittest
+
+from benchmarks.stand_in import StandInPolarion, StandInServer
+from polarion.polarion import Polarion
+
+
+class TestPolarionMetadata(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        data = StandInPolarion()
+        for _ in range(3):
+            data.addWorkitem()
+        cls.server = StandInServer(data)
+        cls.pol = Polarion(cls.server.url, 'user', 'password')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pol.close()
+        cls.server.close()
+
+    def setUp(self):
+        self.project = self.pol.getProject('BENCH')
+        self.project.metadata.invalidate()
+
+    def _calls(self, function):
+        with self.pol.metrics.scope() as scope:
+            function()
+        return scope.totals()['calls']
+
+    def test_shared_by_projects(self):
+        self.assertIs(self.project.metadata, self.pol.getProject('BENCH').metadata)
+
+    def test_enum_cached(self):
+        self.assertEqual(1, self._calls(lambda: self.project.getEnum('testcase-status')))
+        self.assertEqual(0, self._calls(lambda: self.project.getEnum('testcase-status')))
+        self.assertEqual(['open', 'done'], self.project.getEnum('testcase-status'))
+
+    def test_workitem_metadata_cached(self):
+        workitems = [self.project.getWorkitem(f'BENCH-{number}') for number in range(1, 4)]
+        self.assertEqual(2, self._calls(lambda: (workitems[0].getAllowedCustomKeys(),
+                                                 workitems[0].getAvailableStatus())))
+        self.assertEqual(0, self._calls(lambda: [(workitem.getAllowedCustomKeys(), workitem.getAvailableStatus())
+                                                 for workitem in workitems]))
+
+    def test_ttl(self):
+        metadata = self.project.metadata
+        metadata.getEnum('type')
+        metadata.ttl = 0
+        try:
+            self.assertEqual(1, self._calls(lambda: metadata.getEnum('type')))
+        finally:
+            metadata.ttl = self.pol.metadata_ttl
+
+    def test_invalidate_type(self):
+        metadata = self.project.metadata
+        metadata.getEnum('testcase-status')
+        metadata.getEnum('task-status')
+        metadata.getInitialWorkflowAction('testcase')
+        metadata.invalidate('testcase')
+        self.assertEqual(2, self._calls(lambda: (metadata.getEnum('testcase-status'),
+                                                 metadata.getInitialWorkflowAction('testcase'))))
+        self.assertEqual(0, self._calls(lambda: metadata.getEnum('task-status')))
+
+    def test_warm_up(self):
+        metadata = self.project.metadata
+        # the stand-in has the options open and done in every enumeration, so also in the types enumeration
+        # the types enumeration, the test step configuration and 4 calls per type
+        self.assertEqual(10, self._calls(lambda: metadata.warmUp()))
+        self.assertEqual(0, self._calls(lambda: (metadata.getInitialWorkflowAction('open'),
+                                                 metadata.getEnum('done-severity'),
+                                                 metadata.getTestStepsConfiguration())))
@@ -0,0 +1,69 @@
+import threading
+import unittest
+from unittest import mock
+
+from benchmarks.stand_in import StandInPolarion, StandInServer
+from polarion.polarion import Polarion
+
+
+class TestPolarionMetrics(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.data = StandInPolarion()
+        for _ in range(3):
+            cls.data.addWorkitem()
+        cls.server = StandInServer(cls.data)
+        cls.pol = Polarion(cls.server.url, 'user', 'password')
+        cls.project = cls.pol.getProject('BENCH')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pol.close()
+        cls.server.close()
+
+    def test_scope(self):
+        with self.pol.metrics.scope() as outer:
+            self.project.getWorkitem('BENCH-1')
+            with self.pol.metrics.scope() as inner:
+                self.project.getWorkitem('BENCH-2')
+        self.project.getWorkitem('BENCH-3')
+        self.assertEqual(2, outer.snapshot()['Tracker.getWorkItemById']['count'])
+        self.assertEqual(1, inner.snapshot()['Tracker.getWorkItemById']['count'])
+        self.assertEqual(1, inner.totals()['calls'])
+        self.assertGreater(inner.totals()['request_bytes'], 0)
+        self.assertGreater(inner.totals()['response_bytes'], 0)
+
+    def test_scope_other_thread(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def other():
+            started.wait(10)
+            self.project.getWorkitem('BENCH-2')
+            release.set()
+
+        thread = threading.Thread(target=other)
+        thread.start()
+        with self.pol.metrics.scope() as scope:
+            started.set()
+            self.assertTrue(release.wait(10))
+            self.project.getWorkitem('BENCH-1')
+        thread.join()
+        self.assertEqual(1, scope.totals()['calls'], msg='Calls of other threads are not counted')
+
+    def test_no_serializing(self):
+        with mock.patch('polarion.metrics.etree') as etree:
+            with self.pol.metrics.scope() as scope:
+                self.project.getWorkitem('BENCH-1')
+        self.assertEqual(1, scope.totals()['calls'])
+        self.assertFalse(etree.tostring.called, msg='The sizes are taken from the transport')
+
+    def test_upload_bytes(self):
+        workitem = self.project.getWorkitem('BENCH-1')
+        data = b'x' * 300000
+        with self.pol.metrics.scope() as scope:
+            workitem.addAttachment(data, 'Data', file_name='data.bin')
+        self.assertEqual(data, self.data.attachments[(workitem.uri, 'data.bin')])
+        # base64 makes the data a third larger
+        self.assertGreater(scope.snapshot()['Tracker.createAttachment']['request_bytes'], 400000)
@@ -0,0 +1,36 @@
+import unittest
+from polarion.pool import PolarionPool
+from keys import polarion_user, polarion_password, polarion_url, polarion_project_id
+
+
+class TestPolarionPool(unittest.TestCase):
+
+    def test_map(self):
+        with PolarionPool(polarion_url, polarion_user, polarion_password, max_sessions=3) as pool:
+            project_ids = pool.map(lambda client, project_id: client.getProject(project_id).id,
+                                   [polarion_project_id] * 6)
+            self.assertEqual(project_ids, [polarion_project_id] * 6)
+            self.assertLessEqual(pool._size, 3)
+
+    def test_acquire_release(self):
+        with PolarionPool(polarion_url, polarion_user, polarion_password, max_sessions=1, min_sessions=0) as pool:
+            client = pool.acquire()
+            with self.assertRaises(Exception):
+                pool.acquire(timeout=0.1)
+            pool.release(client)
+
+            with pool.session() as same_client:
+                self.assertIs(same_client, client)
+
+    def test_recycle(self):
+        with PolarionPool(polarion_url, polarion_user, polarion_password, max_sessions=1, max_age=0) as pool:
+            with pool.session() as client:
+                pass
+            with pool.session() as new_client:
+                self.assertIsNot(new_client, client)
+                new_client.getProject(polarion_project_id)
+
+    def test_shared_request_session(self):
+        import requests
+        with self.assertRaises(Exception):
+            PolarionPool(polarion_url, polarion_user, polarion_password, request_session=requests.Session())
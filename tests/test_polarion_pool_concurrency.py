@@ -0,0 +1,36 @@
+import threading
+import time
+import unittest
+
+from benchmarks.stand_in import StandInServer
+from polarion.pool import PolarionPool
+
+
+class TestPolarionPoolConcurrency(unittest.TestCase):
+
+    def test_max_sessions(self):
+        with StandInServer(latency=0.01) as server:
+            with PolarionPool(server.url, 'user', 'password', max_sessions=2, min_sessions=0) as pool:
+                start = threading.Barrier(6)
+
+                def work():
+                    start.wait()
+                    with pool.session():
+                        time.sleep(0.05)
+
+                threads = [threading.Thread(target=work) for _ in range(6)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+                self.assertEqual(2, server.counts()['operations']['Session.logIn'])
+                self.assertEqual(2, pool._size)
+
+    def test_failed_login_frees_place(self):
+        with StandInServer() as server:
+            with PolarionPool(server.url, 'user', 'password', max_sessions=1, min_sessions=0) as pool:
+                pool._args = ('http://127.0.0.1:1/polarion', 'user', 'password')
+                with self.assertRaises(Exception):
+                    pool.acquire(timeout=1)
+                self.assertEqual(0, pool._size)
@@ -56,6 +56,34 @@ class TestPolarionProject(unittest.TestCase):
         self.assertEqual(len(search_result), 1)
         self.assertEqual(new_workitem, search_result[0])
 
+    def test_iter_workitems(self):
+        new_workitem = self.project.createWorkitem('task')
+        expected = [workitem.id for workitem in self.project.searchWorkitem('type:task', 'id')]
+
+        workitems = list(self.project.iterWorkitems('type:task', fields=['status'], page_size=2))
+        self.assertEqual(expected, [workitem.id for workitem in workitems])
+        self.assertIn(new_workitem.id, [workitem.id for workitem in workitems])
+
+        workitems = list(self.project.iterWorkitems(new_workitem.id, prefetch=False))
+        self.assertEqual(1, len(workitems))
+        self.assertEqual(new_workitem, workitems[0])
+
+    def test_search_full_item_parallel(self):
+        self.project.createWorkitem('task')
+        expected = self.project.searchWorkitemFullItem('type:task', 'id')
+
+        workitems = self.project.searchWorkitemFullItem('type:task', 'id', max_workers=4)
+        self.assertEqual([workitem.id for workitem in expected], [workitem.id for workitem in workitems])
+
+    def test_get_workitems(self):
+        new_workitem = self.project.createWorkitem('task')
+        other_workitem = self.project.createWorkitem('task')
+
+        workitems = self.project.getWorkitems([new_workitem.id, other_workitem.id, 'FAKE-001'], chunk_size=1)
+        self.assertEqual(new_workitem, workitems[new_workitem.id])
+        self.assertEqual(other_workitem, workitems[other_workitem.id])
+        self.assertIsNone(workitems['FAKE-001'])
+
     def test_string(self):
         self.assertIn(polarion_project_id, self.project.__str__())
         self.assertIn(polarion_project_id, self.project.__repr__())
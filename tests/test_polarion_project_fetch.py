@@ -0,0 +1,70 @@
+import unittest
+
+from benchmarks.stand_in import StandInPolarion, StandInServer
+from polarion.polarion import Polarion
+from polarion.project import Project, WorkitemFetchError
+
+
+class TestPolarionProjectFetch(unittest.TestCase):
+
+    def test_all_fetched(self):
+        self.assertEqual(['A-1', 'A-2'], Project._fetchWorkitems(['a-1', 'a-2'], str.upper, 2))
+
+    def test_partial_results(self):
+        def fetch(key):
+            if key in ('a-2', 'a-4'):
+                raise ValueError(f'{key} is gone')
+            return key.upper()
+
+        with self.assertRaises(WorkitemFetchError) as context:
+            Project._fetchWorkitems(['a-1', 'a-2', 'a-3', 'a-4'], fetch, 2)
+        self.assertEqual(['A-1', 'A-3'], context.exception.workitems)
+        self.assertEqual(['a-2', 'a-4'], list(context.exception.errors))
+        self.assertIsInstance(context.exception.errors['a-4'], ValueError)
+        self.assertIs(context.exception.errors['a-2'], context.exception.__cause__)
+        self.assertIn('2 of 4', str(context.exception))
+
+
+class TestPolarionProjectIterWorkitems(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        data = StandInPolarion()
+        cls.tasks = [data.addWorkitem('task')['id'] for _ in range(12)]
+        data.addWorkitem('requirement')
+        cls.server = StandInServer(data)
+        cls.pol = Polarion(cls.server.url, 'user', 'password')
+        cls.project = cls.pol.getProject('BENCH')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pol.close()
+        cls.server.close()
+
+    def test_pages(self):
+        for prefetch in (True, False):
+            with self.subTest(prefetch=prefetch):
+                with self.pol.metrics.scope() as scope:
+                    workitems = list(self.project.iterWorkitems('type:task', fields=['status'], page_size=5,
+                                                                prefetch=prefetch))
+                self.assertEqual(sorted(self.tasks), [workitem.id for workitem in workitems])
+                self.assertEqual(5, scope.totals()['calls'],
+                                 msg='One query per page and one check per full page, no query for all ids')
+
+    def test_stop_early(self):
+        workitems = self.project.iterWorkitems(page_size=5)
+        self.assertEqual(sorted(self.tasks)[0], next(workitems).id)
+        workitems.close()
+
+    def test_sort_differs_from_range(self):
+        data = StandInPolarion()
+        for _ in range(12):
+            data.addWorkitem('task')
+        data.natural_id_sort = True
+        with StandInServer(data) as server:
+            pol = Polarion(server.url, 'user', 'password')
+            try:
+                with self.assertRaises(Exception):
+                    list(pol.getProject('BENCH').iterWorkitems('type:task', page_size=5, prefetch=False))
+            finally:
+                pol.close()
@@ -0,0 +1,60 @@
+import unittest
+from types import SimpleNamespace
+
+from zeep.exceptions import Fault, TransportError
+
+from polarion.session import ServiceProxy, isSessionExpired
+
+
+class _Polarion(object):
+    # the parts of the client used by the service proxy, the operation raises the given errors in turn
+
+    def __init__(self, *errors):
+        self._errors = list(errors)
+        self._session_generation = 0
+        self._last_successful_call = None
+        self.services = {'Tracker': {}}
+        self.calls = 0
+        self.renewals = 0
+
+    def _getClient(self, name):
+        return SimpleNamespace(service=SimpleNamespace(getWorkItemById=self._getWorkItemById))
+
+    def _getWorkItemById(self, project_id, workitem_id):
+        self.calls += 1
+        if len(self._errors) > 0:
+            raise self._errors.pop(0)
+        return workitem_id
+
+    def _renewSession(self, generation):
+        self.renewals += 1
+
+
+class TestPolarionSession(unittest.TestCase):
+
+    def test_session_expired(self):
+        for message in ('com.polarion.platform.security.AuthenticationFailedException: Authentication failed',
+                        'The session has expired', 'Invalid session id', 'There is no subject'):
+            with self.subTest(message=message):
+                self.assertTrue(isSessionExpired(Fault(message)))
+        self.assertTrue(isSessionExpired(TransportError(status_code=401)))
+
+    def test_permission_denied(self):
+        for message in ('com.polarion.platform.security.PermissionDeniedException: Not authorized to read PYTH-1',
+                        'Not authorized', 'Access denied for the session user'):
+            with self.subTest(message=message):
+                self.assertFalse(isSessionExpired(Fault(message)))
+        self.assertFalse(isSessionExpired(TransportError(status_code=403)))
+
+    def test_retry_after_expired_session(self):
+        polarion = _Polarion(Fault('The session has expired'))
+        self.assertEqual('PYTH-1', ServiceProxy(polarion, 'Tracker').getWorkItemById('PYTH', 'PYTH-1'))
+        self.assertEqual(2, polarion.calls)
+        self.assertEqual(1, polarion.renewals)
+
+    def test_permission_fault_not_retried(self):
+        polarion = _Polarion(Fault('com.polarion.platform.security.PermissionDeniedException: Not authorized'))
+        with self.assertRaises(Fault):
+            ServiceProxy(polarion, 'Tracker').getWorkItemById('PYTH', 'PYTH-1')
+        self.assertEqual(1, polarion.calls)
+        self.assertEqual(0, polarion.renewals)
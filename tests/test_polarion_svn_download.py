@@ -0,0 +1,114 @@
+import hashlib
+import io
+import os
+import tempfile
+import unittest
+
+import requests
+
+from benchmarks.stand_in import StandInPolarion, StandInServer
+from polarion.polarion import Polarion
+
+
+class TestPolarionSvnDownload(unittest.TestCase):
+
+    def setUp(self):
+        self.data = StandInPolarion()
+        self.content = bytes(range(256)) * 40
+        self.data.svn_files['/repo/BENCH/file.bin'] = self.content
+        self.server = StandInServer(self.data)
+        self.url = self.server.url.replace('/polarion', '/repo/BENCH/file.bin')
+        self.pol = Polarion(self.server.url, 'user', 'password')
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'file.bin')
+
+    def tearDown(self):
+        self.pol.close()
+        self.server.close()
+        self.directory.cleanup()
+
+    def _interrupted(self, content, size):
+        # the state an interrupted download leaves behind
+        etag = requests.get(self.url).headers['ETag']
+        with open(f'{self.path}.part', 'wb') as part:
+            part.write(content[:size])
+        with open(f'{self.path}.part.validator', 'w', encoding='utf-8') as validator:
+            validator.write(etag)
+        self.server.reset()
+
+    def _downloaded(self):
+        with open(self.path, 'rb') as file:
+            return file.read()
+
+    def test_download(self):
+        digest = self.pol.downloadFromSvnToFile(self.url, self.path, chunk_size=1000)
+        self.assertEqual(hashlib.sha256(self.content).hexdigest(), digest)
+        self.assertEqual(self.content, self._downloaded())
+        self.assertEqual(['file.bin'], os.listdir(self.directory.name), msg='No .part or validator file is left')
+
+        buffer = io.BytesIO()
+        self.pol.downloadFromSvnToFile(self.url, buffer)
+        self.assertEqual(self.content, buffer.getvalue())
+
+    def test_resume(self):
+        self._interrupted(self.content, 3000)
+        self.pol.downloadFromSvnToFile(self.url, self.path, checksum=hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(self.content, self._downloaded())
+        self.assertEqual(['bytes=3000-'], [request[2] for request in self.server.svn_requests])
+
+    def test_resume_changed_file(self):
+        self._interrupted(self.content, 3000)
+        changed = bytes(reversed(self.content))
+        self.data.svn_files['/repo/BENCH/file.bin'] = changed
+        self.pol.downloadFromSvnToFile(self.url, self.path)
+        self.assertEqual(changed, self._downloaded(), msg='Started over instead of appending to the old part')
+
+    def test_resume_smaller_file(self):
+        self._interrupted(self.content, 3000)
+        self.data.svn_files['/repo/BENCH/file.bin'] = self.content[:2000]
+        self.pol.downloadFromSvnToFile(self.url, self.path)
+        self.assertEqual(self.content[:2000], self._downloaded())
+
+    def test_resume_without_validator(self):
+        self._interrupted(self.content, 3000)
+        os.remove(f'{self.path}.part.validator')
+        self.pol.downloadFromSvnToFile(self.url, self.path)
+        self.assertEqual(self.content, self._downloaded())
+        self.assertEqual([None], [request[2] for request in self.server.svn_requests])
+
+    def test_resume_not_supported(self):
+        self.data.svn_ranges = False
+        self._interrupted(self.content, 3000)
+        self.pol.downloadFromSvnToFile(self.url, self.path)
+        self.assertEqual(self.content, self._downloaded())
+        self.assertEqual(1, len(self.server.svn_requests), msg='The whole file sent instead of the rest is used')
+
+    def test_no_resume(self):
+        self._interrupted(self.content, 3000)
+        self.pol.downloadFromSvnToFile(self.url, self.path, resume=False)
+        self.assertEqual(self.content, self._downloaded())
+        self.assertEqual([None], [request[2] for request in self.server.svn_requests])
+
+    def test_checksum_failure(self):
+        with self.assertRaises(Exception):
+            self.pol.downloadFromSvnToFile(self.url, self.path, checksum='0' * 64)
+        self.assertEqual([], os.listdir(self.directory.name), msg='Corrupt data is not resumed')
+
+    def test_size_failure(self):
+        with self.assertRaises(Exception):
+            self.pol.downloadFromSvnToFile(self.url, self.path, expected_size=len(self.content) + 1)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_auth_strategy(self):
+        self.data.svn_credentials = ('polarion', 'aurora')
+        self.assertEqual(self.content, self.pol.downloadFromSvn(self.url))
+        self.assertEqual(['user', 'polarion'], [request[1] for request in self.server.svn_requests])
+
+        self.server.reset()
+        self.pol.downloadFromSvnToFile(self.url, self.path)
+        self.assertEqual(['polarion'], [request[1] for request in self.server.svn_requests],
+                         msg='The accepted credentials are tried first')
+
+    def test_not_found(self):
+        with self.assertRaises(Exception):
+            self.pol.downloadFromSvn(self.url.replace('file.bin', 'other.bin'))
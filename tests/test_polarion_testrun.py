@@ -1,4 +1,5 @@
 import unittest
+import hashlib
 from datetime import datetime
 from filecmp import cmp
 from shutil import copyfile
@@ -80,6 +81,12 @@ class TestPolarionTestrun(unittest.TestCase):
         self.assertTrue(cmp(src_2, download), 'File downloaded from polarion not the same')
         self.assertFalse(cmp(src_1, download), 'File downloaded from polarion is the same as the old file')
 
+        with open(src_2, 'rb') as file:
+            digest = hashlib.sha256(file.read()).hexdigest()
+        self.assertEqual(self.executing_test_run.saveAttachmentAsFile(attachment_file, download, checksum=digest), digest)
+        self.assertRaises(Exception, self.executing_test_run.saveAttachmentAsFile, attachment_file, download,
+                          checksum='0' * 64)
+
         self.executing_test_run.deleteAttachment(attachment_file)
 
         self.assertFalse(self.executing_test_run.hasAttachment(), msg='Workitem has attachments, but should not')
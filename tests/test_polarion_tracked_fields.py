@@ -0,0 +1,307 @@
+import unittest
+from types import SimpleNamespace
+
+from zeep.helpers import serialize_object
+
+from benchmarks.stand_in import StandInPolarion, StandInServer
+from polarion.base.tracked_fields import TrackedFields, WritePolicy
+from polarion.polarion import Polarion
+from polarion.user import User
+
+
+class _Tracked(TrackedFields):
+
+    def __init__(self, data, write_policy=WritePolicy.RELOAD):
+        self._polarion = SimpleNamespace(write_policy=write_policy, identity_map=None)
+        self._server_data = data
+        self.reloads = 0
+        self.other = None
+        self._setTrackedFields(dict(data), skip=['records'])
+
+    def _reloadFromPolarion(self):
+        self.reloads += 1
+        self._setTrackedFields(dict(self._server_data), skip=['records'])
+
+    def save(self):
+        # like the objects do, send the changes and update the object
+        self._server_data.update(self._getChangedFields())
+        self._afterWrite(fields_only=True)
+
+    def addRecord(self, record):
+        # a write that is not a saved field, like adding an attachment
+        self._server_data['records'] = self._server_data['records'] + [record]
+        self._server_data['priority'] += 1.0
+        self._afterWrite()
+
+    def raisePriority(self):
+        # a simple write that can be made locally, like adding a link
+        self._server_data['priority'] += 1.0
+
+        def raiseLocally():
+            self._setPolarionField('priority', self._tracked_data['priority'] + 1.0)
+            return True
+        self._afterWrite(apply_locally=raiseLocally)
+
+
+class TestPolarionTrackedFields(unittest.TestCase):
+
+    def setUp(self):
+        self.data = {'title': 'A title', 'status': {'id': 'open'}, 'records': [1, 2, 3], 'priority': 1.0}
+        self.tracked = _Tracked(self.data)
+
+    def test_unchanged(self):
+        self.assertEqual('A title', self.tracked.title)
+        self.assertEqual({'id': 'open'}, self.tracked.status)
+        self.assertEqual({}, self.tracked._getChangedFields())
+        self.assertFalse(hasattr(self.tracked, 'records'))
+
+    def test_assigned(self):
+        self.tracked.title = 'A title'
+        self.assertEqual({}, self.tracked._getChangedFields(), msg='The same value is not a change')
+
+        self.tracked.title = 'Another title'
+        self.tracked.other = 'not a field'
+        self.assertEqual({'title': 'Another title'}, self.tracked._getChangedFields())
+
+    def test_changed_in_place(self):
+        self.assertNotIn('status', vars(self.tracked), msg='Only copied when read')
+        self.tracked.status['id'] = 'done'
+        self.assertEqual({'status': {'id': 'done'}}, self.tracked._getChangedFields())
+
+    def test_field_values(self):
+        values = self.tracked._getFieldValues()
+        self.assertEqual({'title', 'status', 'priority'}, set(values))
+        self.assertIs(self.data['status'], values['status'])
+        self.assertNotIn('status', vars(self.tracked), msg='Not copied for reading all values')
+
+    def test_set_field(self):
+        self.tracked.title = 'Another title'
+        self.tracked._setTrackedField('title', 'Reloaded')
+        self.assertEqual('Reloaded', self.tracked.title)
+        self.assertEqual({}, self.tracked._getChangedFields())
+
+    def test_write_policy_reload(self):
+        self.tracked.title = 'Another title'
+        self.tracked.save()
+        self.assertEqual(1, self.tracked.reloads)
+        self.assertFalse(self.tracked.isStale())
+        self.assertEqual('Another title', self.tracked.title)
+
+    def test_write_policy_none(self):
+        tracked = _Tracked(self.data, WritePolicy.NONE)
+        tracked.title = 'Another title'
+        tracked.status['id'] = 'done'
+        tracked.save()
+        self.assertEqual(0, tracked.reloads)
+        self.assertTrue(tracked.isStale())
+        self.assertEqual('Another title', tracked.title)
+        self.assertEqual({}, tracked._getChangedFields(), msg='Saved changes are not sent again')
+
+        tracked.status['id'] = 'closed'
+        self.assertEqual({'status': {'id': 'closed'}}, tracked._getChangedFields())
+
+        tracked.reload()
+        self.assertFalse(tracked.isStale())
+
+    def test_write_policy_none_other_write(self):
+        tracked = _Tracked(self.data, WritePolicy.NONE)
+        tracked.title = 'Another title'
+        tracked.addRecord(4)
+        self.assertEqual(0, tracked.reloads)
+        self.assertTrue(tracked.isStale())
+
+        self.assertEqual(2.0, tracked.priority)
+        self.assertEqual(1, tracked.reloads, msg='Reloaded when a field is used')
+        self.assertEqual('A title', tracked.title, msg='Unsaved changes are dropped like with lazy')
+
+    def test_write_policy_none_local_write(self):
+        tracked = _Tracked(self.data, WritePolicy.NONE)
+        tracked.title = 'Another title'
+        tracked.raisePriority()
+        self.assertEqual(0, tracked.reloads)
+        self.assertTrue(tracked.isStale())
+        self.assertEqual(2.0, tracked.priority)
+        self.assertEqual({'title': 'Another title'}, tracked._getChangedFields(), msg='Unsaved changes are kept')
+
+    def test_write_policy_none_local_write_after_other_write(self):
+        tracked = _Tracked(self.data, WritePolicy.NONE)
+        tracked.addRecord(4)
+        tracked.raisePriority()
+        self.assertEqual(0, tracked.reloads)
+        self.assertEqual(3.0, tracked.priority, msg='Not raised on top of the out of date value')
+        self.assertEqual(1, tracked.reloads)
+
+    def test_write_policy_lazy_local_write(self):
+        tracked = _Tracked(self.data, WritePolicy.LAZY)
+        tracked.raisePriority()
+        self.assertEqual(0, tracked.reloads)
+        self.assertEqual(2.0, tracked.priority)
+        self.assertEqual(1, tracked.reloads, msg='Reloaded when a field is used')
+
+    def test_write_policy_lazy(self):
+        tracked = _Tracked(self.data, WritePolicy('lazy'))
+        tracked.title = 'Another title'
+        tracked.save()
+        self.assertEqual(0, tracked.reloads)
+        self.assertTrue(tracked.isStale())
+
+        self.assertEqual('Another title', tracked.title)
+        self.assertEqual(1, tracked.reloads, msg='Reloaded when a field is used')
+        self.assertEqual(1.0, tracked.priority)
+        self.assertEqual(1, tracked.reloads)
+        self.assertFalse(tracked.isStale())
+
+    def test_write_policy_lazy_assign(self):
+        tracked = _Tracked(self.data, WritePolicy.LAZY)
+        tracked.title = 'Another title'
+        tracked.save()
+        tracked.priority = 2.0
+        self.assertEqual(1, tracked.reloads, msg='Reloaded before the assignment')
+        self.assertEqual({'priority': 2.0}, tracked._getChangedFields())
+
+
+class TestPolarionWritePolicyTestRun(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.data = StandInPolarion()
+        cls.workitems = [cls.data.addWorkitem() for _ in range(3)]
+        cls.server = StandInServer(cls.data)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.close()
+
+    def test_add_testcase(self):
+        for policy in ('reload', 'none', 'lazy'):
+            with self.subTest(policy=policy):
+                self.data.addTestRun(f'RUN-{policy}', self.workitems[:2])
+                pol = Polarion(self.server.url, 'user', 'password', write_policy=policy)
+                try:
+                    project = pol.getProject('BENCH')
+                    run = project.getTestRun(f'RUN-{policy}')
+                    self.assertEqual(2, len(run.records))
+                    run.addTestcase(project.getWorkitem(self.workitems[2]['id']))
+                    self.assertEqual(3, len(run.records))
+                    self.assertEqual(self.workitems[2]['id'], run.records[-1].testcase_id)
+                finally:
+                    pol.close()
+
+    def test_add_testcase_none(self):
+        self.data.addTestRun('RUN-local', self.workitems[:2])
+        pol = Polarion(self.server.url, 'user', 'password', write_policy='none')
+        try:
+            project = pol.getProject('BENCH')
+            run = project.getTestRun('RUN-local')
+            workitem = project.getWorkitem(self.workitems[2]['id'])
+            with pol.metrics.scope() as scope:
+                run.addTestcase(workitem)
+                self.assertTrue(run.hasTestCase(self.workitems[2]['id']))
+            self.assertEqual(['TestManagement.addTestRecordToTestRun'], list(scope.snapshot()))
+            self.assertTrue(run.isStale())
+        finally:
+            pol.close()
+
+    def test_record_attachment(self):
+        for policy in ('none', 'lazy'):
+            with self.subTest(policy=policy):
+                self.data.addTestRun(f'RUN-attachment-{policy}', self.workitems[:1])
+                pol = Polarion(self.server.url, 'user', 'password', write_policy=policy)
+                try:
+                    record = pol.getProject('BENCH').getTestRun(f'RUN-attachment-{policy}').records[0]
+                    with pol.metrics.scope() as scope:
+                        record.addAttachment(b'data', 'Log', file_name='log.txt')
+                    self.assertNotIn('TestManagement.getTestCaseRecords', scope.snapshot(),
+                                     msg='Not reloaded right away')
+                    self.assertTrue(record.isStale())
+                    with pol.metrics.scope() as scope:
+                        self.assertEqual('passed', record.result.id)
+                        self.assertEqual('passed', record.result.id)
+                    self.assertEqual(1, scope.snapshot()['TestManagement.getTestCaseRecords']['count'],
+                                     msg='Reloaded when a field is used')
+                    self.assertFalse(record.isStale())
+                finally:
+                    pol.close()
+
+
+class TestPolarionWritePolicyWorkitem(unittest.TestCase):
+
+    def setUp(self):
+        self.data = StandInPolarion()
+        self.workitem_ids = [self.data.addWorkitem()['id'] for _ in range(2)]
+        self.data.addUser('alice', 'Alice')
+        self.data.addUser('bob', 'Bob')
+        self.server = StandInServer(self.data)
+        self.pol = Polarion(self.server.url, 'user', 'password', write_policy='none')
+        self.project = self.pol.getProject('BENCH')
+        self.workitems = [self.project.getWorkitem(workitem_id) for workitem_id in self.workitem_ids]
+
+    def tearDown(self):
+        self.pol.close()
+        self.server.close()
+
+    def _user(self, user_id):
+        return User(self.pol, self.pol.getService('Project').getUser(user_id))
+
+    def assertNotReloaded(self, scope):
+        self.assertNotIn('Tracker.getWorkItemByUri', scope.snapshot())
+
+    def test_linked_item(self):
+        first, second = self.workitems
+        first.title = 'Not saved'
+        with self.pol.metrics.scope() as scope:
+            first.addLinkedItem(second, 'relates_to')
+            self.assertEqual([(second.uri, 'relates_to')],
+                             [(link.workItemURI, link.role.id) for link in first.linkedWorkItems.LinkedWorkItem])
+            self.assertEqual([first.uri], [link.workItemURI for link in second.linkedWorkItemsDerived.LinkedWorkItem])
+        self.assertNotReloaded(scope)
+        self.assertEqual([('relates_to', second)], first.getLinkedItemWithRoles())
+        self.assertTrue(first.isStale())
+        self.assertTrue(second.isStale())
+        self.assertEqual({'title': 'Not saved'}, first._getChangedFields(), msg='Unsaved changes are kept')
+        self.assertEqual(serialize_object(self.project.getWorkitem(first.id).linkedWorkItems),
+                         serialize_object(first.linkedWorkItems))
+
+        with self.pol.metrics.scope() as scope:
+            first.removeLinkedItem(second, 'relates_to')
+            self.assertEqual([], first.linkedWorkItems.LinkedWorkItem)
+            self.assertEqual([], second.linkedWorkItemsDerived.LinkedWorkItem)
+        self.assertNotReloaded(scope)
+
+    def test_remove_linked_items_both_ways(self):
+        first, second = self.workitems
+        first.addLinkedItem(second, 'relates_to')
+        second.addLinkedItem(first, 'parent')
+        first.removeLinkedItem(second)
+        for workitem in (first, second):
+            self.assertEqual([], workitem.linkedWorkItems.LinkedWorkItem)
+            self.assertEqual([], workitem.linkedWorkItemsDerived.LinkedWorkItem)
+
+    def test_assignee(self):
+        workitem = self.workitems[0]
+        with self.pol.metrics.scope() as scope:
+            workitem.addAssignee(self._user('alice'))
+            workitem.addAssignee(self._user('bob'))
+            self.assertEqual(['alice', 'bob'], [user.id for user in workitem.getAssignedUsers()])
+            workitem.removeAssignee(self._user('alice'))
+            self.assertEqual(['bob'], [user.id for user in workitem.getAssignedUsers()])
+            workitem.addAssignee(self._user('alice'), remove_others=True)
+            self.assertEqual(['alice'], [user.id for user in workitem.getAssignedUsers()])
+        self.assertNotReloaded(scope)
+        self.assertEqual(serialize_object(self.project.getWorkitem(workitem.id).assignee),
+                         serialize_object(workitem.assignee))
+
+    def test_hyperlink(self):
+        workitem = self.workitems[0]
+        with self.pol.metrics.scope() as scope:
+            workitem.addHyperlink('https://example.com', workitem.HyperlinkRoles.EXTERNAL_REF)
+            self.assertEqual('external reference', workitem.hyperlinks.Hyperlink[0].role.id)
+            self.assertEqual('https://example.com', workitem.hyperlinks.Hyperlink[0].uri)
+            workitem.removeHyperlink('https://example.com')
+            self.assertEqual([], workitem.hyperlinks.Hyperlink)
+        self.assertNotReloaded(scope)
+
+    def test_field_not_loaded(self):
+        workitem = self.project.getWorkitem(self.workitem_ids[0], fields=['status'])
+        workitem.addAssignee(self._user('alice'))
+        self.assertEqual(['alice'], [user.id for user in workitem.getAssignedUsers()])
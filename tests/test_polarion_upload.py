@@ -0,0 +1,151 @@
+import base64
+import io
+import os
+import tempfile
+import unittest
+
+import requests
+from lxml import etree
+from requests.adapters import BaseAdapter
+
+from benchmarks.stand_in import StandInPolarion, StandInServer
+from polarion.polarion import Polarion
+from polarion.upload import UploadTransport
+
+
+def _envelope(data):
+    envelope = etree.fromstring('<soap-env:Envelope xmlns:soap-env="http://schemas.xmlsoap.org/soap/envelope/">'
+                                '<soap-env:Body><ns0:createAttachment xmlns:ns0="http://ws.polarion.com/test">'
+                                '<ns0:data/></ns0:createAttachment></soap-env:Body></soap-env:Envelope>')
+    envelope.find('.//{http://ws.polarion.com/test}data').text = base64.b64encode(data).decode('ascii')
+    return envelope
+
+
+class _ReadingAdapter(BaseAdapter):
+    """
+    Reads the request body in small blocks like a connection does, keeping the received bodies
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.bodies = []
+        self.lengths = []
+
+    def send(self, request, **kwargs):
+        body = request.body
+        if hasattr(body, 'read'):
+            body = b''.join(iter(lambda: body.read(8192), b''))
+        self.bodies.append(body)
+        self.lengths.append(int(request.headers['Content-Length']))
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b''
+        response.request = request
+        return response
+
+
+class TestPolarionUpload(unittest.TestCase):
+
+    def setUp(self):
+        self.adapter = _ReadingAdapter()
+        session = requests.Session()
+        session.mount('http://', self.adapter)
+        self.transport = UploadTransport(session=session)
+        self.content = os.urandom(1000001)
+
+    def _uploadedData(self, body):
+        envelope = etree.fromstring(body, etree.XMLParser(huge_tree=True))
+        return base64.b64decode(envelope.find('.//{http://ws.polarion.com/test}data').text or '')
+
+    def _post(self, source):
+        with self.transport.upload(source) as placeholder:
+            self.transport.post_xml('http://example.com/ws/Tracker', _envelope(placeholder), {})
+        body = self.adapter.bodies[-1]
+        self.assertEqual(len(body), self.adapter.lengths[-1])
+        return self._uploadedData(body)
+
+    def test_upload_buffer(self):
+        self.assertEqual(self._post(self.content), self.content)
+        self.assertEqual(self._post(b''), b'')
+        self.assertEqual(self._post(bytearray(b'ab')), b'ab')
+
+    def test_upload_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'attachment.bin')
+            with open(path, 'wb') as file:
+                file.write(self.content)
+            self.assertEqual(self._post(path), self.content)
+            with open(path, 'rb') as file:
+                file.seek(10)
+                self.assertEqual(self._post(file), self.content[10:])
+
+    def test_upload_retry(self):
+        source = io.BytesIO(self.content)
+        with self.transport.upload(source) as placeholder:
+            # a call that is retried after a new login sends the data again
+            self.transport.post_xml('http://example.com/ws/Tracker', _envelope(placeholder), {})
+            self.transport.post_xml('http://example.com/ws/Tracker', _envelope(placeholder), {})
+        self.assertEqual(self._uploadedData(self.adapter.bodies[0]), self.content)
+        self.assertEqual(self._uploadedData(self.adapter.bodies[1]), self.content)
+
+    def test_no_upload(self):
+        self.transport.post_xml('http://example.com/ws/Tracker', _envelope(b'small'), {})
+        self.assertIsInstance(self.adapter.bodies[0], bytes)
+        self.assertEqual(self._uploadedData(self.adapter.bodies[0]), b'small')
+
+
+
+class TestPolarionAttachmentUpload(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.data = StandInPolarion()
+        workitems = [cls.data.addWorkitem() for _ in range(2)]
+        cls.data.addTestRun('run-1', workitems)
+        cls.server = StandInServer(cls.data)
+        cls.pol = Polarion(cls.server.url, 'user', 'password')
+        cls.project = cls.pol.getProject('BENCH')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pol.close()
+        cls.server.close()
+
+    def test_workitem_buffer(self):
+        workitem = self.project.getWorkitem('BENCH-1')
+        workitem.addAttachment(io.BytesIO(b'hello'), 'Greeting', file_name='hello.txt')
+        self.assertEqual(b'hello', self.data.attachments[(workitem.uri, 'hello.txt')])
+
+        with self.assertRaises(ValueError):
+            workitem.addAttachment(io.BytesIO(b'hello'), 'Greeting')
+        with self.assertRaises(ValueError):
+            workitem.updateAttachment('1', b'hello', 'Greeting')
+        self.assertNotIn((workitem.uri, 'hello'), self.data.attachments)
+
+    def test_workitem_named_file(self):
+        workitem = self.project.getWorkitem('BENCH-2')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'report.txt')
+            with open(path, 'wb') as file:
+                file.write(b'report')
+            with open(path, 'rb') as file:
+                workitem.addAttachment(file, 'Report')
+        self.assertEqual(b'report', self.data.attachments[(workitem.uri, 'report.txt')])
+
+    def test_testrun_bytes(self):
+        test_run = self.project.getTestRun('run-1')
+        test_run.addAttachment(b'log', 'Log', file_name='run.log')
+        self.assertEqual(b'log', self.data.attachments[(test_run.uri, 'run.log')])
+
+        with self.assertRaises(ValueError):
+            test_run.addAttachment(b'log', 'Log')
+        with self.assertRaises(ValueError):
+            test_run.updateAttachment(io.BytesIO(b'log'), 'Log')
+
+    def test_record_buffer(self):
+        record = self.project.getTestRun('run-1').records[0]
+        with self.assertRaises(ValueError):
+            record.addAttachment(io.BytesIO(b'log'), 'Log')
+        with self.assertRaises(ValueError):
+            record.addAttachmentToTestStep(0, b'log', 'Log')
+        record.addAttachment(io.BytesIO(b'log'), 'Log', file_name='record.log')
@@ -75,3 +75,18 @@ class TestPolarionUtils(unittest.TestCase):
 
         self.assertEqual(expected_text.strip(), parser.data.strip(), msg='Parser workitem text did not match')
 
+
+    @patch('polarion.project.Project')
+    def test_links_loaded_at_once(self, project_mock):
+        html_text = '<span class="polarion-rte-link" data-type="workItem" id="fake" data-item-id="PYTH-510" data-option-id="long"></span>' \
+                    '<span class="polarion-rte-link" data-type="workItem" id="fake" data-item-id="PYTH-511" data-option-id="long"></span>' \
+                    '<span class="polarion-rte-link" data-type="workItem" id="fake" data-item-id="PYTH-512" data-option-id="short"></span>'
+
+        project_mock.getWorkitems.return_value = {'PYTH-510': 'title of 510', 'PYTH-511': 'title of 511'}
+
+        parser = DescriptionParser(project_mock)
+        parser.feed(html_text)
+
+        self.assertEqual('title of 510title of 511PYTH-512', parser.data)
+        project_mock.getWorkitems.assert_called_once_with({'PYTH-510', 'PYTH-511'})
+        project_mock.getWorkitem.assert_not_called()
@@ -258,6 +258,34 @@ class TestPolarionWorkitem(unittest.TestCase):
         self.assertEqual(executed_workitem, checking_workitem,
                          msg='Workitems not identical')
 
+    def test_workitem_fields(self):
+        executed_workitem = self.executing_project.createWorkitem('task')
+        executed_workitem.setDescription('A description')
+        full_workitem = self.executing_project.getWorkitem(executed_workitem.id)
+
+        with self.pol.metrics.scope() as scope:
+            checking_workitem = self.executing_project.getWorkitem(executed_workitem.id, fields=['status'])
+        self.assertIn('Tracker.getWorkItemByIdsWithFields', scope.snapshot())
+        self.assertEqual(full_workitem.id, checking_workitem.id)
+        self.assertEqual(full_workitem.title, checking_workitem.title)
+        self.assertEqual(full_workitem.status.id, checking_workitem.status.id)
+
+        # other fields are loaded when used
+        with self.pol.metrics.scope() as scope:
+            self.assertEqual('A description', checking_workitem.getDescription())
+            self.assertEqual('A description', checking_workitem.getDescription())
+        self.assertEqual(1, scope.snapshot()['Tracker.getWorkItemByUriWithFields']['count'])
+
+        checking_workitems = self.executing_project.searchWorkitemFullItem(f'id:{executed_workitem.id}',
+                                                                           fields=['status'])
+        self.assertEqual(1, len(checking_workitems))
+        self.assertEqual(full_workitem.status.id, checking_workitems[0].status.id)
+
+        # saving only sends the loaded fields
+        checking_workitem.setStatus('done')
+        self.assertEqual('done', self.executing_project.getWorkitem(executed_workitem.id).status.id)
+        self.assertEqual('A description', self.executing_project.getWorkitem(executed_workitem.id).getDescription())
+
     def test_workitem_creator(self):
         new_workitem = createFromUri(self.pol, self.executing_project, self.global_workitem.uri)
 
@@ -411,6 +439,27 @@ class TestPolarionWorkitem(unittest.TestCase):
 
         self.assertRaises(Exception, executed_workitem_1.setCustomField, 'random_invalid_key', 0)
 
+    def test_custom_fields(self):
+        executed_workitem_1 = self.executing_project.createWorkitem('task')
+
+        with self.pol.metrics.scope() as scope:
+            executed_workitem_1.setCustomFields({'int_field': 12, 'string_field': '12'})
+        # a single update for all custom fields
+        self.assertEqual(1, scope.snapshot()['Tracker.updateWorkItem']['count'])
+
+        checking_workitem_1 = self.checking_project.getWorkitem(executed_workitem_1.id)
+        self.assertEqual(12, checking_workitem_1.getCustomField('int_field'), msg='value not the same as set')
+        self.assertEqual('12', checking_workitem_1.getCustomField('string_field'), msg='value not the same as set')
+
+        executed_workitem_1.setCustomFields({'int_field': 24})
+        checking_workitem_1 = self.checking_project.getWorkitem(executed_workitem_1.id)
+        self.assertEqual(24, checking_workitem_1.getCustomField('int_field'), msg='value not the same as set')
+        self.assertEqual('12', checking_workitem_1.getCustomField('string_field'), msg='value not the same as set')
+
+        # nothing is set when one of the keys is not allowed
+        self.assertRaises(Exception, executed_workitem_1.setCustomFields, {'int_field': 36, 'random_invalid_key': 0})
+        self.assertEqual(24, self.checking_project.getWorkitem(executed_workitem_1.id).getCustomField('int_field'))
+
     def test_approvee(self):
         executed_workitem_1 = self.executing_project.createWorkitem('task')
         all_users = self.executing_project.getUsers()
@@ -598,6 +647,21 @@ class TestPolarionWorkitem(unittest.TestCase):
         self.assertIn('Index should be in range of test step length of', str(ex.exception))
 
 
+    def test_testcase_steps_loaded_on_use(self):
+        executed_workitem_1 = self.executing_project.createWorkitem('testcase')
+        executed_workitem_1.addTestStep('0', 'Test step 0', '')
+
+        # loading the workitem does not load the test steps
+        with self.pol.metrics.scope() as scope:
+            executed_workitem_2 = self.executing_project.getWorkitem(executed_workitem_1.id)
+        self.assertEqual(['Tracker.getWorkItemById'], list(scope.snapshot()))
+
+        with self.pol.metrics.scope() as scope:
+            self.assertTrue(executed_workitem_2.hasTestSteps())
+            self.assertEqual('0', executed_workitem_2.getTestSteps()[0]['step'])
+        # loaded once on first use
+        self.assertEqual(1, scope.snapshot()['TestManagement.getTestSteps']['count'])
+
     def test_testcase_update_steps(self):
         executed_workitem_1 = self.executing_project.createWorkitem('testcase')
         executed_workitem_2 = self.executing_project.createWorkitem('task')
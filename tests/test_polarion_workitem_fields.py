@@ -0,0 +1,34 @@
+import unittest
+
+from benchmarks.stand_in import StandInPolarion, StandInServer
+from polarion.polarion import Polarion
+
+
+class TestPolarionWorkitemFields(unittest.TestCase):
+
+    def setUp(self):
+        self.data = StandInPolarion()
+        self.workitem_id = self.data.addWorkitem()['id']
+        self.server = StandInServer(self.data)
+        self.pol = Polarion(self.server.url, 'user', 'password')
+
+    def tearDown(self):
+        self.pol.close()
+        self.server.close()
+
+    def test_set_field_not_loaded(self):
+        for policy in ('reload', 'none', 'lazy'):
+            with self.subTest(policy=policy):
+                self.pol.write_policy = type(self.pol.write_policy)(policy)
+                workitem = self.pol.getProject('BENCH').getWorkitem(self.workitem_id, fields=['status'])
+                with self.pol.metrics.scope() as scope:
+                    workitem.setDescription(f'Description with {policy}')
+                self.assertEqual(1, scope.snapshot()['Tracker.updateWorkItem']['count'])
+                self.assertIn(f'Description with {policy}',
+                              self.data.workitems[self.workitem_id]['description']['content'])
+
+    def test_field_not_loaded_unchanged(self):
+        workitem = self.pol.getProject('BENCH').getWorkitem(self.workitem_id, fields=['status'])
+        self.assertEqual({}, workitem._getChangedFields())
+        workitem.save()
+        self.assertEqual('open', self.data.workitems[self.workitem_id]['status']['id'])